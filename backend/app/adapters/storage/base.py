@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from typing import BinaryIO, Iterable, Optional, Union
 
 
 class BaseStorage(ABC):
@@ -9,19 +9,69 @@ class BaseStorage(ABC):
     """
     
     @abstractmethod
-    async def upload_file(self, file_path: str, destination: str) -> str:
+    async def upload_file(self, file_path: str, destination: str, move: bool = False) -> str:
         """
         Upload file to storage.
         
         Args:
             file_path: Local file path
             destination: Destination path/key
+            move: Consume the source file (remove it once stored)
         
         Returns:
             Public URL to access the file
         """
         pass
     
+    async def upload_bytes(self, data: Union[bytes, bytearray, memoryview, BinaryIO], destination: str) -> str:
+        """
+        Upload an in-memory buffer to storage.
+        
+        Default implementation spills to a temp file and calls upload_file;
+        adapters that can stream from memory should override it.
+        
+        Returns:
+            Public URL to access the file
+        """
+        import os
+        import tempfile
+        
+        fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(destination)[1])
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if isinstance(data, (bytes, bytearray, memoryview)):
+                    f.write(data)
+                else:
+                    import shutil
+                    shutil.copyfileobj(data, f)
+            return await self.upload_file(tmp_path, destination)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    async def upload_stream(self, chunks: Iterable[bytes], destination: str) -> str:
+        """
+        Upload bytes as they are produced (e.g. an encoder's output).
+        
+        Default implementation spills the chunks to a temp file and calls
+        upload_file; adapters that can upload incrementally should override it.
+        
+        Returns:
+            Public URL to access the file
+        """
+        import os
+        import tempfile
+        
+        fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(destination)[1])
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            return await self.upload_file(tmp_path, destination, move=True)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
     @abstractmethod
     async def download_file(self, source: str, destination: str):
         """Download file from storage."""
@@ -32,6 +82,32 @@ class BaseStorage(ABC):
         """Delete file from storage."""
         pass
     
+    async def copy_object(self, source: str, destination: str) -> str:
+        """
+        Copy a stored object to a new key.
+        
+        Default implementation round-trips through a temp file; adapters
+        that can copy in place should override it.
+        
+        Returns:
+            Public URL to access the copy
+        """
+        import os
+        import tempfile
+        
+        fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(destination)[1])
+        os.close(fd)
+        try:
+            await self.download_file(source, tmp_path)
+            return await self.upload_file(tmp_path, destination, move=True)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    async def get_size(self, path: str) -> Optional[int]:
+        """Size of a stored object in bytes, or None if unknown/missing."""
+        return None
+    
     @abstractmethod
     async def get_url(self, path: str) -> str:
         """Get public URL for file."""
@@ -1,42 +1,194 @@
+import asyncio
+import errno
+import hashlib
+import os
 import shutil
 from pathlib import Path
+from typing import BinaryIO, Iterable, Optional, Union
 from .base import BaseStorage
+from app.utils.audio_urls import audio_url_for
 
 
 class LocalStorage(BaseStorage):
     """
     Local filesystem storage adapter.
     Use for development or single-server deployments.
+    
+    - Files are published atomically: written (or renamed) to a temp name in
+      the destination directory, then os.replace()d into place, so readers
+      never see a partial file.
+    - Generated files are moved with a rename when source and destination
+      share a filesystem; only cross-device moves fall back to a copy.
+    - All filesystem work runs in worker threads, off the event loop.
+    - With shard_depth > 0, `a/b/<name>` is stored as `a/b/xx/yy/<name>`
+      (xx, yy from a hash of the name) so no directory grows unbounded.
+      Keys and URLs are unchanged; sharding is purely physical.
     """
     
-    def __init__(self, base_path: str = "./storage"):
+    def __init__(self, base_path: Optional[str] = None, shard_depth: Optional[int] = None):
+        from app.config import get_settings
+        settings = get_settings()
+        if base_path is None:
+            base_path = settings.LOCAL_STORAGE_PATH
+        if shard_depth is None:
+            shard_depth = settings.LOCAL_STORAGE_SHARD_DEPTH
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.shard_depth = shard_depth
+    
+    def _sharded_path(self, key: str) -> Path:
+        """Physical path for a key under the current shard layout."""
+        key_path = Path(key)
+        if self.shard_depth <= 0:
+            return self.base_path / key_path
+        digest = hashlib.md5(key_path.name.encode("utf-8")).hexdigest()
+        shards = [digest[i * 2:i * 2 + 2] for i in range(self.shard_depth)]
+        return self.base_path / key_path.parent / Path(*shards) / key_path.name
+    
+    def resolve_path(self, key: str) -> Optional[Path]:
+        """
+        Find the file for a key, checking the sharded location first and
+        the flat (pre-sharding) location second. Returns None if missing
+        or if the key escapes the storage root.
+        """
+        base = self.base_path.resolve()
+        for candidate in (self._sharded_path(key), self.base_path / key):
+            path = candidate.resolve()
+            if base not in path.parents:
+                return None
+            if path.is_file():
+                return path
+        return None
+    
+    @staticmethod
+    def _tmp_path(dest_path: Path) -> Path:
+        return dest_path.with_name(f".{dest_path.name}.{os.urandom(4).hex()}.tmp")
+    
+    def _publish_file(self, file_path: str, dest_path: Path, move: bool):
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(dest_path)
+        try:
+            if move:
+                try:
+                    # Same filesystem: a rename, no bytes copied
+                    os.replace(file_path, dest_path)
+                    return
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+            shutil.copy2(file_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+            if move:
+                os.remove(file_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
+    def _publish_bytes(self, data: Union[bytes, bytearray, memoryview, BinaryIO], dest_path: Path):
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(dest_path)
+        try:
+            with open(tmp_path, "wb") as f:
+                if isinstance(data, (bytes, bytearray, memoryview)):
+                    f.write(data)
+                else:
+                    shutil.copyfileobj(data, f)
+            os.replace(tmp_path, dest_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
     
-    async def upload_file(self, file_path: str, destination: str) -> str:
-        """Copy file to local storage."""
-        dest_path = self.base_path / destination
+    def _publish_chunks(self, chunks: Iterable[bytes], dest_path: Path):
         dest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(dest_path)
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_path, dest_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
+    async def upload_file(self, file_path: str, destination: str, move: bool = False) -> str:
+        """
+        Publish a local file into storage.
         
-        shutil.copy2(file_path, dest_path)
+        With move=True the source is consumed (renamed into place when
+        possible), which is what the workers want for freshly generated audio.
+        """
+        await asyncio.to_thread(self._publish_file, file_path, self._sharded_path(destination), move)
         
-        # Return full backend URL so frontend can access it
-        return f"http://localhost:8000/storage/{destination}"
+        # Return public URL on the audio delivery route (AUDIO_BASE_URL)
+        return audio_url_for(destination)
+    
+    async def upload_bytes(self, data: Union[bytes, bytearray, memoryview, BinaryIO], destination: str) -> str:
+        """Write an in-memory buffer straight into storage (no temp file elsewhere)."""
+        await asyncio.to_thread(self._publish_bytes, data, self._sharded_path(destination))
+        return audio_url_for(destination)
+    
+    async def upload_stream(self, chunks: Iterable[bytes], destination: str) -> str:
+        """Write chunks into storage as they are produced, published atomically at the end."""
+        await asyncio.to_thread(self._publish_chunks, chunks, self._sharded_path(destination))
+        return audio_url_for(destination)
     
     async def download_file(self, source: str, destination: str):
         """Copy file from storage to destination."""
-        source_path = self.base_path / source
-        shutil.copy2(source_path, destination)
+        source_path = await asyncio.to_thread(self.resolve_path, source)
+        if source_path is None:
+            raise FileNotFoundError(f"Storage object not found: {source}")
+        await asyncio.to_thread(shutil.copy2, source_path, destination)
+    
+    def _link_file(self, source_path: Path, dest_path: Path):
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(dest_path)
+        try:
+            try:
+                # Shares the bytes on disk; either name can be deleted independently
+                os.link(source_path, tmp_path)
+            except OSError:
+                shutil.copy2(source_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
+    async def copy_object(self, source: str, destination: str) -> str:
+        """Copy a stored file to a new key (a hard link when the filesystem allows)."""
+        source_path = await asyncio.to_thread(self.resolve_path, source)
+        if source_path is None:
+            raise FileNotFoundError(f"Storage object not found: {source}")
+        await asyncio.to_thread(self._link_file, source_path, self._sharded_path(destination))
+        return audio_url_for(destination)
     
     async def delete_file(self, path: str):
         """Delete file from storage."""
-        file_path = self.base_path / path
-        if file_path.exists():
-            file_path.unlink()
+        file_path = await asyncio.to_thread(self.resolve_path, path)
+        if file_path is not None:
+            await asyncio.to_thread(file_path.unlink, missing_ok=True)
+    
+    async def get_size(self, path: str) -> Optional[int]:
+        """Size of a stored file in bytes, or None if missing."""
+        file_path = await asyncio.to_thread(self.resolve_path, path)
+        if file_path is None:
+            return None
+        return (await asyncio.to_thread(file_path.stat)).st_size
     
     async def get_url(self, path: str) -> str:
-        """Get URL for file."""
-        return f"http://localhost:8000/storage/{path}"
+        """Get URL for file (signed when AUDIO_SIGNED_URLS is enabled)."""
+        return audio_url_for(path)
+
+
+# Singleton instance
+_local_instance = None
+
+
+def get_local_storage() -> LocalStorage:
+    """Get singleton local storage instance."""
+    global _local_instance
+    if _local_instance is None:
+        _local_instance = LocalStorage()
+    return _local_instance
 
 
 def get_storage_adapter() -> BaseStorage:
@@ -47,9 +199,9 @@ def get_storage_adapter() -> BaseStorage:
     settings = get_settings()
     
     if settings.STORAGE_TYPE == "local":
-        return LocalStorage()
+        return get_local_storage()
     elif settings.STORAGE_TYPE == "s3":
-        # TODO: Implement S3Storage adapter
-        raise NotImplementedError("S3 storage not yet implemented")
+        from .s3 import get_s3_storage
+        return get_s3_storage()
     else:
         raise ValueError(f"Unknown storage type: {settings.STORAGE_TYPE}")
@@ -0,0 +1,241 @@
+import asyncio
+import io
+import os
+import re
+from typing import BinaryIO, Iterable, Optional, Union
+from .base import BaseStorage
+from app.utils.audio_urls import audio_url_for
+
+# Final job audio (audio/{user}/{job}.ext) and voice previews are written once
+# under unique keys; everything else (segments, references, profiles) is not
+IMMUTABLE_KEY = re.compile(r"^(audio/[^/]+/[^/]+|previews/[^/]+)\.(mp3|wav|ogg|opus)$")
+
+
+class S3Storage(BaseStorage):
+    """
+    S3-compatible storage adapter (AWS S3, MinIO, moto server).
+
+    Uses a single boto3 client per process with a pooled HTTP connection
+    pool; blocking SDK calls run in worker threads so the async interface
+    never blocks the event loop. Audio is uploaded straight from memory
+    using multipart uploads, and reads go through presigned GET URLs.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str = "us-east-1",
+        endpoint_url: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        max_pool_connections: int = 20,
+        multipart_chunk_size: int = 8 * 1024 * 1024,
+        presign_ttl_seconds: int = 3600
+    ):
+        import boto3
+        from botocore.config import Config
+        from boto3.s3.transfer import TransferConfig
+
+        if not bucket:
+            raise ValueError("S3_BUCKET_NAME must be set when STORAGE_TYPE is 's3'")
+
+        self.bucket = bucket
+        self.presign_ttl_seconds = presign_ttl_seconds
+        # S3 requires every part except the last to be at least 5 MiB
+        self.multipart_chunk_size = max(multipart_chunk_size, 5 * 1024 * 1024)
+
+        self.client = boto3.client(
+            "s3",
+            region_name=region,
+            endpoint_url=endpoint_url or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                retries={"max_attempts": 5, "mode": "adaptive"},
+                signature_version="s3v4"
+            )
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.multipart_chunk_size,
+            multipart_chunksize=self.multipart_chunk_size,
+            max_concurrency=4,
+            use_threads=True
+        )
+
+    @staticmethod
+    def _content_type(key: str) -> str:
+        if key.endswith(".mp3"):
+            return "audio/mpeg"
+        if key.endswith(".wav"):
+            return "audio/wav"
+        if key.endswith(".ogg") or key.endswith(".opus"):
+            return "audio/ogg"
+        return "application/octet-stream"
+
+    @staticmethod
+    def _cache_control(key: str) -> str:
+        if IMMUTABLE_KEY.match(key):
+            # Keys are job UUIDs / content digests and never rewritten, so caches may keep them forever
+            return "public, max-age=31536000, immutable"
+        return "private, no-cache"
+
+    def _extra_args(self, key: str) -> dict:
+        return {
+            "ContentType": self._content_type(key),
+            "CacheControl": self._cache_control(key)
+        }
+
+    async def upload_file(self, file_path: str, destination: str, move: bool = False) -> str:
+        """Upload a local file (multipart above the chunk size)."""
+        await asyncio.to_thread(
+            self.client.upload_file,
+            file_path,
+            self.bucket,
+            destination,
+            ExtraArgs=self._extra_args(destination),
+            Config=self.transfer_config
+        )
+        if move and os.path.exists(file_path):
+            os.remove(file_path)
+        return audio_url_for(destination)
+
+    async def upload_bytes(self, data: Union[bytes, bytearray, memoryview, BinaryIO], destination: str) -> str:
+        """Upload an in-memory buffer without touching local disk."""
+        fileobj = io.BytesIO(data) if isinstance(data, (bytes, bytearray, memoryview)) else data
+        await asyncio.to_thread(
+            self.client.upload_fileobj,
+            fileobj,
+            self.bucket,
+            destination,
+            ExtraArgs=self._extra_args(destination),
+            Config=self.transfer_config
+        )
+        return audio_url_for(destination)
+
+    async def upload_stream(self, chunks: Iterable[bytes], destination: str) -> str:
+        """
+        Multipart-upload an iterable of byte chunks as they are produced.
+
+        Chunks are coalesced into parts of `multipart_chunk_size`, so memory
+        stays bounded by one part regardless of total length. The iterator
+        is advanced in a worker thread, since producers (e.g. an FFmpeg
+        pipe) block. On any error the multipart upload is aborted.
+        """
+        upload = await asyncio.to_thread(
+            self.client.create_multipart_upload,
+            Bucket=self.bucket,
+            Key=destination,
+            **self._extra_args(destination)
+        )
+        upload_id = upload["UploadId"]
+        parts = []
+        buffer = bytearray()
+
+        async def _send_part(body: bytes):
+            part_number = len(parts) + 1
+            result = await asyncio.to_thread(
+                self.client.upload_part,
+                Bucket=self.bucket,
+                Key=destination,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body
+            )
+            parts.append({"ETag": result["ETag"], "PartNumber": part_number})
+
+        iterator = iter(chunks)
+        try:
+            while (chunk := await asyncio.to_thread(next, iterator, None)) is not None:
+                buffer.extend(chunk)
+                if len(buffer) >= self.multipart_chunk_size:
+                    await _send_part(bytes(buffer))
+                    buffer.clear()
+            if buffer or not parts:
+                await _send_part(bytes(buffer))
+
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=destination,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except Exception:
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload,
+                Bucket=self.bucket,
+                Key=destination,
+                UploadId=upload_id
+            )
+            raise
+
+        return audio_url_for(destination)
+
+    async def download_file(self, source: str, destination: str):
+        """Download object to a local path."""
+        await asyncio.to_thread(
+            self.client.download_file,
+            self.bucket,
+            source,
+            destination,
+            Config=self.transfer_config
+        )
+
+    async def copy_object(self, source: str, destination: str) -> str:
+        """Server-side copy; the bytes never leave the bucket."""
+        await asyncio.to_thread(
+            self.client.copy,
+            {"Bucket": self.bucket, "Key": source},
+            self.bucket,
+            destination,
+            ExtraArgs=dict(self._extra_args(destination), MetadataDirective="REPLACE"),
+            Config=self.transfer_config
+        )
+        return audio_url_for(destination)
+
+    async def delete_file(self, path: str):
+        """Delete object (no-op if missing)."""
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=path)
+
+    async def get_size(self, path: str) -> Optional[int]:
+        """Object size from a HEAD request, or None if missing."""
+        try:
+            head = await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=path)
+        except Exception:
+            return None
+        return head["ContentLength"]
+
+    async def get_url(self, path: str) -> str:
+        """Get a presigned GET URL for the object."""
+        return await asyncio.to_thread(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": path},
+            ExpiresIn=self.presign_ttl_seconds
+        )
+
+
+# Singleton instance (shares one client and connection pool per process)
+_s3_instance = None
+
+
+def get_s3_storage() -> S3Storage:
+    """
+    Get singleton S3 storage instance configured from settings.
+    """
+    global _s3_instance
+    if _s3_instance is None:
+        from app.config import get_settings
+        settings = get_settings()
+        _s3_instance = S3Storage(
+            bucket=settings.S3_BUCKET_NAME,
+            region=settings.S3_REGION,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            access_key_id=settings.AWS_ACCESS_KEY_ID,
+            secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+            multipart_chunk_size=settings.S3_MULTIPART_CHUNK_MB * 1024 * 1024,
+            presign_ttl_seconds=settings.AUDIO_URL_TTL_SECONDS
+        )
+    return _s3_instance
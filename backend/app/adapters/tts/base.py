@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
+from pathlib import Path
 from typing import Optional, Dict, Any, List
 from app.utils.text_processing import get_text_preprocessor
+from app.utils.scratch import new_output_path
+from app.utils.chunking import plan_chunks
+from app.utils.timing import stage
 
 
 class BaseTTS(ABC):
@@ -14,6 +18,9 @@ class BaseTTS(ABC):
     3. Update the factory in tts_service.py
     """
     
+    # Short engine name used in metric labels and job timings
+    engine_name = "base"
+    
     # Prosody Preset Definitions
     PROSODY_PRESETS = {
         "neutral": {
@@ -47,7 +54,64 @@ class BaseTTS(ABC):
         Helper to run standard preprocessing across adapters.
         """
         preprocessor = get_text_preprocessor()
-        return preprocessor.preprocess(text, language)
+        with stage("preprocess"):
+            return preprocessor.preprocess(text, language)
+
+    def count_tokens(self, text: str, language: str = "en") -> int:
+        """
+        Model-side length of `text` used for chunk planning.
+        Adapters override this with their tokenizer or phonemizer.
+        """
+        return len(text)
+
+    def plan_chunks(self, text: str, language: str, token_budget: int) -> List[str]:
+        """
+        Split preprocessed text into sentence-aligned chunks of at most
+        `token_budget` tokens (as measured by count_tokens), balanced in length.
+        """
+        preprocessor = get_text_preprocessor()
+        with stage("preprocess"):
+            sentences = preprocessor.segment_sentences(text, language)
+            chunks = plan_chunks(sentences, lambda s: self.count_tokens(s, language), token_budget)
+        return chunks or [text]
+
+    def map_voice_id(self, voice_id: str, language: str) -> str:
+        """
+        Translate another engine's voice id into this engine's equivalent
+        preset, for requests routed across engines. Engines number their
+        presets 1-4 with the same gender order, so the suffix carries over.
+        """
+        return voice_id
+
+    def is_model_loaded(self) -> bool:
+        """Whether the engine's model is in memory (adapters load lazily)."""
+        return getattr(self, "model", None) is not None
+
+    def model_memory_bytes(self) -> Optional[int]:
+        """
+        Approximate memory held by the model weights, or None if unknown.
+        Computed once per loaded model (torch modules: parameters + buffers).
+        """
+        model = getattr(self, "model", None)
+        if model is None or not hasattr(model, "parameters"):
+            return None
+        cached = getattr(self, "_model_memory", None)
+        if cached is not None and cached[0] == id(model):
+            return cached[1]
+        try:
+            tensors = list(model.parameters()) + list(model.buffers())
+            size = sum(t.numel() * t.element_size() for t in tensors)
+        except Exception:
+            return None
+        self._model_memory = (id(model), size)
+        return size
+
+    def new_output_path(self, suffix: str = ".wav") -> Path:
+        """
+        Path for a generated file in the current job's scratch directory.
+        The worker removes the directory when the job ends.
+        """
+        return new_output_path(suffix)
 
     async def generate(
         self,
@@ -83,49 +147,50 @@ class BaseTTS(ABC):
         if voice_age == "adult" or not voice_age:
             return wav_path
 
-        try:
-            from pydub import AudioSegment
-            import os
+        with stage("voice_dsp"):
+            try:
+                from pydub import AudioSegment
+                import os
             
-            audio = AudioSegment.from_wav(wav_path)
+                audio = AudioSegment.from_wav(wav_path)
             
-            # Simple shifting via sample rate metadata
-            # This changes both pitch AND speed proportionally.
-            # Child: +25% sample rate -> Higher pitch & Faster
-            # Elder: -20% sample rate -> Lower pitch & Slower
+                # Simple shifting via sample rate metadata
+                # This changes both pitch AND speed proportionally.
+                # Child: +25% sample rate -> Higher pitch & Faster
+                # Elder: -20% sample rate -> Lower pitch & Slower
             
-            if voice_age == "child":
-                new_sample_rate = int(audio.frame_rate * 1.25)
-            elif voice_age == "elder":
-                new_sample_rate = int(audio.frame_rate * 0.80)
-            else:
-                return wav_path
+                if voice_age == "child":
+                    new_sample_rate = int(audio.frame_rate * 1.25)
+                elif voice_age == "elder":
+                    new_sample_rate = int(audio.frame_rate * 0.80)
+                else:
+                    return wav_path
 
-            # Apply shift
-            # This 'cheats' by telling the player the samples are at a different rate
-            # without actually resampling the data.
-            audio = audio._spawn(audio.raw_data, overrides={'frame_rate': new_sample_rate})
+                # Apply shift
+                # This 'cheats' by telling the player the samples are at a different rate
+                # without actually resampling the data.
+                audio = audio._spawn(audio.raw_data, overrides={'frame_rate': new_sample_rate})
             
-            # Reset metadata to standard 24k so players/browsers don't get confused
-            # but keep the shifted sound.
-            audio = audio.set_frame_rate(24000)
+                # Reset metadata to standard 24k so players/browsers don't get confused
+                # but keep the shifted sound.
+                audio = audio.set_frame_rate(24000)
 
-            # Save modified audio
-            preset_path = wav_path.replace(".wav", f"_{voice_age}.wav")
-            audio.export(preset_path, format="wav")
+                # Save modified audio
+                preset_path = wav_path.replace(".wav", f"_{voice_age}.wav")
+                audio.export(preset_path, format="wav")
             
-            # Cleanup original
-            if os.path.exists(wav_path):
-                try:
-                    os.remove(wav_path)
-                except:
-                    pass
+                # Cleanup original
+                if os.path.exists(wav_path):
+                    try:
+                        os.remove(wav_path)
+                    except:
+                        pass
                     
-            return preset_path
+                return preset_path
             
-        except Exception as e:
-            print(f"[BaseTTS] Failed to apply voice preset {voice_age}: {e}")
-            return wav_path
+            except Exception as e:
+                print(f"[BaseTTS] Failed to apply voice preset {voice_age}: {e}")
+                return wav_path
 
     @abstractmethod
     def validate_input(self, text: str, voice_id: str) -> tuple[bool, Optional[str]]:
@@ -5,7 +5,9 @@ Automatically selects the best TTS adapter based on language.
 Optimized for Indian languages with IndicParler-TTS.
 """
 
+from typing import List, Optional
 from app.config import get_settings
+from app.utils.script_detection import ScriptRun, segment_by_script
 from .base import BaseTTS
 
 settings = get_settings()
@@ -47,19 +49,80 @@ def normalize_language(language: str) -> str:
         'kannada': 'kn',
         'malayalam': 'ml',
         'punjabi': 'pa',
+        'odia': 'or',
+        'oriya': 'or',
+        'assamese': 'as',
+        'urdu': 'ur',
+        'sanskrit': 'sa',
+        'kashmiri': 'ks',
+        'nepali': 'ne',
+        'sindhi': 'sd',
+        'bodo': 'bo',
+        'dogri': 'doi',
+        'konkani': 'kok',
+        'maithili': 'mai',
+        'manipuri': 'mni',
+        'santali': 'sat',
+        'japanese': 'ja',
+        'korean': 'ko',
+        'chinese': 'zh',
         'english': 'en'
     }
     
     return name_map.get(lang, lang)
 
 
-def get_tts_adapter(language: str = None) -> BaseTTS:
+def plan_routes(text: str, language: str = "en") -> List[ScriptRun]:
+    """
+    Split text into per-language runs based on the scripts it uses.
+    """
+    return segment_by_script(
+        text,
+        normalize_language(language),
+        min_latin_words=settings.SCRIPT_ROUTING_MIN_LATIN_WORDS
+    )
+
+
+def needs_script_routing(routes: List[ScriptRun], language: str) -> bool:
+    """
+    True when the text mixes languages (more than one run), or its only
+    script isn't one the requested language is written in (e.g. Devanagari
+    text requested as "en").
+    """
+    return len(routes) > 1 or (bool(routes) and routes[0].language != language)
+
+
+def indic_language_for(text: str, language: str) -> Optional[str]:
+    """
+    The Indic language a job will synthesize (the requested one, or the
+    first Indic run script routing sends to IndicParler), else None.
+    Jobs that reach IndicParler must run on the Celery worker.
+    """
+    lang = normalize_language(language)
+    if lang in INDIAN_LANGUAGES:
+        return lang
+    if text and settings.SCRIPT_ROUTING_ENABLED:
+        return next((run.language for run in plan_routes(text, lang) if run.language in INDIAN_LANGUAGES), None)
+    return None
+
+
+def get_tts_adapter(language: str = None, text: str = None) -> BaseTTS:
     """
     Get TTS adapter based on configuration and language.
+    
+    When `text` is given, its scripts are checked too: mixed-script text,
+    or text whose script doesn't match `language`, goes to the
+    script-routing adapter.
     """
     # Normalize language code
     normalized_lang = normalize_language(language) if language else None
     
+    if text and settings.SCRIPT_ROUTING_ENABLED:
+        routes = plan_routes(text, normalized_lang or "en")
+        if needs_script_routing(routes, normalized_lang or "en"):
+            from .routing import get_script_routing_adapter
+            return get_script_routing_adapter()
+    
     # If language is specified, route to language-specific adapter
     if normalized_lang:
         # Indian languages → IndicParler (best quality)
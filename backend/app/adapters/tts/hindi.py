@@ -4,9 +4,6 @@ Hindi TTS Adapter using Coqui TTS VITS model
 Supports Hindi language with good quality voices.
 """
 
-import os
-import tempfile
-from pathlib import Path
 from typing import Optional, Dict, Any
 import soundfile as sf
 
@@ -25,6 +22,8 @@ class HindiTTSAdapter(BaseTTS):
     - Fast inference
     """
     
+    engine_name = "hindi"
+    
     def __init__(self):
         """Initialize Hindi TTS adapter."""
         self.model = None
@@ -77,10 +76,8 @@ class HindiTTSAdapter(BaseTTS):
         if not is_valid:
             raise ValueError(error)
         
-        # Create temp output file
-        output_dir = Path(tempfile.gettempdir()) / "tts_output"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / f"{os.urandom(16).hex()}.wav"
+        # Create temp output file in the job's scratch space
+        output_path = self.new_output_path(".wav")
         
         try:
             print(f"[Hindi TTS] Generating speech for Hindi text...")
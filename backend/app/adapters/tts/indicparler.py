@@ -5,19 +5,17 @@ AI4Bharat's state-of-the-art TTS for 23 Indian languages.
 Uses Parler-TTS architecture with fine-grained control over voice characteristics.
 """
 
-import os
-import tempfile
-from pathlib import Path
 from typing import Optional, Dict, Any
 import torch
 import soundfile as sf
-import unicodedata
-import re
 
 from parler_tts import ParlerTTSForConditionalGeneration
 from transformers import AutoTokenizer
 from .base import BaseTTS
-from app.utils.text_processing import get_text_preprocessor
+from app.config import get_settings
+from app.utils.timing import stage, chunk as chunk_span
+
+app_settings = get_settings()
 
 
 # Language mapping for 23 Indian languages
@@ -61,6 +59,8 @@ class IndicParlerTTSAdapter(BaseTTS):
     The model is loaded once and reused for all requests.
     """
     
+    engine_name = "indicparler"
+    
     def __init__(self, model_name: str = "ai4bharat/indic-parler-tts"):
         """
         Initialize IndicParler-TTS adapter.
@@ -190,72 +190,16 @@ class IndicParlerTTSAdapter(BaseTTS):
         desc += " The recording is of high quality."
         return desc
     
-    def _clean_text(self, text: str) -> str:
-        """
-        Normalize and clean Indic text.
-        - Unicode NFKC normalization
-        - Remove non-printable characters
-        - Normalize whitespace
-        """
-        if not text:
-            return ""
-            
-        # Unicode normalization
-        text = unicodedata.normalize('NFKC', text)
-        
-        # Remove non-printable characters except basic whitespace
-        text = "".join(ch for ch in text if ch.isprintable() or ch.isspace())
-        
-        # Normalize whitespace (replace tabs/newlines with spaces, then collapse)
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+    def map_voice_id(self, voice_id: str, language: str) -> str:
+        if voice_id and voice_id.startswith("kokoro_"):
+            return f"indic_{language}_{voice_id.split('_')[-1]}"
+        return voice_id
 
-    def _chunk_text(self, text: str, max_chars: int = 150) -> list[str]:
-        """
-        Split text into smaller chunks for stable generation.
-        Uses sentence boundaries where possible.
-        """
-        if len(text) <= max_chars:
-            return [text]
-            
-        # Simple sentence splitter for Indic languages (supporting |, ., ?, !)
-        sentences = re.split(r'([।\.?!\n]+)', text)
-        
-        chunks = []
-        current_chunk = ""
-        
-        for i in range(0, len(sentences), 2):
-            part = sentences[i]
-            punct = sentences[i+1] if i+1 < len(sentences) else ""
-            
-            sentence = part + punct
-            
-            if len(current_chunk) + len(sentence) <= max_chars:
-                current_chunk += sentence
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                
-                # If a single sentence is too long, split it by spaces
-                if len(sentence) > max_chars:
-                    words = sentence.split(' ')
-                    temp_chunk = ""
-                    for word in words:
-                        if len(temp_chunk) + len(word) + 1 <= max_chars:
-                            temp_chunk += (word + " ")
-                        else:
-                            if temp_chunk:
-                                chunks.append(temp_chunk.strip())
-                            temp_chunk = word + " "
-                    current_chunk = temp_chunk
-                else:
-                    current_chunk = sentence
-                    
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-            
-        return [c for c in chunks if c]
+    def count_tokens(self, text: str, language: str = "hi") -> int:
+        """Prompt-token count from the model's own tokenizer."""
+        if self.tokenizer is None:
+            return len(text)
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
 
     async def generate(
         self,
@@ -282,7 +226,8 @@ class IndicParlerTTSAdapter(BaseTTS):
         """
         if not self.model:
             print("[IndicParler] Lazy loading model before generation...")
-            self._load_model()
+            with stage("model_load"):
+                self._load_model()
         
         if not self.model:
             raise RuntimeError("IndicParler model failed to load during lazy-initialization")
@@ -303,31 +248,17 @@ class IndicParlerTTSAdapter(BaseTTS):
         if language not in INDIAN_LANGUAGES:
             raise ValueError(f"Unsupported language: {language}. Supported: {list(INDIAN_LANGUAGES.keys())}")
         
-        # Create temp output file
-        output_dir = Path(tempfile.gettempdir()) / "tts_output"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / f"{os.urandom(16).hex()}.wav"
+        # Create temp output file in the job's scratch space
+        output_path = self.new_output_path(".wav")
         
         try:
             # Complete preprocessing pipeline (Normalization + Smart Pauses)
             clean_text = self.preprocess_text(text, language)
             print(f"[IndicParler] Preprocessed Text: {clean_text[:50]}...")
             
-            # Sentence-aware chunking
-            preprocessor = get_text_preprocessor()
-            chunks = preprocessor.segment_sentences(clean_text, language)
-            
-            # Group small sentences to avoid excessive overhead
-            merged_chunks = []
-            current = ""
-            for s in chunks:
-                if len(current) + len(s) < 300: # Optimized chunk size (increased from 180)
-                    current += " " + s
-                else:
-                    if current: merged_chunks.append(current.strip())
-                    current = s
-            if current: merged_chunks.append(current.strip())
-            chunks = merged_chunks
+            # Sentence-aware chunking, packed by prompt-token count so Indic
+            # scripts get chunks of similar model cost to Latin text
+            chunks = self.plan_chunks(clean_text, language, app_settings.INDICPARLER_CHUNK_TOKENS)
             
             print(f"[IndicParler] Processing in {len(chunks)} smart chunks...")
             
@@ -355,16 +286,16 @@ class IndicParlerTTSAdapter(BaseTTS):
                 ).to(self.device)
                 
                 # Generate audio with optimized inference mode
-                with torch.inference_mode():
+                with chunk_span(self.engine_name, language), torch.inference_mode():
                     generation = self.model.generate(
                         input_ids=description_input_ids.input_ids,
                         attention_mask=description_input_ids.attention_mask,
                         prompt_input_ids=prompt_input_ids.input_ids,
                         prompt_attention_mask=prompt_input_ids.attention_mask
                     )
-                
-                # Convert to numpy and collect
-                audio_arr = generation.cpu().numpy().squeeze()
+                    
+                    # Convert to numpy (waits for the device) and collect
+                    audio_arr = generation.cpu().numpy().squeeze()
                 all_audio.append(audio_arr)
             
             # Concatenate chunks
@@ -375,11 +306,12 @@ class IndicParlerTTSAdapter(BaseTTS):
                 final_audio = all_audio[0]
 
             # Save to WAV file
-            sf.write(
-                str(output_path),
-                final_audio,
-                self.model.config.sampling_rate
-            )
+            with stage("encode"):
+                sf.write(
+                    str(output_path),
+                    final_audio,
+                    self.model.config.sampling_rate
+                )
             
             print(f"[IndicParler] Audio generated successfully! ({len(final_audio)} samples)")
             
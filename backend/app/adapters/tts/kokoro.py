@@ -5,18 +5,19 @@ Lightweight, CPU-optimized TTS engine using Kokoro-82M ONNX model.
 Fast startup, no GPU required, no DLL issues on Windows.
 """
 
-import os
-import tempfile
+import atexit
 from pathlib import Path
 from typing import Optional, Dict, Any
 import numpy as np
 import soundfile as sf
 
-import unicodedata
-import re
 from kokoro_onnx import Kokoro
 from .base import BaseTTS
-from app.utils.text_processing import get_text_preprocessor
+from app.config import get_settings
+from app.utils.phoneme_cache import PhonemeCache
+from app.utils.timing import stage, chunk as chunk_span
+
+app_settings = get_settings()
 
 
 class KokoroTTSAdapter(BaseTTS):
@@ -33,6 +34,8 @@ class KokoroTTSAdapter(BaseTTS):
     The model is loaded once and reused for all requests.
     """
     
+    engine_name = "kokoro"
+    
     def __init__(self, voice_preset: str = "af_sky"):
         """
         Initialize Kokoro TTS adapter.
@@ -42,6 +45,7 @@ class KokoroTTSAdapter(BaseTTS):
         """
         self.voice_preset = voice_preset
         self.model = None
+        self.phoneme_cache: Optional[PhonemeCache] = None
         # Removed immediate loading to support lazy initialization
         print(f"Kokoro TTS adapter initialized with voice preset: {voice_preset} (Model will lazy-load on first use)")
     
@@ -63,11 +67,44 @@ class KokoroTTSAdapter(BaseTTS):
                 raise FileNotFoundError(f"Voices file not found: {voices_path}")
             
             self.model = Kokoro(str(model_path), str(voices_path))
+            self._init_phoneme_cache()
             print("[Kokoro] Model loaded successfully!")
         except Exception as e:
             print(f"[Kokoro] Failed to load model: {e}")
             raise
     
+    def _init_phoneme_cache(self):
+        """Put a memoizing cache in front of Kokoro's G2P, if the model exposes it."""
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is None or not app_settings.KOKORO_PHONEME_CACHE_ENABLED:
+            return
+        self.phoneme_cache = PhonemeCache(
+            tokenizer.phonemize,
+            max_entries=app_settings.KOKORO_PHONEME_CACHE_ENTRIES,
+            path=app_settings.KOKORO_PHONEME_CACHE_PATH or None
+        )
+        if self.phoneme_cache.path is not None:
+            atexit.register(self.phoneme_cache.save)
+    
+    def _phonemize(self, text: str, language: str) -> Optional[str]:
+        """Cached phonemes for text, or None when G2P is left to the model."""
+        if self.phoneme_cache is None:
+            return None
+        return self.phoneme_cache.phonemize(text, self._espeak_lang(language))
+    
+    def get_phoneme_cache_stats(self) -> Optional[Dict[str, Any]]:
+        return self.phoneme_cache.stats() if self.phoneme_cache else None
+    
+    def model_memory_bytes(self) -> Optional[int]:
+        """ONNX weights are mapped into memory whole, so use the file size."""
+        if not self.model:
+            return None
+        model_path = Path(__file__).parent.parent.parent.parent / "models" / "kokoro-v1.0.onnx"
+        try:
+            return model_path.stat().st_size
+        except OSError:
+            return None
+    
     async def generate(
         self,
         text: str,
@@ -93,7 +130,8 @@ class KokoroTTSAdapter(BaseTTS):
         """
         if not self.model:
             print("[Kokoro] Lazy loading model before generation...")
-            self._load_model()
+            with stage("model_load"):
+                self._load_model()
             
         if not self.model:
             raise RuntimeError("Kokoro model failed to load during lazy-initialization")
@@ -116,30 +154,15 @@ class KokoroTTSAdapter(BaseTTS):
         if voice_id in ["1", "2", "3", "4"]:
             voice = voice_map.get(f"kokoro_{voice_id}")
         
-        # Create temp output file
-        output_dir = Path(tempfile.gettempdir()) / "tts_output"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / f"{os.urandom(16).hex()}.wav"
+        # Create temp output file in the job's scratch space
+        output_path = self.new_output_path(".wav")
         
         try:
             # Preprocess text
             clean_text = self.preprocess_text(text, language)
             
-            # Sentence-aware chunking
-            preprocessor = get_text_preprocessor()
-            chunks = preprocessor.segment_sentences(clean_text, language)
-            
-            # Group small sentences
-            merged_chunks = []
-            current = ""
-            for s in chunks:
-                if len(current) + len(s) < 250:
-                    current += " " + s
-                else:
-                    if current: merged_chunks.append(current.strip())
-                    current = s
-            if current: merged_chunks.append(current.strip())
-            chunks = merged_chunks if merged_chunks else [clean_text]
+            # Sentence-aware chunking, packed by phoneme count
+            chunks = self.plan_chunks(clean_text, language, app_settings.KOKORO_CHUNK_TOKENS)
             
             print(f"[Kokoro] Generating speech with voice '{voice}' in {len(chunks)} smart chunks...")
             
@@ -151,13 +174,25 @@ class KokoroTTSAdapter(BaseTTS):
                     print(f"[Kokoro] Generating chunk {i+1}/{len(chunks)}...")
                 
                 # Generate audio for this chunk using the internal model call
-                # Note: self.model is the Kokoro model instance
-                samples, chunk_sr = self.model.create(
-                    text=chunk,
-                    voice=voice,
-                    speed=1.0,
-                    lang="en-us" if language == "en" else language
-                )
+                # Note: self.model is the Kokoro model instance. Phonemes come
+                # from the cache (already warmed by chunk planning) when enabled.
+                phonemes = self._phonemize(chunk, language)
+                with chunk_span(self.engine_name, language):
+                    if phonemes is not None:
+                        samples, chunk_sr = self.model.create(
+                            phonemes,
+                            voice=voice,
+                            speed=1.0,
+                            lang=self._espeak_lang(language),
+                            is_phonemes=True
+                        )
+                    else:
+                        samples, chunk_sr = self.model.create(
+                            text=chunk,
+                            voice=voice,
+                            speed=1.0,
+                            lang=self._espeak_lang(language)
+                        )
                 all_samples.append(samples)
                 sample_rate = chunk_sr
             
@@ -168,11 +203,12 @@ class KokoroTTSAdapter(BaseTTS):
                 final_samples = all_samples[0]
             
             # Save to WAV file
-            sf.write(
-                str(output_path),
-                final_samples,
-                sample_rate
-            )
+            with stage("encode"):
+                sf.write(
+                    str(output_path),
+                    final_samples,
+                    sample_rate
+                )
             
             print(f"[Kokoro] Audio generated successfully: {output_path}")
             
@@ -197,56 +233,28 @@ class KokoroTTSAdapter(BaseTTS):
         
         return True, None
 
-    def _clean_text(self, text: str) -> str:
-        """Normalize and clean text."""
-        if not text:
-            return ""
-        text = unicodedata.normalize('NFKC', text)
-        text = "".join(ch for ch in text if ch.isprintable() or ch.isspace())
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+    def map_voice_id(self, voice_id: str, language: str) -> str:
+        if voice_id and voice_id.startswith("indic_"):
+            return f"kokoro_{voice_id.split('_')[-1]}"
+        return voice_id
 
-    def _chunk_text(self, text: str, max_chars: int = 250) -> list[str]:
-        """Split text into smaller chunks for model safety."""
-        if len(text) <= max_chars:
-            return [text]
-            
-        sentences = re.split(r'([\.?!\n]+)', text)
-        chunks = []
-        current_chunk = ""
-        
-        for i in range(0, len(sentences), 2):
-            part = sentences[i]
-            punct = sentences[i+1] if i+1 < len(sentences) else ""
-            sentence = (part + punct).strip()
-            
-            if not sentence:
-                continue
+    @staticmethod
+    def _espeak_lang(language: str) -> str:
+        return "en-us" if language == "en" else language
+
+    def count_tokens(self, text: str, language: str = "en") -> int:
+        """
+        Phoneme count, which is what Kokoro's context limit is measured in.
+        Falls back to characters if the phonemizer is unavailable.
+        """
+        phonemes = self._phonemize(text, language)
+        if phonemes is not None:
+            return len(phonemes)
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is None:
+            return len(text)
+        return len(tokenizer.phonemize(text, self._espeak_lang(language)))
 
-            if len(current_chunk) + len(sentence) <= max_chars:
-                current_chunk += (" " + sentence) if current_chunk else sentence
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                
-                if len(sentence) > max_chars:
-                    # Split over-long sentence by words
-                    words = sentence.split(' ')
-                    temp = ""
-                    for w in words:
-                        if len(temp) + len(w) + 1 <= max_chars:
-                            temp += (" " + w) if temp else w
-                        else:
-                            if temp: chunks.append(temp.strip())
-                            temp = w
-                    current_chunk = temp
-                else:
-                    current_chunk = sentence
-                    
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        return chunks
-    
     def estimate_duration(self, text: str) -> float:
         """
         Estimate audio duration based on character count.
@@ -296,6 +304,8 @@ class KokoroTTSAdapter(BaseTTS):
     
     def cleanup(self):
         """Cleanup resources (Kokoro is lightweight, minimal cleanup needed)."""
+        if self.phoneme_cache is not None:
+            self.phoneme_cache.save()
         print("[Kokoro] Cleanup complete")
 
 
@@ -13,6 +13,8 @@ class MockTTSAdapter(BaseTTS):
     - Quick prototyping
     """
     
+    engine_name = "mock"
+    
     async def generate(
         self,
         text: str,
@@ -25,14 +27,8 @@ class MockTTSAdapter(BaseTTS):
         Mock generation - returns path to a dummy audio file.
         In production, replace this with actual XTTS adapter.
         """
-        import os
-        import tempfile
-        from pathlib import Path
-        
-        # Create a dummy WAV file
-        output_dir = Path(tempfile.gettempdir()) / "tts_output"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / f"{os.urandom(16).hex()}.wav"
+        # Create a dummy WAV file in the job's scratch space
+        output_path = self.new_output_path(".wav")
         
         # Create a WAV file with actual audio data (simple tone)
         import struct
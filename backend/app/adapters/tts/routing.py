@@ -0,0 +1,200 @@
+"""
+Script-routing TTS Adapter
+
+Splits code-mixed input (e.g. Hinglish) into runs by Unicode script,
+synthesizes each run with the engine best suited to it (IndicParler for
+Indic scripts, Kokoro for Latin), and stitches the audio back together.
+Rendered runs are cached so recurring phrases are not synthesized twice.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from .base import BaseTTS
+from app.config import get_settings
+
+app_settings = get_settings()
+
+# Silence inserted between runs from different engines
+RUN_GAP_SECONDS = 0.08
+
+
+def _resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """Linear-interpolation resampling (engines emit 24 kHz and 44.1 kHz)."""
+    if rate == target_rate or len(samples) == 0:
+        return samples
+    length = int(round(len(samples) * target_rate / rate))
+    positions = np.arange(length) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+class ScriptRoutingTTSAdapter(BaseTTS):
+    """
+    Composite adapter that routes each script run to its own engine.
+
+    Single-run input (including text whose script doesn't match the
+    requested language) is delegated straight to the right engine with
+    no stitching.
+    """
+
+    engine_name = "script_routing"
+
+    def __init__(self, cache_bytes: int):
+        self.cache_bytes = cache_bytes
+        self._cache: "OrderedDict[Tuple, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_get(self, key: Tuple) -> Optional[Tuple[np.ndarray, int]]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return entry
+
+    def _cache_put(self, key: Tuple, entry: Tuple[np.ndarray, int]):
+        size = entry[0].nbytes
+        # Don't let one long run flush everything else
+        if size > self.cache_bytes // 4:
+            return
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = entry
+            self._cached_bytes += size
+            while self._cached_bytes > self.cache_bytes:
+                _, (evicted, _) = self._cache.popitem(last=False)
+                self._cached_bytes -= evicted.nbytes
+
+    async def generate(
+        self,
+        text: str,
+        voice_id: str,
+        language: str = "en",
+        voice_age: str = "adult",
+        prosody_preset: str = "neutral",
+        speaker_wav_path: Optional[str] = None,
+        settings: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Generate speech, routing each script run to its engine.
+
+        Returns:
+            Path to generated WAV file
+        """
+        from .factory import get_tts_adapter, normalize_language, plan_routes
+
+        routes = plan_routes(text, normalize_language(language))
+        if not routes:
+            raise ValueError("Text cannot be empty")
+
+        if len(routes) == 1:
+            run = routes[0]
+            adapter = get_tts_adapter(language=run.language)
+            print(f"[Router] Routing '{language}' request to {type(adapter).__name__} as '{run.language}'")
+            return await adapter.generate(
+                text=run.text,
+                voice_id=adapter.map_voice_id(voice_id, run.language),
+                language=run.language,
+                voice_age=voice_age,
+                prosody_preset=prosody_preset,
+                speaker_wav_path=speaker_wav_path,
+                settings=settings
+            )
+
+        print(f"[Router] Mixed-script input: {' + '.join(f'{r.language}({len(r.text)})' for r in routes)}")
+        segments = []
+        for run in routes:
+            adapter = get_tts_adapter(language=run.language)
+            run_voice = adapter.map_voice_id(voice_id, run.language)
+            key = (type(adapter).__name__, run.language, run.text, run_voice, voice_age, prosody_preset, speaker_wav_path)
+
+            segment = self._cache_get(key)
+            if segment is None:
+                path = await adapter.generate(
+                    text=run.text,
+                    voice_id=run_voice,
+                    language=run.language,
+                    voice_age=voice_age,
+                    prosody_preset=prosody_preset,
+                    speaker_wav_path=speaker_wav_path,
+                    settings=settings
+                )
+                samples, rate = await asyncio.to_thread(sf.read, path, dtype="float32")
+                if samples.ndim > 1:
+                    samples = samples.mean(axis=1)
+                segment = (samples, rate)
+                self._cache_put(key, segment)
+            segments.append(segment)
+
+        # Stitch at the highest engine rate with a short gap between runs
+        target_rate = max(rate for _, rate in segments)
+        gap = np.zeros(int(target_rate * RUN_GAP_SECONDS), dtype=np.float32)
+        parts = []
+        for i, (samples, rate) in enumerate(segments):
+            if i:
+                parts.append(gap)
+            parts.append(_resample(samples, rate, target_rate))
+
+        output_path = self.new_output_path(".wav")
+        await asyncio.to_thread(sf.write, str(output_path), np.concatenate(parts), target_rate)
+        print(f"[Router] Stitched {len(segments)} runs: {output_path}")
+        return str(output_path)
+
+    def validate_input(self, text: str, voice_id: str) -> tuple[bool, Optional[str]]:
+        """Validate text; each engine re-validates its own runs."""
+        if not text or len(text.strip()) == 0:
+            return False, "Text cannot be empty"
+
+        if len(text) > app_settings.MAX_CHARS_PER_REQUEST:
+            return False, f"Text exceeds maximum length of {app_settings.MAX_CHARS_PER_REQUEST} characters"
+
+        return True, None
+
+    def estimate_duration(self, text: str) -> float:
+        """Estimate audio duration (between Kokoro and IndicParler speaking rates)."""
+        chars_per_second = 140 / 60
+        return len(text) / chars_per_second
+
+    def get_available_voices(self) -> list[Dict[str, Any]]:
+        """Voices come from the underlying engines."""
+        return []
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "bytes": self._cached_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+    def cleanup(self):
+        """Drop cached run audio."""
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+        print("[Router] Cleanup complete")
+
+
+# Singleton instance
+_routing_instance = None
+
+
+def get_script_routing_adapter() -> ScriptRoutingTTSAdapter:
+    """Get singleton script-routing adapter instance."""
+    global _routing_instance
+    if _routing_instance is None:
+        _routing_instance = ScriptRoutingTTSAdapter(cache_bytes=app_settings.SCRIPT_RUN_CACHE_MB * 1024 * 1024)
+    return _routing_instance
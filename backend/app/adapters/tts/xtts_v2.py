@@ -43,14 +43,20 @@ with SuppressStderr():
         # If import fails even with suppression, try without
         from TTS.api import TTS
 print("TTS library loaded successfully")
-from typing import Optional, Dict, Any
-import tempfile
+from typing import Optional, Dict, Any, Awaitable, Callable, List
 from pathlib import Path
 from .base import BaseTTS
 from app.config import get_settings
+from app.utils.timing import stage, chunk as chunk_span, timed_chunks
+from app.utils.speaker_cache import SpeakerLatentCache
 
 settings = get_settings()
 
+XTTS_SAMPLE_RATE = 24000
+
+# Called with (segment_wav_path, index) as streamed audio becomes available
+SegmentCallback = Callable[[str, int], Awaitable[None]]
+
 
 class XTTSv2Adapter(BaseTTS):
     """
@@ -58,16 +64,27 @@ class XTTSv2Adapter(BaseTTS):
     
     Features:
     - CPU and GPU support
-    - Voice cloning with speaker WAV
+    - Voice cloning with speaker WAV (conditioning latents cached by
+      reference content hash, in memory and on disk)
     - Multi-language support
+    - Streaming inference for cloned voices (XTTS_STREAMING): audio is
+      written chunk by chunk and optionally published in segments
     - Thread-safe model loading
     
     The model is loaded once and reused for all requests.
     """
     
+    engine_name = "xtts"
+    
     def __init__(self):
         self.device = "cuda" if settings.USE_GPU and torch.cuda.is_available() else "cpu"
         self.model = None
+        self.latent_cache = SpeakerLatentCache(
+            directory=settings.XTTS_LATENT_CACHE_DIR or None,
+            max_entries=settings.XTTS_LATENT_CACHE_ENTRIES,
+            max_disk_entries=settings.XTTS_LATENT_CACHE_DISK_ENTRIES,
+            device=self.device
+        )
         # Removed immediate loading to support lazy initialization
         print(f"XTTS v2 adapter initialized on {self.device} (Model will lazy-load on first use)")
     
@@ -85,6 +102,137 @@ class XTTSv2Adapter(BaseTTS):
             print(f"Error loading XTTS v2 model: {e}")
             raise
     
+    def _xtts_model(self):
+        """The underlying Xtts model, if this TTS version exposes it."""
+        synthesizer = getattr(self.model, "synthesizer", None)
+        xtts = getattr(synthesizer, "tts_model", None)
+        if xtts is None or not hasattr(xtts, "get_conditioning_latents") or not hasattr(xtts, "inference"):
+            return None
+        return xtts
+    
+    def get_speaker_latents(self, speaker_wav_path: str):
+        """
+        (gpt_cond_latent, speaker_embedding) for a reference recording,
+        from the cache when this reference was seen before.
+        """
+        xtts = self._xtts_model()
+        config = xtts.config
+        # Same conditioning parameters TTS.tts() would use
+        params = {
+            "gpt_cond_len": config.gpt_cond_len,
+            "gpt_cond_chunk_len": config.gpt_cond_chunk_len,
+            "max_ref_length": config.max_ref_len,
+            "sound_norm_refs": config.sound_norm_refs,
+        }
+        
+        def encode(path: str):
+            with stage("speaker_encode"):
+                return xtts.get_conditioning_latents(audio_path=[path], **params)
+        
+        return self.latent_cache.get_or_compute(speaker_wav_path, encode, params)
+    
+    def _synthesize_cloned(self, text: str, language: str, speaker_wav_path: str):
+        """Inference with cached conditioning (skips reference encoding on a hit)."""
+        xtts = self._xtts_model()
+        config = xtts.config
+        gpt_cond_latent, speaker_embedding = self.get_speaker_latents(speaker_wav_path)
+        with chunk_span(self.engine_name, language):
+            out = xtts.inference(
+                text,
+                language,
+                gpt_cond_latent,
+                speaker_embedding,
+                temperature=config.temperature,
+                length_penalty=config.length_penalty,
+                repetition_penalty=config.repetition_penalty,
+                top_k=config.top_k,
+                top_p=config.top_p,
+                enable_text_splitting=True
+            )
+        return out["wav"]
+    
+    def supports_streaming(self, speaker_wav_path: Optional[str]) -> bool:
+        """Streaming needs a speaker reference and a TTS version exposing inference_stream."""
+        if not settings.XTTS_STREAMING or not speaker_wav_path:
+            return False
+        if not self.model:
+            # Can't inspect the model yet; generate() falls back if it turns out unsupported
+            return True
+        xtts = self._xtts_model()
+        return xtts is not None and hasattr(xtts, "inference_stream")
+    
+    async def _emit_segment(self, pending: List, index: int, voice_age: str, on_segment: SegmentCallback):
+        import numpy as np
+        import soundfile as sf
+        
+        segment_path = self.new_output_path(".wav")
+        with stage("encode"):
+            sf.write(str(segment_path), np.concatenate(pending), XTTS_SAMPLE_RATE, subtype="PCM_16")
+        # Voice-age DSP runs per segment (resampling restarts at each one), so
+        # child/elder previews can click at segment joins; the final audio is
+        # processed in one pass and has no seams.
+        await on_segment(self.apply_voice_presets(str(segment_path), voice_age), index)
+    
+    async def _generate_streaming(
+        self,
+        clean_text: str,
+        language: str,
+        voice_age: str,
+        speaker_wav_path: str,
+        output_path: Path,
+        on_segment: Optional[SegmentCallback] = None
+    ) -> str:
+        """
+        Synthesize with Xtts.inference_stream, appending each chunk to the
+        output file as it arrives, so memory holds one chunk rather than
+        the whole utterance. With `on_segment`, every
+        XTTS_STREAM_SEGMENT_SECONDS of audio is also written out as its
+        own WAV and handed to the callback for progressive delivery.
+        Segments are a preview: voice-age DSP is applied to each one
+        separately, the returned file gets it once over the whole take.
+        """
+        import numpy as np
+        import soundfile as sf
+        
+        xtts = self._xtts_model()
+        config = xtts.config
+        gpt_cond_latent, speaker_embedding = self.get_speaker_latents(speaker_wav_path)
+        stream = xtts.inference_stream(
+            clean_text,
+            language,
+            gpt_cond_latent,
+            speaker_embedding,
+            stream_chunk_size=settings.XTTS_STREAM_CHUNK_SIZE,
+            temperature=config.temperature,
+            length_penalty=config.length_penalty,
+            repetition_penalty=config.repetition_penalty,
+            top_k=config.top_k,
+            top_p=config.top_p,
+            enable_text_splitting=True
+        )
+        
+        segment_samples = int(settings.XTTS_STREAM_SEGMENT_SECONDS * XTTS_SAMPLE_RATE) if on_segment else 0
+        pending, pending_samples, index = [], 0, 0
+        with sf.SoundFile(str(output_path), "w", samplerate=XTTS_SAMPLE_RATE, channels=1, subtype="PCM_16") as out:
+            for wav_chunk in timed_chunks(stream, self.engine_name, language):
+                if isinstance(wav_chunk, torch.Tensor):
+                    wav_chunk = wav_chunk.detach().float().cpu().numpy()
+                samples = np.asarray(wav_chunk, dtype=np.float32).reshape(-1)
+                with stage("encode"):
+                    out.write(samples)
+                
+                if segment_samples > 0:
+                    pending.append(samples)
+                    pending_samples += len(samples)
+                    if pending_samples >= segment_samples:
+                        await self._emit_segment(pending, index, voice_age, on_segment)
+                        pending, pending_samples, index = [], 0, index + 1
+        
+        if pending:
+            await self._emit_segment(pending, index, voice_age, on_segment)
+        
+        return self.apply_voice_presets(str(output_path), voice_age)
+    
     async def generate(
         self,
         text: str,
@@ -93,16 +241,21 @@ class XTTSv2Adapter(BaseTTS):
         voice_age: str = "adult",
         prosody_preset: str = "neutral",
         speaker_wav_path: Optional[str] = None,
-        settings: Optional[Dict[str, Any]] = None
+        settings: Optional[Dict[str, Any]] = None,
+        on_segment: Optional[SegmentCallback] = None
     ) -> str:
         """
         Generate speech using XTTS v2.
         
+        Cloned voices use streaming inference when XTTS_STREAMING is on;
+        `on_segment` then receives audio segments while synthesis runs.
+        
         Returns path to generated WAV file.
         """
         if not self.model:
             print("[XTTS] Lazy loading model before generation...")
-            self._load_model()
+            with stage("model_load"):
+                self._load_model()
             
         if not self.model:
             raise RuntimeError("XTTS model failed to load during lazy-initialization")
@@ -112,10 +265,8 @@ class XTTSv2Adapter(BaseTTS):
         if not is_valid:
             raise ValueError(error)
         
-        # Create temp output file
-        output_dir = Path(tempfile.gettempdir()) / "tts_output"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / f"{os.urandom(16).hex()}.wav"
+        # Create temp output file in the job's scratch space
+        output_path = self.new_output_path(".wav")
         
         try:
             # Preprocess text
@@ -127,14 +278,23 @@ class XTTSv2Adapter(BaseTTS):
             # For now, we use the preprocessed text with pauses.
             
             print(f"Using speaker reference: {speaker_wav_path}")
+            
+            if self.supports_streaming(speaker_wav_path):
+                return await self._generate_streaming(
+                    clean_text, language, voice_age, speaker_wav_path, output_path, on_segment
+                )
 
             # Use tts() instead of tts_to_file() to avoid torchcodec issues
             # This returns audio as a numpy array
-            wav = self.model.tts(
-                text=clean_text,
-                speaker_wav=speaker_wav_path,
-                language=language
-            )
+            if speaker_wav_path and self._xtts_model() is not None:
+                wav = self._synthesize_cloned(clean_text, language, speaker_wav_path)
+            else:
+                with chunk_span(self.engine_name, language):
+                    wav = self.model.tts(
+                        text=clean_text,
+                        speaker_wav=speaker_wav_path,
+                        language=language
+                    )
             
             # Convert to tensor and save using soundfile (doesn't require torchcodec)
             import numpy as np
@@ -152,11 +312,12 @@ class XTTSv2Adapter(BaseTTS):
                 wav_array = wav_array.squeeze()
             
             # Save using soundfile which doesn't require torchcodec
-            sf.write(
-                str(output_path),
-                wav_array,
-                24000  # XTTS v2 sample rate
-            )
+            with stage("encode"):
+                sf.write(
+                    str(output_path),
+                    wav_array,
+                    24000  # XTTS v2 sample rate
+                )
             
             # Apply voice age presets
             output_path = self.apply_voice_presets(str(output_path), voice_age)
@@ -192,44 +353,27 @@ class XTTSv2Adapter(BaseTTS):
         """
         Return list of available voices.
         
-        For XTTS v2, voices are defined by speaker WAV files.
-        In production, maintain a database of voice profiles.
+        For XTTS v2, voices are defined by speaker WAV files: these are the
+        public saved voice profiles (users' own profiles are listed by /voices).
         """
-        # Mock voices for now - replace with actual voice database
-        return [
-            {
-                "voice_id": "xtts_1",
-                "name": "Rachel",
-                "accent": "American",
-                "gender": "female",
-                "language": "en",
-                "preview_url": None
-            },
-            {
-                "voice_id": "xtts_2",
-                "name": "Drew",
-                "accent": "British",
-                "gender": "male",
-                "language": "en",
-                "preview_url": None
-            },
-            {
-                "voice_id": "xtts_3",
-                "name": "Clyde",
-                "accent": "American",
-                "gender": "male",
-                "language": "en",
-                "preview_url": None
-            },
-            {
-                "voice_id": "xtts_4",
-                "name": "Mimi",
-                "accent": "Australian",
-                "gender": "female",
-                "language": "en",
-                "preview_url": None
-            }
-        ]
+        from app.models import get_db
+        from app.services.voice_profile_service import VoiceProfileService
+        
+        db = next(get_db())
+        try:
+            return [
+                {
+                    "voice_id": profile.voice_id,
+                    "name": profile.name,
+                    "accent": profile.accent or "Custom",
+                    "gender": profile.gender or "unknown",
+                    "language": profile.language or "en",
+                    "preview_url": None
+                }
+                for profile in VoiceProfileService.list_public(db)
+            ]
+        finally:
+            db.close()
     
     def cleanup(self):
         """Cleanup model and free GPU memory."""
@@ -1,4 +1,4 @@
 # API v1 module
-from . import auth, tts, usage, admin
+from . import auth, tts, usage, admin, audio, voices
 
-__all__ = ["auth", "tts", "usage", "admin"]
+__all__ = ["auth", "tts", "usage", "admin", "audio", "voices"]
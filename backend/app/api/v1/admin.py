@@ -1,4 +1,7 @@
+from typing import Optional
+from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse, RedirectResponse
 from sqlalchemy.orm import Session
 from app.models import get_db, User
 from app.schemas import FeatureFlagUpdate
@@ -51,12 +54,126 @@ async def get_admin_stats(
     from sqlalchemy import func
     
     total_users = db.query(func.count(User.id)).scalar()
-    total_jobs = db.query(func.count(TTSJob.id)).scalar()
-    completed_jobs = db.query(func.count(TTSJob.id)).filter(TTSJob.status == "completed").scalar()
+    # One pass over tts_jobs (status is indexed) instead of a COUNT per figure;
+    # use /metrics for anything polled frequently
+    jobs_by_status = dict(db.query(TTSJob.status, func.count(TTSJob.id)).group_by(TTSJob.status).all())
+    total_jobs = sum(jobs_by_status.values())
+    completed_jobs = jobs_by_status.get("completed", 0)
+    
+    # Only report on an adapter this process has already loaded (never import the model here)
+    import sys
+    kokoro_instance = getattr(sys.modules.get("app.adapters.tts.kokoro"), "_kokoro_instance", None)
+    phoneme_cache = kokoro_instance.get_phoneme_cache_stats() if kokoro_instance else None
     
     return {
         "total_users": total_users,
         "total_jobs": total_jobs,
         "completed_jobs": completed_jobs,
-        "success_rate": (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0
+        "success_rate": (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0,
+        "jobs_by_status": jobs_by_status,
+        "phoneme_cache": phoneme_cache
     }
+
+
+@router.post("/retention/sweep")
+async def run_retention_sweep(
+    dry_run: bool = True,
+    current_admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Run an audio retention pass now (admin only).
+    
+    Deletes audio past each plan's retention window and transcodes old
+    WAVs to Opus. Defaults to a dry run that only reports what would be reclaimed.
+    """
+    from app.services.retention_service import RetentionService
+    
+    return await RetentionService.sweep(db, dry_run=dry_run)
+
+
+@router.post("/usage/reconcile")
+def reconcile_usage_counters(
+    user_id: Optional[UUID] = None,
+    current_admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Rebuild usage counters for the current month from the usage log (admin only).
+    
+    Safe while traffic is flowing; also prunes expired hourly buckets.
+    """
+    from app.services.usage_service import UsageService
+    
+    return {"buckets_reconciled": UsageService.reconcile_counters(db, user_id=user_id)}
+
+
+@router.post("/voices/previews/render")
+async def render_voice_previews(
+    force: bool = False,
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Queue rendering of missing voice previews on a worker (admin only),
+    e.g. from a deploy hook.
+    
+    With force=true every preview is re-rendered.
+    """
+    from app.services.voice_preview_service import dispatch_render
+    
+    result = dispatch_render(force=force)
+    if result == "unavailable":
+        raise HTTPException(status_code=503, detail="Celery worker unavailable; previews are not rendered in the API process")
+    return {"status": result}
+
+
+@router.get("/jobs/{job_id}/profile")
+async def get_job_profile(
+    job_id: UUID,
+    format: str = "raw",
+    current_admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Download the generate() profile captured for a job (admin only).
+    
+    format=raw returns the trace file (.prof for cProfile, .json chrome
+    trace for torch); format=text renders the top cProfile entries.
+    """
+    import os
+    import tempfile
+    from app.models import TTSJob
+    from app.adapters.storage.local import get_storage_adapter, get_local_storage
+    from app.utils.profiling import render_profile_text
+    
+    job = db.query(TTSJob).filter(TTSJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job.profile_key:
+        raise HTTPException(status_code=404, detail="No profile was captured for this job")
+    if format not in ("raw", "text"):
+        raise HTTPException(status_code=400, detail="format must be 'raw' or 'text'")
+    if format == "text" and not job.profile_key.endswith(".prof"):
+        raise HTTPException(status_code=400, detail="Text rendering is only available for cProfile traces")
+    
+    filename = f"{job_id}{os.path.splitext(job.profile_key)[1]}"
+    
+    if settings.STORAGE_TYPE == "local":
+        path = get_local_storage().resolve_path(job.profile_key)
+        if path is None:
+            raise HTTPException(status_code=404, detail="Profile file is missing from storage")
+        if format == "text":
+            return PlainTextResponse(render_profile_text(str(path)))
+        return FileResponse(path, filename=filename, media_type="application/octet-stream")
+    
+    storage = get_storage_adapter()
+    if format == "raw":
+        return RedirectResponse(await storage.get_url(job.profile_key), status_code=307)
+    
+    fd, tmp_path = tempfile.mkstemp(suffix=".prof")
+    os.close(fd)
+    try:
+        await storage.download_file(job.profile_key, tmp_path)
+        return PlainTextResponse(render_profile_text(tmp_path))
+    finally:
+        os.remove(tmp_path)
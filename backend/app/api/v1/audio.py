@@ -0,0 +1,210 @@
+"""
+Audio delivery route.
+
+Serves generated audio with HTTP range support (so players can seek
+without downloading the whole file), strong ETags and immutable caching
+(object keys are job UUIDs and never rewritten). Bytes are handed to the
+server with the ASGI zero-copy extension (sendfile) when available, or
+offloaded entirely to nginx via X-Accel-Redirect when configured.
+"""
+
+import os
+import mimetypes
+import posixpath
+from pathlib import Path
+from typing import Optional, Tuple
+
+import anyio
+from fastapi import APIRouter, HTTPException, Request, status
+from starlette.responses import RedirectResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.config import get_settings
+from app.utils.audio_urls import verify_audio_signature
+
+router = APIRouter(prefix="/audio", tags=["Audio"])
+
+settings = get_settings()
+
+CHUNK_SIZE = 256 * 1024
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+PRIVATE_CACHE = "private, max-age=300"
+
+# Storage prefixes that live beside audio but must not be served publicly
+PRIVATE_PREFIXES = {"profiles", "voices"}
+
+
+def _is_private_key(key: str) -> bool:
+    return posixpath.normpath(key).lstrip("/").split("/", 1)[0] in PRIVATE_PREFIXES
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into an inclusive (start, end) pair.
+
+    Returns None when the header should be ignored (malformed or
+    multi-range; we answer those with the full body).
+    Raises ValueError when the range is unsatisfiable.
+    """
+    if not header.startswith("bytes=") or "," in header:
+        return None
+
+    start_str, _, end_str = header[6:].strip().partition("-")
+    if not (start_str.isdigit() or start_str == "") or not (end_str.isdigit() or end_str == ""):
+        return None
+
+    if start_str == "":
+        # Suffix range: last N bytes
+        if not end_str or int(end_str) == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - int(end_str)), size - 1
+
+    start = int(start_str)
+    end = int(end_str) if end_str else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, min(end, size - 1)
+
+
+class AudioFileResponse(Response):
+    """
+    File response with single-range support and zero-copy sending.
+    """
+
+    def __init__(self, path: Path, relative_path: str, request: Request, cache_control: str):
+        self.path = path
+        self.relative_path = relative_path
+        self.request = request
+        self.cache_control = cache_control
+        super().__init__(status_code=status.HTTP_200_OK)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        try:
+            stat = await anyio.to_thread.run_sync(os.stat, self.path)
+        except FileNotFoundError:
+            await Response(status_code=status.HTTP_404_NOT_FOUND)(scope, receive, send)
+            return
+
+        size = stat.st_size
+        etag = f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+        media_type = mimetypes.guess_type(str(self.path))[0] or "application/octet-stream"
+        headers = {
+            "accept-ranges": "bytes",
+            "etag": etag,
+            "cache-control": self.cache_control,
+            "content-type": media_type,
+        }
+
+        if self.request.headers.get("if-none-match") == etag:
+            await Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)(scope, receive, send)
+            return
+
+        start, end = 0, size - 1
+        status_code = status.HTTP_200_OK
+        range_header = self.request.headers.get("range")
+        if range_header and size > 0 and self.request.headers.get("if-range", etag) == etag:
+            try:
+                parsed = _parse_range(range_header, size)
+            except ValueError:
+                headers["content-range"] = f"bytes */{size}"
+                await Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)(scope, receive, send)
+                return
+            if parsed is not None:
+                start, end = parsed
+                status_code = status.HTTP_206_PARTIAL_CONTENT
+                headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+        length = end - start + 1 if size > 0 else 0
+
+        # Let nginx do the byte serving (range + sendfile) when it fronts us
+        if settings.AUDIO_ACCEL_REDIRECT_PREFIX:
+            headers.pop("content-range", None)
+            headers["x-accel-redirect"] = settings.AUDIO_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + self.relative_path
+            await Response(status_code=status.HTTP_200_OK, headers=headers)(scope, receive, send)
+            return
+
+        headers["content-length"] = str(length)
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+        })
+
+        if scope["method"] == "HEAD" or length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        with open(self.path, "rb") as f:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                # Server-side sendfile(2): bytes never enter Python
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f.fileno(),
+                    "offset": start,
+                    "count": length,
+                    "more_body": False,
+                })
+                return
+
+            await anyio.to_thread.run_sync(f.seek, start)
+            remaining = length
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(f.read, min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def serve_audio(key: str, request: Request, expires: Optional[int], sig: Optional[str]) -> AudioFileResponse:
+    if _is_private_key(key):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Audio not found")
+    if not verify_audio_signature(key, expires, sig):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired audio URL")
+
+    # Handles sharded layout, legacy flat paths and traversal checks
+    from app.adapters.storage.local import get_local_storage
+    storage = get_local_storage()
+    path = storage.resolve_path(key)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Audio not found")
+
+    relative_path = path.relative_to(storage.base_path.resolve()).as_posix()
+    cache_control = PRIVATE_CACHE if settings.AUDIO_SIGNED_URLS else IMMUTABLE_CACHE
+    return AudioFileResponse(path, relative_path, request, cache_control)
+
+
+async def redirect_to_object_store(key: str, expires: Optional[int], sig: Optional[str]) -> RedirectResponse:
+    """
+    For remote storage, hand the client a presigned URL so the object
+    store (or its CDN) serves the bytes and handles Range itself.
+    """
+    if _is_private_key(key):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Audio not found")
+    if not verify_audio_signature(key, expires, sig):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired audio URL")
+
+    from app.adapters.storage.local import get_storage_adapter
+    url = await get_storage_adapter().get_url(key)
+    return RedirectResponse(
+        url,
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={"cache-control": PRIVATE_CACHE}
+    )
+
+
+@router.api_route("/{key:path}", methods=["GET", "HEAD"])
+async def get_audio(
+    key: str,
+    request: Request,
+    expires: Optional[int] = None,
+    sig: Optional[str] = None
+):
+    """
+    Stream an audio object. Supports Range, If-None-Match and HEAD.
+    """
+    if settings.STORAGE_TYPE != "local":
+        return await redirect_to_object_store(key, expires, sig)
+    return serve_audio(key, request, expires, sig)
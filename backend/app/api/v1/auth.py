@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from app.models import get_db, User
 from app.schemas import UserCreate, UserLogin, AuthResponse, UserResponse
 from app.services.user_service import UserService
-from app.auth import get_current_user
+from app.auth import get_current_principal, UserPrincipal, hash_password_async, PasswordPoolBusy
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -21,7 +21,9 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     print(f"[SIGNUP DEBUG] Password: {user_data.password[:20]}..." if len(user_data.password) > 20 else f"[SIGNUP DEBUG] Password: {user_data.password}")
     
     try:
-        user = UserService.create_user(db, user_data)
+        # bcrypt runs on the dedicated hashing pool, not the event loop
+        password_hash = await hash_password_async(user_data.password)
+        user = UserService.create_user(db, user_data, password_hash=password_hash)
         token = UserService.create_token_for_user(user)
         
         return {
@@ -35,6 +37,12 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
                 credits=user.credits_remaining
             )
         }
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-up requests, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -47,7 +55,14 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
     """
     Authenticate user and return JWT token.
     """
-    user = UserService.authenticate_user(db, credentials.email, credentials.password)
+    try:
+        user = await UserService.authenticate_user_async(db, credentials.email, credentials.password)
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login requests, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
     
     if not user:
         raise HTTPException(
@@ -74,7 +89,7 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: UserPrincipal = Depends(get_current_principal)):
     """
     Get current authenticated user's information.
     """
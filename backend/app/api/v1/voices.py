@@ -0,0 +1,133 @@
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, UploadFile, File, Form
+from sqlalchemy.orm import Session
+from typing import List
+from app.models import get_db, User
+from app.schemas import VoiceProfileResponse
+from app.services.voice_profile_service import VoiceProfileService
+from app.services.voice_preview_service import VoicePreviewService
+from app.auth import UserPrincipal
+from app.config import get_settings, PRICING_TIERS
+from app.api.v1.tts import get_test_user, get_test_principal, check_redis
+
+router = APIRouter(prefix="/voices", tags=["Voice Profiles"])
+settings = get_settings()
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+def _dispatch_latents(profile_id: str, background_tasks: BackgroundTasks):
+    """Precompute latents on a Celery worker if one is reachable, else in-process."""
+    from app.workers.tts_worker import precompute_voice_latents, _precompute_voice_latents_sync, CELERY_AVAILABLE
+
+    if CELERY_AVAILABLE and check_redis():
+        try:
+            precompute_voice_latents.delay(profile_id)
+            return
+        except Exception as queue_err:
+            print(f"[Voices] Could not queue latents for {profile_id}: {queue_err}")
+    background_tasks.add_task(_precompute_voice_latents_sync, profile_id)
+
+
+@router.post("", response_model=VoiceProfileResponse, status_code=status.HTTP_201_CREATED)
+async def create_voice_profile(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    name: str = Form(..., min_length=1, max_length=100),
+    language: str = Form("en"),
+    gender: str = Form("unknown"),
+    accent: str = Form("Custom"),
+    is_public: bool = Form(False),
+    current_user: User = Depends(get_test_user), # Same bypass as the TTS routes
+    db: Session = Depends(get_db)
+):
+    """
+    Upload a reference recording once and save it as a cloning voice.
+
+    The audio is validated (length, silence), mixed to mono, trimmed and
+    resampled; its XTTS conditioning latents are computed in the
+    background. Use the returned voice_id in /tts/generate.
+    """
+    if not settings.ENABLE_VOICE_CLONING:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Voice cloning is currently disabled")
+    tier = PRICING_TIERS.get(current_user.plan, PRICING_TIERS["free"])
+    if not tier["voice_cloning"] and settings.ENVIRONMENT != "development":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Voice cloning not available on {current_user.plan} plan")
+    if is_public and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can publish voices")
+
+    from app.utils.scratch import job_scratch
+    max_bytes = settings.VOICE_PROFILE_MAX_UPLOAD_MB * 1024 * 1024
+
+    with job_scratch(f"voice-upload-{current_user.id}") as scratch:
+        # Stream the upload to scratch, refusing oversized files early
+        upload_path = scratch.new_file(".upload")
+        size = 0
+        with open(upload_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Reference audio exceeds {settings.VOICE_PROFILE_MAX_UPLOAD_MB} MB"
+                    )
+                f.write(chunk)
+
+        try:
+            profile = await VoiceProfileService.create_profile(
+                db, current_user, str(upload_path),
+                name=name, language=language, gender=gender, accent=accent, is_public=is_public
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if not profile.latents_ready:
+        _dispatch_latents(str(profile.id), background_tasks)
+    if profile.is_public:
+        VoicePreviewService.invalidate_voices()
+    return profile
+
+
+@router.get("", response_model=List[VoiceProfileResponse])
+async def list_voice_profiles(
+    current_user: UserPrincipal = Depends(get_test_principal), # Bypass auth
+    db: Session = Depends(get_db)
+):
+    """
+    List the current user's saved voices (newest first).
+    """
+    return VoiceProfileService.list_profiles(db, current_user.id)
+
+
+@router.get("/{voice_id}", response_model=VoiceProfileResponse)
+async def get_voice_profile(
+    voice_id: str,
+    current_user: UserPrincipal = Depends(get_test_principal), # Bypass auth
+    db: Session = Depends(get_db)
+):
+    """
+    Get one saved voice (own or public).
+    """
+    profile = VoiceProfileService.get_profile(db, voice_id, current_user.id)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Voice profile not found")
+    return profile
+
+
+@router.delete("/{voice_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_voice_profile(
+    voice_id: str,
+    current_user: UserPrincipal = Depends(get_test_principal), # Bypass auth
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a saved voice and its reference audio. Jobs already created
+    with it will fail.
+    """
+    profile = VoiceProfileService.get_profile(db, voice_id, current_user.id)
+    if not profile or (profile.user_id != current_user.id and current_user.role != "admin"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Voice profile not found")
+
+    was_public = profile.is_public
+    await VoiceProfileService.delete_profile(db, profile)
+    if was_public:
+        VoicePreviewService.invalidate_voices()
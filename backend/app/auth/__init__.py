@@ -1,6 +1,8 @@
 # Auth module
 from .jwt import create_access_token, decode_access_token, verify_password, get_password_hash
-from .dependencies import get_current_user, get_current_admin
+from .dependencies import get_current_user, get_current_principal, get_current_admin
+from .principal_cache import UserPrincipal, invalidate_user
+from .hashing import hash_password_async, verify_password_async, PasswordPoolBusy
 
 __all__ = [
     "create_access_token",
@@ -8,5 +10,11 @@ __all__ = [
     "verify_password",
     "get_password_hash",
     "get_current_user",
-    "get_current_admin"
+    "get_current_principal",
+    "get_current_admin",
+    "UserPrincipal",
+    "invalidate_user",
+    "hash_password_async",
+    "verify_password_async",
+    "PasswordPoolBusy"
 ]
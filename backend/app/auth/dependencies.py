@@ -5,6 +5,7 @@ from typing import Optional
 from uuid import UUID
 from app.models import User, get_db
 from app.auth.jwt import decode_access_token
+from app.auth.principal_cache import principal_cache, UserPrincipal
 
 security = HTTPBearer()
 
@@ -54,12 +55,60 @@ async def get_current_user(
             detail="User account is inactive"
         )
     
+    # Refresh the cached snapshot while we have the row anyway
+    principal_cache.put(user)
+    
     return user
 
 
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> UserPrincipal:
+    """
+    Dependency for read-only endpoints that only need user identity,
+    plan, role and quota snapshot.
+    
+    Served from the per-process principal cache; the database is only
+    queried on a cache miss, so hot polling endpoints skip the users query.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    payload = decode_access_token(credentials.credentials)
+    if payload is None or payload.get("user_id") is None:
+        raise credentials_exception
+    
+    try:
+        user_id = UUID(payload["user_id"])
+    except ValueError:
+        raise credentials_exception
+    
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        db = next(get_db())
+        try:
+            user = db.query(User).filter(User.id == user_id).first()
+            if user is None:
+                raise credentials_exception
+            principal = principal_cache.put(user)
+        finally:
+            db.close()
+    
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    
+    return principal
+
+
 async def get_current_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_principal)
+) -> UserPrincipal:
     """
     Dependency to ensure current user is an admin.
     """
@@ -0,0 +1,115 @@
+"""
+Bounded worker pool for bcrypt hashing and verification.
+
+bcrypt is deliberately slow (~100ms+ per call at the default cost). Calling
+it inside an `async def` route stalls the event loop for every other
+request, so the auth routes hand it to a small dedicated thread pool
+instead. The pool is bounded: once PASSWORD_HASH_MAX_QUEUE calls are
+waiting, new ones are rejected so a login burst degrades into 503s rather
+than an ever-growing backlog. Queue length, running calls, rejections
+and queue wait are exported as Prometheus metrics (app.utils.metrics).
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from app.config import get_settings
+from app.auth.jwt import verify_password, get_password_hash
+from app.utils.metrics import (
+    PASSWORD_HASH_QUEUED, PASSWORD_HASH_RUNNING, PASSWORD_HASH_REJECTED, PASSWORD_HASH_WAIT_SECONDS
+)
+
+settings = get_settings()
+
+
+class PasswordPoolBusy(RuntimeError):
+    """Raised when the hashing queue is full."""
+    pass
+
+
+class PasswordHashPool:
+    """
+    Thread pool wrapper that tracks queue length and latency.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    async def run(self, fn: Callable, *args):
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                PASSWORD_HASH_REJECTED.inc()
+                raise PasswordPoolBusy("Password hashing queue is full")
+            self._queued += 1
+            PASSWORD_HASH_QUEUED.inc()
+
+        submitted_at = time.perf_counter()
+
+        def _task():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait += started_at - submitted_at
+            PASSWORD_HASH_QUEUED.dec()
+            PASSWORD_HASH_RUNNING.inc()
+            PASSWORD_HASH_WAIT_SECONDS.observe(started_at - submitted_at)
+            try:
+                return fn(*args)
+            finally:
+                PASSWORD_HASH_RUNNING.dec()
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._total_run += time.perf_counter() - started_at
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _task)
+
+    def stats(self) -> Dict:
+        """Snapshot of queue and latency metrics."""
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / completed * 1000, 2),
+                "avg_run_ms": round(self._total_run / completed * 1000, 2)
+            }
+
+
+password_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt pool."""
+    return await password_pool.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt pool."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+def get_password_pool_stats() -> Dict:
+    return password_pool.stats()
@@ -9,7 +9,8 @@ settings = get_settings()
 # Password hashing
 pwd_context = CryptContext(
     schemes=["bcrypt"],
-    deprecated="auto"
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
 )
 
 
@@ -0,0 +1,143 @@
+"""
+Per-process TTL cache of authenticated user principals.
+
+Polling clients hit read-only endpoints many times a second; caching the
+handful of user fields those endpoints need avoids a `users` query per
+request. Entries expire after USER_CACHE_TTL_SECONDS and are invalidated
+explicitly whenever this process changes plan or quota. Writes made by
+other processes (e.g. the Celery worker deducting quota) become visible
+once the TTL lapses.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class UserPrincipal:
+    """
+    Read-only snapshot of the user fields needed for auth and quota display.
+    Not attached to a DB session; safe to share between requests.
+    """
+
+    __slots__ = (
+        "id", "email", "name", "role", "plan", "is_active",
+        "credits_remaining", "credits_total", "quota_reset_date"
+    )
+
+    def __init__(
+        self,
+        id: UUID,
+        email: str,
+        name: Optional[str],
+        role: str,
+        plan: str,
+        is_active: bool,
+        credits_remaining: int,
+        credits_total: int,
+        quota_reset_date: Optional[datetime]
+    ):
+        self.id = id
+        self.email = email
+        self.name = name
+        self.role = role
+        self.plan = plan
+        self.is_active = is_active
+        self.credits_remaining = credits_remaining
+        self.credits_total = credits_total
+        self.quota_reset_date = quota_reset_date
+
+    @classmethod
+    def from_user(cls, user) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            role=user.role,
+            plan=user.plan,
+            is_active=user.is_active,
+            credits_remaining=user.credits_remaining,
+            credits_total=user.credits_total,
+            quota_reset_date=user.quota_reset_date
+        )
+
+    def __repr__(self):
+        return f"<UserPrincipal {self.email} ({self.plan})>"
+
+
+class PrincipalCache:
+    """
+    Thread-safe LRU cache of UserPrincipal keyed by user id, with a TTL.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[UUID, tuple[float, UserPrincipal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: UUID) -> Optional[UserPrincipal]:
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, principal = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return principal
+
+    def put(self, user) -> UserPrincipal:
+        """Snapshot a User row into the cache and return the principal."""
+        principal = UserPrincipal.from_user(user)
+        if self.ttl_seconds <= 0:
+            return principal
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate(self, user_id: UUID):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_entries=settings.USER_CACHE_MAX_ENTRIES
+)
+
+
+def invalidate_user(user_id: UUID):
+    """Drop a user's cached principal after changing their plan, role or quota."""
+    principal_cache.invalidate(user_id)
@@ -14,30 +14,85 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 20
+    REDIS_HEALTH_CHECK_INTERVAL: float = 2.0  # seconds between background pings
+    REDIS_HEALTH_TTL: float = 5.0  # cached liveness older than this counts as down
+    
+    # Rate Limiting (per-plan limits live in PRICING_TIERS)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_POLL_MULTIPLIER: int = 10  # job-status polls get their own budget of rate_limit x this
+    USAGE_HOURLY_RETENTION_HOURS: int = 48  # hourly usage counter buckets kept for rate-limit checks
     
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    USER_CACHE_TTL_SECONDS: float = 30.0  # per-process principal cache, 0 disables
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # bcrypt cost factor (each +1 doubles hash time)
+    PASSWORD_HASH_WORKERS: int = 4  # dedicated bcrypt threads
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # waiting calls before rejecting with 503
+    
+    # Observability
+    METRICS_ENABLED: bool = True  # serve Prometheus metrics at /metrics
+    PROFILING_ENABLED: bool = False  # profile adapter.generate for selected jobs
+    PROFILE_SAMPLE_RATE: float = 0.0  # fraction of jobs always profiled
+    PROFILE_THRESHOLD_SECONDS: float = 0.0  # also keep profiles of jobs slower than this (0 = off)
+    PROFILE_MODE: str = "cprofile"  # cprofile, torch
     
     # Environment
     ENVIRONMENT: str = "development"
     
     # TTS Configuration
     TTS_ENGINE: str = "kokoro"  # Options: "kokoro", "xtts", "indicparler"
+    PRELOAD_MODELS: bool = True  # load IndicParler at startup instead of on first request
     USE_GPU: bool = False
     XTTS_MODEL_PATH: str = "./models/xtts_v2"
+    XTTS_LATENT_CACHE_DIR: str = "./models/xtts_latents"  # persisted speaker conditioning, empty = memory only
+    XTTS_LATENT_CACHE_ENTRIES: int = 256  # in-memory entries (speaker references)
+    XTTS_LATENT_CACHE_DISK_ENTRIES: int = 5000  # .pt files kept on disk (least recently used pruned), 0 = unbounded
+    XTTS_STREAMING: bool = True  # inference_stream for cloned voices (bounded memory, progressive segments)
+    XTTS_STREAM_CHUNK_SIZE: int = 20  # GPT tokens decoded per streamed chunk
+    XTTS_STREAM_SEGMENT_SECONDS: float = 10.0  # audio per published segment, 0 disables progressive delivery
+    XTTS_SEGMENT_GRACE_SECONDS: int = 600  # keep published segments this long after the job finishes
     MAX_CHARS_PER_REQUEST: int = 2000  # Increased since we now support chunking
     KOKORO_VOICE_PRESET: str = "af_sky"  # Default Kokoro voice
+    KOKORO_CHUNK_TOKENS: int = 300  # phonemes per chunk (model hard limit is 510)
+    KOKORO_PHONEME_CACHE_ENABLED: bool = True
+    KOKORO_PHONEME_CACHE_ENTRIES: int = 20000  # sentence/clause LRU entries
+    KOKORO_PHONEME_CACHE_PATH: str = ""  # e.g. ./models/kokoro_phonemes.json to persist across restarts
     
     # IndicParler-TTS Configuration
     INDICPARLER_MODEL: str = "ai4bharat/indic-parler-tts"
+    INDICPARLER_CHUNK_TOKENS: int = 128  # prompt tokens per chunk
     SUPPORTED_INDIAN_LANGUAGES: list = [
         'hi', 'bn', 'ta', 'te', 'mr', 'gu', 'kn', 'ml',
         'pa', 'or', 'as', 'ur', 'sa', 'ks', 'ne', 'sd',
         'bo', 'doi', 'kok', 'mai', 'mni', 'sat'
     ]
     
+    # Script-based routing of mixed-language text
+    SCRIPT_ROUTING_ENABLED: bool = True
+    SCRIPT_ROUTING_MIN_LATIN_WORDS: int = 4  # shorter English runs stay with the surrounding Indic engine
+    SCRIPT_RUN_CACHE_MB: int = 64  # rendered-run audio cache
+    
+    # Voice previews
+    VOICE_PREVIEW_RENDER: str = "off"  # when the API queues preview rendering on Celery: startup, lazy (first /tts/voices request), off (admin-triggered only)
+    
+    # Saved voice profiles (XTTS cloning references)
+    VOICE_PROFILE_MAX_UPLOAD_MB: int = 10
+    VOICE_PROFILE_MIN_SECONDS: float = 3.0  # shorter references clone poorly
+    VOICE_PROFILE_MAX_SECONDS: float = 30.0  # longer uploads are trimmed (XTTS uses at most 30s)
+    VOICE_PROFILE_SAMPLE_RATE: int = 22050  # XTTS conditioning rate
+    VOICE_PROFILE_CACHE_DIR: str = "./models/voice_refs"  # local copies of references when storage is remote
+    
+    # Coalescing of identical in-flight jobs
+    COALESCING_ENABLED: bool = True  # attach duplicate requests to a running job instead of synthesizing again
+    COALESCE_MAX_AGE_SECONDS: int = 600  # don't attach to jobs older than this (likely stuck)
+    
     # Feature Flags
     ENABLE_VOICE_CLONING: bool = False  # Disabled for Kokoro (XTTS only)
     ENABLE_API_ACCESS: bool = True
@@ -49,11 +104,36 @@ class Settings(BaseSettings):
     PRO_MONTHLY_QUOTA: int = 10000000      # 10M characters per month
     INDIC_LANGUAGE_MULTIPLIER: float = 2.0  # Indic languages cost 2x characters
     
+    # Scratch space for synthesis intermediates
+    SCRATCH_DIR: str = ""  # default: <system temp>/tts_output
+    SCRATCH_USE_TMPFS: bool = False  # use /dev/shm when SCRATCH_DIR is unset
+    SCRATCH_MAX_AGE_SECONDS: int = 3600  # janitor reaps orphans older than this
+    SCRATCH_JANITOR_INTERVAL: int = 600
+    
+    # Audio retention (per-plan TTLs live in PRICING_TIERS)
+    RETENTION_ENABLED: bool = False
+    RETENTION_SWEEP_INTERVAL: int = 3600  # seconds between background sweeps
+    RETENTION_BATCH_SIZE: int = 200
+    RETENTION_TRANSCODE_AFTER_DAYS: int = 0  # re-encode WAVs older than this to Opus, 0 disables
+    RETENTION_OPUS_BITRATE: str = "32k"
+    
     # Storage
     STORAGE_TYPE: str = "local"  # local, s3
+    LOCAL_STORAGE_PATH: str = "./storage"
+    LOCAL_STORAGE_SHARD_DEPTH: int = 2  # hash-prefix directory levels under each key's folder
+    
+    # Audio delivery
+    AUDIO_BASE_URL: str = "http://localhost:8000"  # public origin used in audio URLs (API host or CDN)
+    AUDIO_SIGNED_URLS: bool = False  # require HMAC-signed, expiring audio URLs
+    AUDIO_URL_TTL_SECONDS: int = 3600
+    AUDIO_ACCEL_REDIRECT_PREFIX: str = ""  # e.g. "/protected-audio/" to let nginx sendfile the bytes
     AWS_ACCESS_KEY_ID: str = ""
     AWS_SECRET_ACCESS_KEY: str = ""
     S3_BUCKET_NAME: str = ""
+    S3_REGION: str = "us-east-1"
+    S3_ENDPOINT_URL: str = ""  # set for MinIO / moto server, e.g. http://localhost:9000
+    S3_MAX_POOL_CONNECTIONS: int = 20
+    S3_MULTIPART_CHUNK_MB: int = 8
     
     # Billing
     BILLING_PROVIDER: str = "razorpay"  # razorpay, stripe
@@ -90,27 +170,35 @@ PRICING_TIERS = {
         "quota_type": "daily",
         "quota": _settings.FREE_DAILY_QUOTA,
         "voice_cloning": False,
-        "priority": 0
+        "priority": 0,
+        "rate_limit": 60,  # requests per RATE_LIMIT_WINDOW_SECONDS
+        "audio_retention_days": 7  # days to keep generated audio (-1 = forever)
     },
     "starter": {
         "price": 299,
         "quota_type": "monthly",
         "quota": _settings.STARTER_MONTHLY_QUOTA,
         "voice_cloning": True,
-        "priority": 1
+        "priority": 1,
+        "rate_limit": 120,
+        "audio_retention_days": 30
     },
     "pro": {
         "price": 999,
         "quota_type": "monthly",
         "quota": _settings.PRO_MONTHLY_QUOTA,
         "voice_cloning": True,
-        "priority": 2
+        "priority": 2,
+        "rate_limit": 300,
+        "audio_retention_days": 90
     },
     "api": {
         "price": 0,  # Pay per use
         "quota_type": "unlimited",
         "quota": -1,
         "voice_cloning": True,
-        "priority": 2
+        "priority": 2,
+        "rate_limit": 600,
+        "audio_retention_days": 90
     }
 }
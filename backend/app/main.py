@@ -1,13 +1,13 @@
 import os
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from app.config import get_settings
 from app.models import create_tables
-from app.api.v1 import auth, tts, usage, admin
+from app.api.v1 import auth, tts, usage, admin, audio, voices
+from app.middleware import RateLimitMiddleware, MetricsMiddleware
 
 settings = get_settings()
 
@@ -18,6 +18,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Per-plan rate limiting for TTS routes (runs before any DB work).
+# Added before CORS so CORS wraps it: 429s get CORS headers and preflights pass.
+app.add_middleware(RateLimitMiddleware, path_prefix="/api/v1/tts")
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -27,16 +31,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route request counts and latency (outermost, so rejected requests count too)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(tts.router, prefix="/api/v1")
 app.include_router(usage.router, prefix="/api/v1")
 app.include_router(admin.router, prefix="/api/v1")
+app.include_router(audio.router, prefix="/api/v1")
+app.include_router(voices.router, prefix="/api/v1")
 
-# Serve static files (audio)
-storage_path = Path("./storage")
+# Audio storage (served by the audio delivery route)
+storage_path = Path(settings.LOCAL_STORAGE_PATH)
 storage_path.mkdir(exist_ok=True)
-app.mount("/storage", StaticFiles(directory=str(storage_path)), name="storage")
+
+
+@app.api_route("/storage/{key:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def legacy_storage(key: str, request: Request):
+    """Serve audio URLs issued before the /api/v1/audio route existed."""
+    return audio.serve_audio(key, request, None, None)
 
 
 @app.on_event("startup")
@@ -45,23 +60,70 @@ async def startup_event():
     print("--- STARTUP: Initializing database ---")
     create_tables()
     print("--- STARTUP: Database tables created ---")
+    
+    # First deploy with usage counters: build them from the usage log
+    from app.models import get_db
+    from app.services.usage_service import UsageService
+    db = next(get_db())
+    try:
+        backfilled = UsageService.backfill_counters(db)
+        if backfilled:
+            print(f"--- STARTUP: Backfilled {backfilled} usage counter buckets ---")
+    except Exception as e:
+        print(f"--- STARTUP: Usage counter backfill failed (retry via /admin/usage/reconcile): {e} ---")
+    finally:
+        db.close()
     print(f"--- STARTUP: Environment: {settings.ENVIRONMENT} ---")
     print(f"--- STARTUP: GPU enabled: {settings.USE_GPU} ---")
     
+    # Prime the Redis health cache once, then keep it fresh in the background
+    from app.utils.redis_client import redis_health
+    redis_available = redis_health.check_now()
+    redis_health.start()
+    print(f"--- STARTUP: Redis available: {redis_available} ---")
+    
+    # Reap scratch files left by previous runs, then keep reaping in the background
+    from app.utils.scratch import reap_orphans, scratch_janitor, get_scratch_root
+    reap_orphans()
+    scratch_janitor.start()
+    print(f"--- STARTUP: Scratch space: {get_scratch_root()} ---")
+    
+    if settings.RETENTION_ENABLED:
+        from app.services.retention_service import retention_sweeper
+        retention_sweeper.start()
+        print(f"--- STARTUP: Audio retention sweeper running every {settings.RETENTION_SWEEP_INTERVAL}s ---")
+    
+    if settings.VOICE_PREVIEW_RENDER == "startup":
+        from app.services.voice_preview_service import preview_renderer
+        preview_renderer.start()
+        print("--- STARTUP: Queued rendering of missing voice previews ---")
+    
     # Preload IndicParler model for faster first request
-    print("--- STARTUP: Preloading IndicParler model ---")
-    try:
-        from app.adapters.tts.indicparler import get_indicparler_adapter
-        adapter = get_indicparler_adapter()
-        adapter._load_model()
-        print("--- STARTUP: IndicParler model ready ---")
-    except Exception as e:
-        print(f"--- STARTUP: Failed to preload IndicParler model: {e} ---")
-        print("--- STARTUP: Model will lazy-load on first request ---")
+    if settings.PRELOAD_MODELS:
+        print("--- STARTUP: Preloading IndicParler model ---")
+        try:
+            from app.adapters.tts.indicparler import get_indicparler_adapter
+            adapter = get_indicparler_adapter()
+            adapter._load_model()
+            print("--- STARTUP: IndicParler model ready ---")
+        except Exception as e:
+            print(f"--- STARTUP: Failed to preload IndicParler model: {e} ---")
+            print("--- STARTUP: Model will lazy-load on first request ---")
     
     print("--- STARTUP: Application ready ---")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background monitors."""
+    from app.utils.redis_client import redis_health
+    from app.utils.scratch import scratch_janitor
+    from app.services.retention_service import retention_sweeper
+    redis_health.stop()
+    scratch_janitor.stop()
+    retention_sweeper.stop()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -73,16 +135,44 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+def health_check():
     """Detailed health check."""
+    from sqlalchemy import text
+    from app.models import engine
+    from app.utils.redis_client import redis_health
+    from app.utils.metrics import loaded_adapters, gpu_available
+    from app.utils.scratch import scratch_usage
+    
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        database = "connected"
+    except Exception as e:
+        print(f"[HEALTH] Database check failed: {e}")
+        database = "unavailable"
+    
     return {
-        "status": "healthy",
-        "database": "connected",
-        "tts_engine": "xtts_v2",
-        "gpu_available": settings.USE_GPU
+        "status": "healthy" if database == "connected" else "degraded",
+        "database": database,
+        "redis": "connected" if redis_health.is_healthy() else "unavailable",
+        "tts_engine": settings.TTS_ENGINE,
+        "models_loaded": {engine_name: adapter.is_model_loaded() for engine_name, adapter in loaded_adapters().items()},
+        "gpu_available": gpu_available(),
+        "scratch": scratch_usage()
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics (in-memory only; no database access)."""
+    from app.utils.metrics import PROMETHEUS_AVAILABLE, render_metrics
+    
+    if not settings.METRICS_ENABLED or not PROMETHEUS_AVAILABLE:
+        return Response("metrics unavailable (disabled or prometheus_client not installed)\n", status_code=503, media_type="text/plain")
+    payload, content_type = render_metrics()
+    return Response(payload, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
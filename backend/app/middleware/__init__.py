@@ -0,0 +1,5 @@
+# Middleware module
+from .rate_limit import RateLimitMiddleware, RateLimiter
+from .metrics import MetricsMiddleware
+
+__all__ = ["RateLimitMiddleware", "RateLimiter", "MetricsMiddleware"]
@@ -0,0 +1,42 @@
+"""
+Request metrics middleware.
+
+Counts requests and observes latency per route template (e.g.
+/api/v1/tts/jobs/{job_id}), so label cardinality stays bounded no matter
+how many job ids are polled. Written as plain ASGI rather than
+BaseHTTPMiddleware to keep per-request overhead to a couple of
+perf_counter calls.
+"""
+
+import time
+
+from app.utils.metrics import HTTP_REQUESTS, HTTP_LATENCY
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router records the matched route on the (shared) scope
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_LATENCY.labels(method=method, route=template).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method=method, route=template, status=str(status_code)).inc()
@@ -0,0 +1,200 @@
+"""
+Per-plan rate limiting middleware.
+
+Uses a Redis sorted-set sliding window so limits hold across API
+processes. When Redis is unreachable, falls back to an in-process
+token bucket so requests are still limited (per process) instead of
+failing open or blocking on the broker.
+"""
+
+import re
+import time
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.auth.jwt import decode_access_token
+from app.config import get_settings, PRICING_TIERS
+from app.utils.redis_client import get_async_redis, redis_health
+
+settings = get_settings()
+
+# How long to skip Redis after a failed call before trying again
+REDIS_RETRY_SECONDS = 5.0
+
+# Most keys (users/IPs) the in-process fallback tracks at once
+LOCAL_MAX_KEYS = 10000
+
+# Job-status polls (GET {prefix}/jobs/{id}) are budgeted separately from
+# generate/history calls, so progressive playback doesn't starve the plan limit
+POLL_PATH = re.compile(r"/jobs/[^/]+/?$")
+
+
+class TokenBucket:
+    """
+    In-process token bucket used when Redis is unavailable.
+    Refills `capacity` tokens evenly over `window_seconds`.
+    """
+
+    def __init__(self, capacity: int, window_seconds: int):
+        self.capacity = capacity
+        self.refill_rate = capacity / window_seconds
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def consume(self) -> Tuple[bool, float]:
+        """
+        Take one token.
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, 0.0
+        return False, (1 - self.tokens) / self.refill_rate
+
+
+class RateLimiter:
+    """
+    Sliding-window rate limiter with a Redis backend and local fallback.
+
+    Redis calls go through the shared async pool (app.utils.redis_client).
+    Fallback buckets are kept in LRU order and dropped once idle for a full
+    window (a refilled bucket is the same as a new one) or when more than
+    `max_local_keys` are tracked.
+    """
+
+    def __init__(self, window_seconds: int, max_local_keys: int = LOCAL_MAX_KEYS):
+        self.window_seconds = window_seconds
+        self.max_local_keys = max_local_keys
+        self._redis_down_until = 0.0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def _hit_redis(self, key: str, limit: int) -> Tuple[bool, float]:
+        """
+        Record a hit in the Redis sliding window for `key`.
+        """
+        now = time.time()
+        window_start = now - self.window_seconds
+        redis_key = f"ratelimit:{key}"
+        member = f"{now}:{uuid.uuid4().hex[:8]}"
+
+        pipe = get_async_redis().pipeline(transaction=True)
+        pipe.zremrangebyscore(redis_key, 0, window_start)
+        pipe.zadd(redis_key, {member: now})
+        pipe.zcard(redis_key)
+        pipe.zrange(redis_key, 0, 0, withscores=True)
+        pipe.expire(redis_key, self.window_seconds)
+        _, _, count, oldest, _ = await pipe.execute()
+
+        if count <= limit:
+            return True, 0.0
+
+        # Over the limit: the rejected hit must not count towards the window
+        await get_async_redis().zrem(redis_key, member)
+        retry_after = oldest[0][1] + self.window_seconds - now if oldest else self.window_seconds
+        return False, max(retry_after, 0.0)
+
+    def _hit_local(self, key: str, limit: int) -> Tuple[bool, float]:
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            if bucket is None or bucket.capacity != limit:
+                bucket = TokenBucket(limit, self.window_seconds)
+            result = bucket.consume()
+            self._buckets[key] = bucket
+            self._evict_local()
+            return result
+
+    def _evict_local(self):
+        idle_since = time.monotonic() - self.window_seconds
+        while self._buckets:
+            oldest = next(iter(self._buckets.values()))
+            if len(self._buckets) <= self.max_local_keys and oldest.updated_at >= idle_since:
+                break
+            self._buckets.popitem(last=False)
+
+    async def hit(self, key: str, limit: int) -> Tuple[bool, float]:
+        """
+        Count a request for `key` against `limit`.
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        if time.monotonic() >= self._redis_down_until and redis_health.is_healthy():
+            try:
+                return await self._hit_redis(key, limit)
+            except Exception as e:
+                print(f"[RATE LIMIT] Redis unavailable, using in-process limiter: {e}")
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+        return self._hit_local(key, limit)
+
+
+def _identify(request: Request) -> Tuple[str, str]:
+    """
+    Resolve the rate-limit key and plan from the request without touching the DB.
+
+    Authenticated requests are keyed by user id and use the plan claim
+    from the JWT; anonymous requests are keyed by client IP on the free plan.
+    """
+    auth_header = request.headers.get("authorization", "")
+    if auth_header.lower().startswith("bearer "):
+        payload = decode_access_token(auth_header[7:])
+        if payload and payload.get("user_id"):
+            return f"user:{payload['user_id']}", payload.get("plan", "free")
+
+    client_host = request.client.host if request.client else "unknown"
+    return f"ip:{client_host}", "free"
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Rejects requests over the caller's plan limit with 429 before the
+    route (and its DB session) runs.
+
+    Register it before CORSMiddleware so CORS wraps it and 429s carry
+    CORS headers. Preflight OPTIONS requests are never counted.
+    """
+
+    def __init__(self, app, path_prefix: str = "/api/v1/tts", limiter: Optional[RateLimiter] = None):
+        super().__init__(app)
+        self.path_prefix = path_prefix
+        self.limiter = limiter or RateLimiter(settings.RATE_LIMIT_WINDOW_SECONDS)
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        if not settings.RATE_LIMIT_ENABLED or request.method == "OPTIONS" or not path.startswith(self.path_prefix):
+            return await call_next(request)
+
+        key, plan = _identify(request)
+        tier = PRICING_TIERS.get(plan, PRICING_TIERS["free"])
+        limit = tier["rate_limit"]
+        if request.method == "GET" and POLL_PATH.search(path[len(self.path_prefix):]):
+            key = f"poll:{key}"
+            limit *= settings.RATE_LIMIT_POLL_MULTIPLIER
+
+        allowed, retry_after = await self.limiter.hit(key, limit)
+        if not allowed:
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+                content={
+                    "error": "RATE_LIMITED",
+                    "message": f"Too many requests. Your {plan} plan allows {limit} requests per {self.limiter.window_seconds} seconds.",
+                    "retry_after": round(retry_after, 2)
+                }
+            )
+
+        return await call_next(request)
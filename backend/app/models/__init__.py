@@ -3,10 +3,37 @@ from app.utils.database import Base, get_db, engine
 from .user import User
 from .tts_job import TTSJob
 from .usage_log import UsageLog
+from .usage_counter import UsageCounter
+from .voice_profile import VoiceProfile
 
-__all__ = ["Base", "get_db", "engine", "User", "TTSJob", "UsageLog"]
+__all__ = ["Base", "get_db", "engine", "User", "TTSJob", "UsageLog", "UsageCounter", "VoiceProfile"]
 
 
 def create_tables():
     """Create all tables in the database."""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+
+
+def _add_missing_columns():
+    """
+    create_all() doesn't alter existing tables, so add any nullable
+    columns a model gained since its table was created.
+    """
+    from sqlalchemy import inspect, text
+    
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                print(f"[DB] Adding column {table.name}.{column.name} ({column_type})")
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                for index in table.indexes:
+                    if column in index.columns:
+                        index.create(bind=conn, checkfirst=True)
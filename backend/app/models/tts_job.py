@@ -27,15 +27,20 @@ class TTSJob(Base):
     # Processing
     status = Column(String, default="queued", index=True)  # queued, processing, completed, failed
     priority = Column(Integer, default=0)  # Higher = processed first
+    synthesis_key = Column(String, nullable=True, index=True)  # hash of the normalized synthesis inputs
+    coalesced_with = Column(UUID(as_uuid=True), nullable=True, index=True)  # job whose synthesis this one reuses
     
     # Output
     audio_url = Column(String, nullable=True)
+    stream_segments = Column(JSON, nullable=True)  # URLs of audio segments published while synthesis runs
     duration_seconds = Column(Integer, nullable=True)
     
     # Metadata
     character_count = Column(Integer, nullable=False)
     settings = Column(JSON, nullable=True)  # stability, similarity_boost, etc.
     error_message = Column(Text, nullable=True)
+    timings = Column(JSON, nullable=True)  # per-stage seconds: {"total", "stages": {...}, "chunks": [...]}
+    profile_key = Column(String, nullable=True)  # storage key of a generate() profile, if one was kept
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+from app.utils.database import Base
+
+
+class UsageCounter(Base):
+    """
+    Pre-aggregated usage counter per user and time bucket.
+    
+    Maintained incrementally alongside UsageLog writes so that usage stats
+    and rate-limit checks are single-row lookups instead of log scans.
+    The log stays the source of truth (see UsageService.reconcile_counters).
+    """
+    __tablename__ = "usage_counters"
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", "period_start", name="uq_usage_counter_bucket"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    
+    period = Column(String, nullable=False)  # hour, day, month
+    period_start = Column(DateTime, nullable=False)
+    
+    characters_used = Column(Integer, nullable=False, default=0)
+    request_count = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<UsageCounter user={self.user_id} {self.period}@{self.period_start} chars={self.characters_used}>"
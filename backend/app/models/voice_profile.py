@@ -0,0 +1,45 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+from app.utils.database import Base
+
+
+class VoiceProfile(Base):
+    """
+    A saved cloning voice: one validated, resampled reference recording,
+    referenced by `voice_id` in TTS requests instead of a speaker_wav_url.
+
+    The reference is stored once under `voices/` (never served publicly);
+    its XTTS conditioning latents are computed after upload and cached by
+    content hash, so clone jobs skip reference processing.
+    """
+    __tablename__ = "voice_profiles"
+    __table_args__ = (
+        Index("ix_voice_profiles_user_created", "user_id", "created_at"),
+        Index("ix_voice_profiles_public_name", "is_public", "name"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    voice_id = Column(String, unique=True, nullable=False, index=True)  # "profile_<id>", used in TTS requests
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+
+    # Display
+    name = Column(String, nullable=False)
+    language = Column(String, default="en")
+    gender = Column(String, default="unknown")
+    accent = Column(String, default="Custom")
+    is_public = Column(Boolean, default=False)  # listed in /tts/voices for everyone
+
+    # Reference audio (after validation and resampling)
+    reference_key = Column(String, nullable=False)  # storage key
+    content_hash = Column(String, nullable=False, index=True)  # sha256 of the stored reference
+    sample_rate = Column(Integer, nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    latents_ready = Column(Boolean, default=False)  # conditioning latents precomputed
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<VoiceProfile {self.voice_id} ({self.name})>"
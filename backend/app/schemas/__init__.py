@@ -5,6 +5,6 @@ __all__ = [
     "UserBase", "UserCreate", "UserLogin", "UserResponse", "UserWithQuota",
     "Token", "TokenData", "AuthResponse",
     "TTSRequest", "TTSJobResponse", "TTSJobDetail",
-    "Voice", "UsageStats",
+    "Voice", "VoiceProfileResponse", "UsageStats",
     "FeatureFlagUpdate", "QuotaUpdate"
 ]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -82,6 +82,8 @@ class TTSJobDetail(TTSJobResponse):
     character_count: int
     error_message: Optional[str] = None
     completed_at: Optional[datetime] = None
+    timings: Optional[dict] = None  # per-stage seconds, once the job has finished
+    segments: Optional[List[str]] = None  # playable audio segments while a streaming job is processing
 
 
 # ============ Voice Schemas ============
@@ -96,6 +98,22 @@ class Voice(BaseModel):
     labels: Optional[dict] = None
 
 
+class VoiceProfileResponse(BaseModel):
+    voice_id: str
+    name: str
+    language: str
+    gender: str
+    accent: str
+    is_public: bool
+    duration_seconds: float
+    sample_rate: int
+    latents_ready: bool
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
 # ============ Usage Schemas ============
 
 class UsageStats(BaseModel):
@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import List, Optional
+from app.models import TTSJob, User
+from app.config import get_settings
+from app.utils.audio_urls import audio_url_for, key_from_audio_url
+from app.utils.metrics import JOBS, JOBS_COALESCED
+
+settings = get_settings()
+
+# Leader states a new job may attach to
+IN_FLIGHT = ("queued", "processing")
+
+
+def _follower_started_at(leader: TTSJob, follower: TTSJob) -> Optional[datetime]:
+    """
+    When a follower's synthesis effectively started: never before it was
+    created, so its queue wait (started_at - created_at) can't go negative.
+    """
+    started = leader.started_at or follower.created_at
+    if started is None or follower.created_at is None:
+        return started
+    return max(started, follower.created_at)
+
+
+class CoalescingService:
+    """
+    Coalescing of identical in-flight TTS jobs.
+
+    Jobs with the same synthesis key (normalized text, language, voice and
+    settings) produce the same audio. When a job arrives while an identical
+    one is still queued or processing, it is attached to that job (the
+    leader) instead of being dispatched. When the leader's worker finishes,
+    every attached job (follower) gets its own copy of the audio under its
+    own key, so retention and deletion stay per-job; locally the copy is a
+    hard link and on S3 a server-side copy.
+
+    Coalescing is best-effort: two identical jobs submitted at the same
+    instant may both synthesize. A follower whose leader stalls or dies is
+    detached and dispatched on its own when it is next polled
+    (release_follower).
+    """
+
+    @staticmethod
+    def synthesis_key(
+        text: str,
+        language: Optional[str],
+        voice_id: str,
+        voice_age: Optional[str],
+        prosody_preset: Optional[str],
+        speaker_wav_url: Optional[str],
+        settings_dict: Optional[dict]
+    ) -> str:
+        """
+        Hash of everything that determines the generated audio.
+        Text is NFKC-normalized with whitespace collapsed.
+        """
+        from app.adapters.tts.factory import normalize_language
+
+        normalized_text = re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+        payload = json.dumps({
+            "text": normalized_text,
+            "language": normalize_language(language or "en"),
+            "voice_id": voice_id,
+            "voice_age": voice_age or "adult",
+            "prosody_preset": prosody_preset or "neutral",
+            "speaker_wav_url": speaker_wav_url,
+            "settings": settings_dict or {},
+        }, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def find_leader(db: Session, job: TTSJob) -> Optional[TTSJob]:
+        """
+        Oldest in-flight job with the same synthesis key, if any.
+        Followers are never leaders, and stale jobs are ignored.
+        """
+        if not settings.COALESCING_ENABLED or not job.synthesis_key:
+            return None
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.COALESCE_MAX_AGE_SECONDS)
+        return db.query(TTSJob).filter(
+            TTSJob.synthesis_key == job.synthesis_key,
+            TTSJob.status.in_(IN_FLIGHT),
+            TTSJob.coalesced_with.is_(None),
+            TTSJob.id != job.id,
+            TTSJob.created_at >= cutoff
+        ).order_by(TTSJob.created_at.asc()).first()
+
+    @staticmethod
+    def attach(db: Session, job: TTSJob, leader: TTSJob) -> TTSJob:
+        """
+        Make `job` a follower of `leader` (it will not be dispatched).
+        """
+        job.coalesced_with = leader.id
+        job.status = leader.status
+        if leader.started_at is not None:
+            job.started_at = _follower_started_at(leader, job)
+        db.commit()
+        db.refresh(job)
+        JOBS_COALESCED.inc()
+        print(f"[Coalesce] Job {job.id} attached to in-flight job {leader.id}")
+        return job
+
+    @staticmethod
+    def detach(db: Session, job: TTSJob) -> bool:
+        """
+        Turn a follower back into an independent queued job, unless the
+        leader's worker already resolved it. Returns True if detached.
+        """
+        claimed = db.query(TTSJob).filter(
+            TTSJob.id == job.id,
+            TTSJob.status.in_(IN_FLIGHT)
+        ).update({"coalesced_with": None, "status": "queued", "started_at": None}, synchronize_session=False)
+        db.commit()
+        db.refresh(job)
+        return claimed == 1
+
+    @staticmethod
+    async def release_follower(db: Session, job: TTSJob) -> bool:
+        """
+        Settle a follower its leader can no longer resolve: the leader is
+        gone, finished without resolving it (its worker died), or has been
+        in flight longer than COALESCE_MAX_AGE_SECONDS. A completed leader
+        hands over its audio; otherwise the follower is detached.
+
+        Returns:
+            True if the follower was detached and must be dispatched by the caller
+        """
+        if job.coalesced_with is None or job.status not in IN_FLIGHT:
+            return False
+        leader = db.query(TTSJob).filter(TTSJob.id == job.coalesced_with).first()
+        if leader is not None and leader.status == "completed":
+            await CoalescingService.complete_followers(db, leader, [job])
+            db.refresh(job)
+            return False
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.COALESCE_MAX_AGE_SECONDS)
+        if leader is not None and leader.status in IN_FLIGHT and leader.created_at >= cutoff:
+            return False
+        if not CoalescingService.detach(db, job):
+            return False
+        print(f"[Coalesce] Job {job.id} detached from stalled job {leader.id if leader else 'missing'}")
+        return True
+
+    @staticmethod
+    def get_followers(db: Session, leader: TTSJob) -> List[TTSJob]:
+        return db.query(TTSJob).filter(
+            TTSJob.coalesced_with == leader.id,
+            TTSJob.status.in_(IN_FLIGHT)
+        ).all()
+
+    @staticmethod
+    async def complete_followers(db: Session, leader: TTSJob, followers: Optional[List[TTSJob]] = None) -> int:
+        """
+        Give each pending follower a copy of the leader's audio and mark it
+        completed. Safe to race: a follower is claimed with a conditional
+        update before its audio is copied, so only one caller copies,
+        completes and bills it.
+
+        Returns:
+            Number of followers completed
+        """
+        from app.adapters.storage.local import get_storage_adapter
+        from app.services.user_service import UserService
+
+        if followers is None:
+            followers = CoalescingService.get_followers(db, leader)
+        if not followers:
+            return 0
+
+        storage = get_storage_adapter()
+        source_key = key_from_audio_url(leader.audio_url) if leader.audio_url else None
+        completed = 0
+
+        for follower in followers:
+            target_key = None
+            audio_url = leader.audio_url
+            if source_key:
+                target_key = f"audio/{follower.user_id}/{follower.id}{os.path.splitext(source_key)[1]}"
+                audio_url = audio_url_for(target_key)
+
+            # Claim first: a caller that loses the race must not copy (its
+            # copy would be an orphan, or clobber the winner's object)
+            claimed = db.query(TTSJob).filter(
+                TTSJob.id == follower.id,
+                TTSJob.status.in_(IN_FLIGHT)
+            ).update({
+                "status": "completed",
+                "audio_url": audio_url,
+                "duration_seconds": leader.duration_seconds,
+                "started_at": _follower_started_at(leader, follower),
+                "completed_at": datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+            if claimed != 1:
+                continue
+
+            try:
+                if target_key:
+                    await storage.copy_object(source_key, target_key)
+            except Exception as e:
+                print(f"[Coalesce] Could not copy audio for follower {follower.id}: {e}")
+                # Claimed above, so nobody else will settle it
+                db.query(TTSJob).filter(TTSJob.id == follower.id).update({
+                    "status": "failed",
+                    "audio_url": None,
+                    "error_message": f"Could not copy coalesced audio: {e}"
+                }, synchronize_session=False)
+                db.commit()
+                JOBS.labels(status="failed").inc()
+                continue
+
+            user = db.query(User).filter(User.id == follower.user_id).first()
+            if user and follower.character_count:
+                UserService.deduct_quota(db, user, follower.character_count)
+            JOBS.labels(status="completed").inc()
+            completed += 1
+
+        if completed:
+            print(f"[Coalesce] Job {leader.id} completed {completed} coalesced job(s)")
+        return completed
+
+    @staticmethod
+    def fail_followers(db: Session, leader: TTSJob, error_message: Optional[str] = None, followers: Optional[List[TTSJob]] = None) -> int:
+        """
+        Fail every pending follower along with its leader. Followers of a
+        failed job are not billed.
+        """
+        if followers is None:
+            followers = CoalescingService.get_followers(db, leader)
+
+        failed = 0
+        for follower in followers:
+            claimed = db.query(TTSJob).filter(
+                TTSJob.id == follower.id,
+                TTSJob.status.in_(IN_FLIGHT)
+            ).update({
+                "status": "failed",
+                "error_message": error_message or leader.error_message or "Coalesced job failed",
+                "completed_at": datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+            if claimed == 1:
+                JOBS.labels(status="failed").inc()
+                failed += 1
+        return failed
+
+    @staticmethod
+    async def resolve_followers(db: Session, leader: TTSJob) -> int:
+        """
+        Complete or fail a finished leader's followers. Never raises, so it
+        can't affect the leader's own outcome.
+        """
+        if not leader.synthesis_key:
+            return 0
+        try:
+            if leader.status == "completed":
+                return await CoalescingService.complete_followers(db, leader)
+            if leader.status == "failed":
+                return CoalescingService.fail_followers(db, leader)
+        except Exception as e:
+            db.rollback()
+            print(f"[Coalesce] Error resolving followers of {leader.id}: {e}")
+        return 0
@@ -0,0 +1,231 @@
+import asyncio
+import threading
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from app.models import TTSJob, User, get_db
+from app.config import get_settings, PRICING_TIERS
+from app.utils.audio_urls import key_from_audio_url
+
+settings = get_settings()
+
+
+class RetentionService:
+    """
+    Audio retention and storage tiering.
+
+    Responsibilities:
+    - Delete generated audio older than the owner's plan TTL
+      (PRICING_TIERS[plan]["audio_retention_days"]) and clear TTSJob.audio_url,
+      together with the job's profiling trace and any leftover stream segments
+    - Re-encode old WAV files to Opus to shrink the storage footprint
+    - Report how many bytes each pass reclaimed
+    """
+
+    # Jobs whose WAV failed to transcode (corrupt audio, missing object);
+    # skipped by later sweeps in this process instead of retried forever
+    _transcode_failed = set()
+
+    @staticmethod
+    def _job_age():
+        # Sync-path jobs may not record completed_at
+        return func.coalesce(TTSJob.completed_at, TTSJob.created_at)
+
+    @staticmethod
+    async def expire_audio(db: Session, dry_run: bool = False, batch_size: Optional[int] = None) -> Dict:
+        """
+        Delete audio past its plan's retention window.
+
+        Returns:
+            {"deleted": n, "bytes_reclaimed": n, "per_plan": {plan: {...}}}
+        """
+        from app.adapters.storage.local import get_storage_adapter
+        storage = get_storage_adapter()
+        batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+        now = datetime.utcnow()
+
+        report = {"deleted": 0, "bytes_reclaimed": 0, "per_plan": {}}
+
+        for plan, tier in PRICING_TIERS.items():
+            retention_days = tier.get("audio_retention_days", -1)
+            if retention_days < 0:
+                continue
+            cutoff = now - timedelta(days=retention_days)
+            plan_report = {"deleted": 0, "bytes_reclaimed": 0}
+            last_id = None
+
+            while True:
+                query = db.query(TTSJob).join(User, User.id == TTSJob.user_id).filter(
+                    User.plan == plan,
+                    TTSJob.audio_url.isnot(None),
+                    RetentionService._job_age() < cutoff
+                )
+                if last_id is not None:
+                    # Page by id: dry runs and failed deletes leave rows matching
+                    query = query.filter(TTSJob.id > last_id)
+                jobs = query.order_by(TTSJob.id).limit(batch_size).all()
+                if not jobs:
+                    break
+
+                for job in jobs:
+                    keys = [key_from_audio_url(job.audio_url), job.profile_key]
+                    keys += [key_from_audio_url(url) for url in job.stream_segments or []]
+                    keys = [key for key in keys if key]
+                    size = 0
+                    for key in keys:
+                        size += await storage.get_size(key) or 0
+                    if not dry_run:
+                        try:
+                            for key in keys:
+                                await storage.delete_file(key)
+                        except Exception as e:
+                            print(f"[RETENTION] Failed to delete {key}: {e}")
+                            continue
+                        job.audio_url = None
+                        job.profile_key = None
+                        job.stream_segments = None
+                    # Only counted once every delete succeeded
+                    plan_report["deleted"] += 1
+                    plan_report["bytes_reclaimed"] += size
+
+                last_id = jobs[-1].id
+                if not dry_run:
+                    db.commit()
+
+            report["per_plan"][plan] = plan_report
+            report["deleted"] += plan_report["deleted"]
+            report["bytes_reclaimed"] += plan_report["bytes_reclaimed"]
+
+        return report
+
+    @staticmethod
+    async def transcode_old_audio(db: Session, dry_run: bool = False, batch_size: Optional[int] = None) -> Dict:
+        """
+        Re-encode WAVs older than RETENTION_TRANSCODE_AFTER_DAYS to Opus.
+
+        Requires FFmpeg (via pydub). Jobs that fail to transcode keep their
+        WAV and are skipped by later sweeps.
+
+        Returns:
+            {"transcoded": n, "bytes_reclaimed": n, "failed": n}
+        """
+        report = {"transcoded": 0, "bytes_reclaimed": 0, "failed": 0}
+        if settings.RETENTION_TRANSCODE_AFTER_DAYS <= 0:
+            return report
+
+        from app.adapters.storage.local import get_storage_adapter
+        from app.utils.scratch import job_scratch
+        storage = get_storage_adapter()
+        batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+        cutoff = datetime.utcnow() - timedelta(days=settings.RETENTION_TRANSCODE_AFTER_DAYS)
+
+        last_id = None
+
+        while True:
+            query = db.query(TTSJob).filter(
+                TTSJob.audio_url.like("%.wav%"),
+                RetentionService._job_age() < cutoff
+            )
+            if last_id is not None:
+                # Page by id: dry runs and failed transcodes leave rows matching
+                query = query.filter(TTSJob.id > last_id)
+            jobs = query.order_by(TTSJob.id).limit(batch_size).all()
+            if not jobs:
+                break
+            last_id = jobs[-1].id
+
+            for job in jobs:
+                if job.id in RetentionService._transcode_failed:
+                    continue
+                key = key_from_audio_url(job.audio_url)
+                if key is None or not key.endswith(".wav"):
+                    continue
+                old_size = await storage.get_size(key) or 0
+                if dry_run:
+                    # Speech at 32 kbps Opus is typically ~1/10 of 16-bit PCM
+                    report["transcoded"] += 1
+                    report["bytes_reclaimed"] += int(old_size * 0.9)
+                    continue
+
+                with job_scratch(f"transcode-{job.id}") as scratch:
+                    try:
+                        from pydub import AudioSegment
+                        wav_path = scratch.new_file(".wav")
+                        opus_path = scratch.new_file(".ogg")
+                        await storage.download_file(key, str(wav_path))
+                        audio = await asyncio.to_thread(AudioSegment.from_wav, str(wav_path))
+                        await asyncio.to_thread(
+                            audio.export, str(opus_path),
+                            format="ogg", codec="libopus", bitrate=settings.RETENTION_OPUS_BITRATE
+                        )
+                        new_size = opus_path.stat().st_size
+                        new_key = key[:-len(".wav")] + ".ogg"
+                        job.audio_url = await storage.upload_file(str(opus_path), new_key, move=True)
+                        db.commit()
+                        await storage.delete_file(key)
+                    except Exception as e:
+                        db.rollback()
+                        RetentionService._transcode_failed.add(job.id)
+                        report["failed"] += 1
+                        print(f"[RETENTION] Transcode failed for job {job.id} (skipped from now on): {e}")
+                        continue
+
+                report["transcoded"] += 1
+                report["bytes_reclaimed"] += max(0, old_size - new_size)
+
+        return report
+
+    @staticmethod
+    async def sweep(db: Session, dry_run: bool = False) -> Dict:
+        """
+        Run a full retention pass (expire, then transcode).
+        """
+        expired = await RetentionService.expire_audio(db, dry_run=dry_run)
+        transcoded = await RetentionService.transcode_old_audio(db, dry_run=dry_run)
+        report = {
+            "dry_run": dry_run,
+            "expired": expired,
+            "transcoded": transcoded,
+            "bytes_reclaimed": expired["bytes_reclaimed"] + transcoded["bytes_reclaimed"]
+        }
+        print(f"[RETENTION] Sweep {'(dry run) ' if dry_run else ''}done: "
+              f"{expired['deleted']} deleted, {transcoded['transcoded']} transcoded, "
+              f"{report['bytes_reclaimed'] / 1024 / 1024:.1f} MB reclaimed")
+        return report
+
+
+class RetentionSweeper:
+    """Background thread running RetentionService.sweep on an interval."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last_report: Optional[Dict] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            db = next(get_db())
+            try:
+                self.last_report = asyncio.run(RetentionService.sweep(db))
+            except Exception as e:
+                print(f"[RETENTION] Sweep failed: {e}")
+            finally:
+                db.close()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="retention-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+retention_sweeper = RetentionSweeper(interval=settings.RETENTION_SWEEP_INTERVAL)
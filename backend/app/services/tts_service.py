@@ -2,9 +2,12 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
-from app.models import TTSJob, User, UsageLog
+from app.models import TTSJob, User
 from app.schemas import TTSRequest
 from app.config import get_settings, PRICING_TIERS
+from app.services.usage_service import UsageService
+from app.services.coalescing_service import CoalescingService
+from app.services.voice_profile_service import VoiceProfileService, is_profile_voice
 
 settings = get_settings()
 
@@ -56,6 +59,13 @@ class TTSService:
         if request.speaker_wav_url and not tier["voice_cloning"]:
             return False, f"Voice cloning not available on {user.plan} plan"
         
+        # Saved voice profiles are clones too
+        if is_profile_voice(request.voice_id):
+            if not settings.ENABLE_VOICE_CLONING:
+                return False, "Voice cloning is currently disabled"
+            if not tier["voice_cloning"]:
+                return False, f"Voice cloning not available on {user.plan} plan"
+        
         return True, None
     
     @staticmethod
@@ -66,6 +76,10 @@ class TTSService:
         This does NOT generate audio - it creates a job record
         and pushes it to the queue for async processing.
         """
+        # A profile voice must exist and be the user's own (or public)
+        if is_profile_voice(request.voice_id) and not VoiceProfileService.get_profile(db, request.voice_id, user.id):
+            raise ValueError(f"Voice profile {request.voice_id} not found")
+        
         # Validate request
         is_valid, error = TTSService.validate_request(user, request)
         if not is_valid:
@@ -98,21 +112,24 @@ class TTSService:
             character_count=cost, # Store the weighted cost for deduction
             settings=request.settings,
             status="queued",
-            priority=priority
+            priority=priority,
+            synthesis_key=CoalescingService.synthesis_key(
+                request.text,
+                request.language,
+                request.voice_id,
+                request.voice_age,
+                request.prosody_preset,
+                request.speaker_wav_url,
+                request.settings
+            )
         )
         
         db.add(job)
         db.commit()
         db.refresh(job)
         
-        # Log usage
-        usage_log = UsageLog(
-            user_id=user.id,
-            job_id=job.id,
-            characters_used=cost
-        )
-        db.add(usage_log)
-        db.commit()
+        # Log usage (also bumps the pre-aggregated usage counters)
+        UsageService.record_usage(db, user.id, cost, job_id=job.id)
         
         return job
     
@@ -146,7 +163,8 @@ class TTSService:
         job_id: UUID,
         status: str,
         audio_url: Optional[str] = None,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        timings: Optional[dict] = None
     ):
         """
         Update job status (called by worker).
@@ -168,6 +186,9 @@ class TTSService:
         if error_message:
             job.error_message = error_message
         
+        if timings:
+            job.timings = timings
+        
         db.commit()
         db.refresh(job)
         
@@ -1,44 +1,170 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import update, func
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Optional
 from uuid import UUID
-from app.models import UsageLog, User
+from app.models import UsageLog, UsageCounter, User
+from app.config import get_settings
+
+settings = get_settings()
+
+
+# Counter buckets maintained for every usage log row
+COUNTER_PERIODS = ("hour", "day", "month")
+
+
+def _period_start(period: str, ts: datetime) -> datetime:
+    """Truncate a timestamp to the start of its counter bucket."""
+    if period == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    if period == "day":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "month":
+        return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown counter period: {period}")
+
+
+def _period_end(period: str, start: datetime) -> datetime:
+    """Start of the bucket after the one beginning at `start`."""
+    if period == "hour":
+        return start + timedelta(hours=1)
+    if period == "day":
+        return start + timedelta(days=1)
+    if period == "month":
+        return (start + timedelta(days=32)).replace(day=1)
+    raise ValueError(f"Unknown counter period: {period}")
+
+
+def _hourly_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Hourly buckets starting before this are no longer read by rate limiting."""
+    now = now or datetime.utcnow()
+    return _period_start("hour", now - timedelta(hours=settings.USAGE_HOURLY_RETENTION_HOURS))
 
 
 class UsageService:
     """
     Usage service for tracking and analytics.
-    
+
     Responsibilities:
     - Track character usage
     - Generate usage statistics
     - Enforce rate limits
     """
-    
+
+    @staticmethod
+    def record_usage(
+        db: Session,
+        user_id: UUID,
+        characters: int,
+        job_id: Optional[UUID] = None,
+        timestamp: Optional[datetime] = None
+    ) -> UsageLog:
+        """
+        Write a usage log row and bump the matching counters.
+
+        The log and counter updates share the caller's transaction,
+        so they are committed (or rolled back) together.
+        """
+        timestamp = timestamp or datetime.utcnow()
+
+        usage_log = UsageLog(
+            user_id=user_id,
+            job_id=job_id,
+            characters_used=characters,
+            timestamp=timestamp
+        )
+        db.add(usage_log)
+
+        for period in COUNTER_PERIODS:
+            created = UsageService._bump_counter(db, user_id, period, _period_start(period, timestamp), characters)
+            if created and period == "hour":
+                # Once per user per hour: drop their hourly buckets rate limiting no longer reads
+                UsageService._prune_hourly(db, _hourly_cutoff(timestamp), user_id)
+
+        db.commit()
+        return usage_log
+
     @staticmethod
-    def get_usage_stats(db: Session, user_id: UUID) -> Dict:
+    def _bump_counter(db: Session, user_id: UUID, period: str, period_start: datetime, characters: int) -> bool:
+        """
+        Atomically increment a counter bucket, creating it on first use.
+
+        Returns:
+            True if this call created the bucket
+        """
+        values = {
+            "characters_used": UsageCounter.characters_used + characters,
+            "request_count": UsageCounter.request_count + 1,
+            "updated_at": datetime.utcnow()
+        }
+        bucket = (
+            UsageCounter.user_id == user_id,
+            UsageCounter.period == period,
+            UsageCounter.period_start == period_start
+        )
+
+        result = db.execute(update(UsageCounter).where(*bucket).values(**values))
+        if result.rowcount:
+            return False
+
+        # First write into this bucket. Another request may race us to the
+        # insert, in which case the unique constraint fires and we update.
+        try:
+            with db.begin_nested():
+                db.add(UsageCounter(
+                    user_id=user_id,
+                    period=period,
+                    period_start=period_start,
+                    characters_used=characters,
+                    request_count=1
+                ))
+            return True
+        except IntegrityError:
+            db.execute(update(UsageCounter).where(*bucket).values(**values))
+            return False
+
+    @staticmethod
+    def _prune_hourly(db: Session, before: datetime, user_id: Optional[UUID] = None) -> int:
+        """Delete hourly buckets that start before `before`."""
+        query = db.query(UsageCounter).filter(
+            UsageCounter.period == "hour",
+            UsageCounter.period_start < before
+        )
+        if user_id is not None:
+            query = query.filter(UsageCounter.user_id == user_id)
+        return query.delete(synchronize_session=False)
+
+    @staticmethod
+    def _get_counter(db: Session, user_id: UUID, period: str, period_start: datetime) -> Optional[UsageCounter]:
+        return db.query(UsageCounter).filter(
+            UsageCounter.user_id == user_id,
+            UsageCounter.period == period,
+            UsageCounter.period_start == period_start
+        ).first()
+
+    @staticmethod
+    def get_usage_stats(db: Session, user_id: UUID, user=None) -> Dict:
         """
         Get usage statistics for a user.
+
+        Pass `user` (a User row or cached UserPrincipal) to skip the user lookup.
         """
-        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            user = db.query(User).filter(User.id == user_id).first()
         if not user:
             raise ValueError("User not found")
-        
+
+        now = datetime.utcnow()
+
         # Get today's usage
-        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        chars_today = db.query(func.sum(UsageLog.characters_used)).filter(
-            UsageLog.user_id == user_id,
-            UsageLog.timestamp >= today_start
-        ).scalar() or 0
-        
+        today = UsageService._get_counter(db, user_id, "day", _period_start("day", now))
+        chars_today = today.characters_used if today else 0
+
         # Get this month's usage
-        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        chars_month = db.query(func.sum(UsageLog.characters_used)).filter(
-            UsageLog.user_id == user_id,
-            UsageLog.timestamp >= month_start
-        ).scalar() or 0
-        
+        month = UsageService._get_counter(db, user_id, "month", _period_start("month", now))
+        chars_month = month.characters_used if month else 0
+
         return {
             "characters_used_today": chars_today,
             "characters_used_month": chars_month,
@@ -46,25 +172,165 @@ class UsageService:
             "credits_total": user.credits_total,
             "quota_reset_date": user.quota_reset_date
         }
-    
+
     @staticmethod
     def check_rate_limit(db: Session, user_id: UUID, window_minutes: int = 60, max_requests: int = 100) -> bool:
         """
         Check if user has exceeded rate limit.
-        
+
+        Uses the hourly counters as a sliding-window approximation: full
+        buckets inside the window count fully, the oldest partially covered
+        bucket is weighted by how much of it still falls inside the window.
+
         Args:
             user_id: User ID
             window_minutes: Time window in minutes
             max_requests: Maximum requests in window
-        
+
         Returns:
             True if within limit, False if exceeded
         """
-        window_start = datetime.utcnow() - timedelta(minutes=window_minutes)
-        
-        request_count = db.query(UsageLog).filter(
-            UsageLog.user_id == user_id,
-            UsageLog.timestamp >= window_start
-        ).count()
-        
+        now = datetime.utcnow()
+        window_start = now - timedelta(minutes=window_minutes)
+        oldest_bucket = _period_start("hour", window_start)
+
+        buckets = db.query(UsageCounter).filter(
+            UsageCounter.user_id == user_id,
+            UsageCounter.period == "hour",
+            UsageCounter.period_start >= oldest_bucket
+        ).all()
+
+        request_count = 0.0
+        for bucket in buckets:
+            if bucket.period_start == oldest_bucket and bucket.period_start < window_start:
+                covered = (bucket.period_start + timedelta(hours=1) - window_start).total_seconds()
+                request_count += bucket.request_count * max(0.0, covered) / 3600
+            else:
+                request_count += bucket.request_count
+
         return request_count < max_requests
+
+    @staticmethod
+    def reconcile_counters(db: Session, user_id: Optional[UUID] = None, since: Optional[datetime] = None) -> int:
+        """
+        Rebuild counters from the usage log.
+
+        Recomputes every bucket touched by log rows at or after `since`
+        (default: start of the current month), plus any stored bucket in
+        that range, and overwrites the stored values. Hourly buckets are
+        rebuilt for the last USAGE_HOURLY_RETENTION_HOURS; older ones are
+        pruned. Use to backfill counters (see backfill_counters), after
+        manual log edits, or if counters are suspected to have drifted.
+
+        Safe to run while usage is being recorded: each bucket is locked
+        and re-counted in its own short transaction, so concurrent
+        _bump_counter writes are either included in the count or applied
+        on top of it, never overwritten.
+
+        Returns:
+            Number of counter buckets reconciled
+        """
+        now = datetime.utcnow()
+        since = _period_start("month", since or now)
+        # The rate-limit window can reach back past `since` (early in a month)
+        hourly_since = _hourly_cutoff(now)
+        scan_from = min(since, hourly_since)
+
+        def wanted(period: str, period_start: datetime) -> bool:
+            return period_start >= (hourly_since if period == "hour" else since)
+
+        logs = db.query(UsageLog.user_id, UsageLog.timestamp).filter(UsageLog.timestamp >= scan_from)
+        stored = db.query(UsageCounter.user_id, UsageCounter.period, UsageCounter.period_start).filter(
+            UsageCounter.period_start >= scan_from
+        )
+        if user_id is not None:
+            logs = logs.filter(UsageLog.user_id == user_id)
+            stored = stored.filter(UsageCounter.user_id == user_id)
+
+        buckets = set()
+        for uid, timestamp in logs.yield_per(1000):
+            for period in COUNTER_PERIODS:
+                period_start = _period_start(period, timestamp)
+                if wanted(period, period_start):
+                    buckets.add((uid, period, period_start))
+        # Stored buckets with no log rows behind them are reset to zero
+        buckets.update(tuple(row) for row in stored if wanted(row[1], row[2]))
+        db.commit()
+
+        for uid, period, period_start in sorted(buckets, key=lambda b: (str(b[0]), b[1], b[2])):
+            UsageService._reconcile_bucket(db, uid, period, period_start)
+            db.commit()
+
+        pruned = UsageService._prune_hourly(db, _hourly_cutoff(now), user_id)
+        db.commit()
+        print(f"[USAGE] Reconciled {len(buckets)} counter buckets, pruned {pruned} hourly buckets")
+        return len(buckets)
+
+    @staticmethod
+    def _reconcile_bucket(db: Session, user_id: UUID, period: str, period_start: datetime):
+        """
+        Overwrite one bucket with its totals from the log.
+
+        The bucket row is locked before counting: a concurrent record_usage
+        either committed before the lock (its log row is counted) or blocks
+        on the lock and adds its increment after we commit.
+        """
+        bucket = (
+            UsageCounter.user_id == user_id,
+            UsageCounter.period == period,
+            UsageCounter.period_start == period_start
+        )
+        counter = db.query(UsageCounter).filter(*bucket).with_for_update().first()
+
+        if counter is None:
+            characters, requests = UsageService._log_totals(db, user_id, period, period_start)
+            if not requests:
+                return
+            try:
+                with db.begin_nested():
+                    db.add(UsageCounter(
+                        user_id=user_id,
+                        period=period,
+                        period_start=period_start,
+                        characters_used=characters,
+                        request_count=requests
+                    ))
+                return
+            except IntegrityError:
+                # A concurrent first write created it; lock that row and count again
+                counter = db.query(UsageCounter).filter(*bucket).with_for_update().first()
+
+        characters, requests = UsageService._log_totals(db, user_id, period, period_start)
+        counter.characters_used = characters
+        counter.request_count = requests
+        counter.updated_at = datetime.utcnow()
+
+    @staticmethod
+    def _log_totals(db: Session, user_id: UUID, period: str, period_start: datetime) -> tuple:
+        """(characters, requests) logged for a user inside one bucket."""
+        characters, requests = db.query(
+            func.coalesce(func.sum(UsageLog.characters_used), 0),
+            func.count(UsageLog.id)
+        ).filter(
+            UsageLog.user_id == user_id,
+            UsageLog.timestamp >= period_start,
+            UsageLog.timestamp < _period_end(period, period_start)
+        ).one()
+        return int(characters), int(requests)
+
+    @staticmethod
+    def backfill_counters(db: Session) -> int:
+        """
+        Build counters from the log if none exist yet (first deploy with
+        counters), so existing users' stats and rate limits don't read zero.
+        No-op once any counter row exists.
+
+        Returns:
+            Number of counter buckets written
+        """
+        if db.query(UsageCounter.id).first() is not None:
+            return 0
+        if db.query(UsageLog.id).first() is None:
+            return 0
+        print("[USAGE] No usage counters yet; backfilling from the usage log")
+        return UsageService.reconcile_counters(db)
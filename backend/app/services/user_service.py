@@ -3,7 +3,7 @@ from typing import Optional
 from datetime import datetime, timedelta
 from app.models import User
 from app.schemas import UserCreate
-from app.auth import verify_password, get_password_hash, create_access_token
+from app.auth import verify_password, get_password_hash, create_access_token, invalidate_user, verify_password_async
 from app.config import PRICING_TIERS
 
 
@@ -18,9 +18,12 @@ class UserService:
     """
     
     @staticmethod
-    def create_user(db: Session, user_data: UserCreate) -> User:
+    def create_user(db: Session, user_data: UserCreate, password_hash: Optional[str] = None) -> User:
         """
         Create a new user with default free plan.
+        
+        Pass a precomputed `password_hash` (see hash_password_async) to keep
+        bcrypt off the calling thread.
         """
         # Check if user already exists
         existing_user = db.query(User).filter(User.email == user_data.email).first()
@@ -31,7 +34,7 @@ class UserService:
         user = User(
             email=user_data.email,
             name=user_data.name,
-            password_hash=get_password_hash(user_data.password),
+            password_hash=password_hash or get_password_hash(user_data.password),
             plan="free",
             role="user",
             credits_remaining=PRICING_TIERS["free"]["quota"],
@@ -63,12 +66,31 @@ class UserService:
         
         return user
     
+    @staticmethod
+    async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[User]:
+        """
+        Same as authenticate_user, but verifies the password on the bcrypt
+        pool so the event loop is not blocked.
+        """
+        user = db.query(User).filter(User.email == email).first()
+        
+        if not user:
+            return None
+        
+        if not await verify_password_async(password, user.password_hash):
+            return None
+        
+        return user
+    
     @staticmethod
     def create_token_for_user(user: User) -> str:
         """
         Create JWT token for user.
+        
+        The plan claim lets the rate limiter pick per-plan limits
+        without a database lookup.
         """
-        return create_access_token(data={"user_id": str(user.id)})
+        return create_access_token(data={"user_id": str(user.id), "plan": user.plan})
     
     @staticmethod
     def check_and_reset_quota(db: Session, user: User) -> User:
@@ -79,6 +101,7 @@ class UserService:
             user.reset_quota()
             db.commit()
             db.refresh(user)
+            invalidate_user(user.id)
         
         return user
     
@@ -104,6 +127,7 @@ class UserService:
         user.deduct_quota(characters)
         db.commit()
         db.refresh(user)
+        invalidate_user(user.id)
     
     @staticmethod
     def upgrade_plan(db: Session, user: User, new_plan: str):
@@ -117,5 +141,6 @@ class UserService:
         user.reset_quota()
         db.commit()
         db.refresh(user)
+        invalidate_user(user.id)
         
         return user
@@ -0,0 +1,331 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from app.config import get_settings
+from app.utils.audio_urls import audio_url_for
+from app.services.voice_profile_service import is_profile_voice
+
+settings = get_settings()
+
+# Storage key prefix for rendered previews (served by the public audio route)
+PREVIEW_PREFIX = "previews"
+
+# Public voice profiles can be added at any time; other processes pick them up within this
+VOICE_LIST_TTL_SECONDS = 300
+
+# Previews are rendered by Celery workers; the API looks for new ones at most this often
+PREVIEW_RECHECK_SECONDS = 60
+
+# Bump to re-render every preview (e.g. after an engine upgrade)
+PREVIEW_VERSION = 1
+
+PREVIEW_TEXTS = {
+    "en": "Hello! This is a short preview of my voice.",
+    "hi": "नमस्ते! यह मेरी आवाज़ का एक छोटा सा नमूना है।",
+    "bn": "নমস্কার! এটি আমার কণ্ঠের একটি ছোট নমুনা।",
+    "ta": "வணக்கம்! இது என் குரலின் ஒரு சிறிய மாதிரி.",
+    "te": "నమస్కారం! ఇది నా గొంతు యొక్క చిన్న నమూనా.",
+    "mr": "नमस्कार! हा माझ्या आवाजाचा एक छोटासा नमुना आहे.",
+    "gu": "નમસ્તે! આ મારા અવાજનો એક નાનો નમૂનો છે.",
+    "kn": "ನಮಸ್ಕಾರ! ಇದು ನನ್ನ ಧ್ವನಿಯ ಒಂದು ಸಣ್ಣ ಮಾದರಿ.",
+    "ml": "നമസ്കാരം! ഇത് എന്റെ ശബ്ദത്തിന്റെ ഒരു ചെറിയ മാതൃകയാണ്.",
+    "pa": "ਸਤ ਸ੍ਰੀ ਅਕਾਲ! ਇਹ ਮੇਰੀ ਆਵਾਜ਼ ਦਾ ਇੱਕ ਛੋਟਾ ਜਿਹਾ ਨਮੂਨਾ ਹੈ।",
+    "or": "ନମସ୍କାର! ଏହା ମୋ ସ୍ୱରର ଏକ ଛୋଟ ନମୁନା।",
+    "as": "নমস্কাৰ! এইটো মোৰ মাতৰ এটা সৰু নমুনা।",
+    "ur": "السلام علیکم! یہ میری آواز کا ایک چھوٹا سا نمونہ ہے۔",
+    "ne": "नमस्ते! यो मेरो आवाजको एउटा सानो नमुना हो।",
+    "sa": "नमस्ते! एषः मम स्वरस्य लघु निदर्शनम् अस्ति।",
+}
+
+# Languages without their own sample borrow one written in the same script
+PREVIEW_TEXT_FALLBACKS = {
+    "ks": "ur",
+    "sd": "ur",
+    "bo": "hi",
+    "doi": "hi",
+    "kok": "hi",
+    "mai": "hi",
+    "sat": "hi",
+    "mni": "bn",
+}
+
+
+def preview_text(language: Optional[str]) -> str:
+    language = language or "en"
+    return PREVIEW_TEXTS.get(language) or PREVIEW_TEXTS.get(PREVIEW_TEXT_FALLBACKS.get(language, "en"), PREVIEW_TEXTS["en"])
+
+
+def preview_key(voice: Dict) -> str:
+    """
+    Storage key for a voice's preview. Includes a digest of everything
+    that shapes the audio, so changing the sample text re-renders it.
+    """
+    language = voice.get("language") or "en"
+    payload = f"{PREVIEW_VERSION}:{voice['voice_id']}:{language}:{preview_text(language)}"
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+    return f"{PREVIEW_PREFIX}/{voice['voice_id']}-{digest}.wav"
+
+
+def _adapter_for_voice(voice_id: str):
+    """The engine that owns a voice, by voice_id prefix."""
+    if voice_id.startswith("kokoro_"):
+        from app.adapters.tts.kokoro import get_kokoro_adapter
+        return get_kokoro_adapter()
+    if voice_id.startswith("indic_"):
+        from app.adapters.tts.indicparler import get_indicparler_adapter
+        return get_indicparler_adapter()
+    if is_profile_voice(voice_id):
+        from app.adapters.tts.xtts_v2 import get_xtts_adapter
+        return get_xtts_adapter()
+    return None
+
+
+class VoicePreviewService:
+    """
+    Pre-rendered voice previews and the cached /tts/voices response.
+
+    Each voice gets one short sample in its language, rendered by its own
+    engine and stored under PREVIEW_PREFIX. Keys are deterministic, so a
+    preview is rendered once per deployment (not once per process) and
+    found again by a cheap existence check, which the API repeats every
+    PREVIEW_RECHECK_SECONDS while some voices still lack a sample (they
+    show `preview_url: None` until then).
+
+    Rendering loads every engine, so it never runs in the API process in
+    production: it is queued as a Celery task (render_voice_previews) from
+    /admin/voices/previews/render, or automatically at startup or on the
+    first /voices request per VOICE_PREVIEW_RENDER. Only in development
+    without Celery does the API render in a background thread.
+
+    XTTS voices are public voice profiles, rendered from their stored
+    reference recording.
+    """
+
+    _lock = threading.Lock()
+    # voice_id -> storage key of its rendered preview
+    _rendered: Dict[str, str] = {}
+    _checked_at = 0.0
+    _voices: Optional[List[Dict]] = None
+    _voices_expire_at = 0.0
+    # (body, etag, expires_at) of the last /voices response
+    _response: Optional[Tuple[bytes, str, float]] = None
+
+    @staticmethod
+    def get_voices() -> List[Dict]:
+        """All voices from every engine, rebuilt every VOICE_LIST_TTL_SECONDS."""
+        if VoicePreviewService._voices is None or VoicePreviewService._voices_expire_at < time.time():
+            from app.adapters.tts.factory import get_all_available_voices
+            voices = get_all_available_voices()
+            with VoicePreviewService._lock:
+                if voices != VoicePreviewService._voices:
+                    VoicePreviewService._response = None
+                    VoicePreviewService._checked_at = 0.0
+                    preview_renderer.request_rerun()
+                VoicePreviewService._voices = voices
+                VoicePreviewService._voices_expire_at = time.time() + VOICE_LIST_TTL_SECONDS
+        return VoicePreviewService._voices
+
+    @staticmethod
+    def invalidate_voices():
+        """Rebuild the voice list on next use (e.g. after a public profile changes)."""
+        with VoicePreviewService._lock:
+            VoicePreviewService._voices = None
+            VoicePreviewService._response = None
+
+    @staticmethod
+    def _mark_rendered(voice_id: str, key: str):
+        with VoicePreviewService._lock:
+            VoicePreviewService._rendered[voice_id] = key
+            VoicePreviewService._response = None
+
+    @staticmethod
+    async def find_existing(voices: Optional[List[Dict]] = None) -> int:
+        """
+        Record previews already in storage (rendered by an earlier run or
+        another process). Returns how many were found.
+        """
+        from app.adapters.storage.local import get_storage_adapter
+        storage = get_storage_adapter()
+        voices = voices if voices is not None else VoicePreviewService.get_voices()
+        pending = [v for v in voices if v["voice_id"] not in VoicePreviewService._rendered]
+
+        sizes = await asyncio.gather(*(storage.get_size(preview_key(v)) for v in pending), return_exceptions=True)
+        found = 0
+        for voice, size in zip(pending, sizes):
+            if isinstance(size, int) and size > 0:
+                VoicePreviewService._mark_rendered(voice["voice_id"], preview_key(voice))
+                found += 1
+        VoicePreviewService._checked_at = time.time()
+        return found
+
+    @staticmethod
+    async def render(voice: Dict, force: bool = False) -> Optional[str]:
+        """
+        Render and store one voice's preview. Returns its key, or None if
+        the voice can't be rendered.
+        """
+        from app.adapters.storage.local import get_storage_adapter
+        from app.utils.scratch import job_scratch
+
+        voice_id = voice["voice_id"]
+        key = preview_key(voice)
+        if not force and VoicePreviewService._rendered.get(voice_id) == key:
+            return key
+        adapter = _adapter_for_voice(voice_id)
+        if adapter is None:
+            return None
+
+        storage = get_storage_adapter()
+        language = voice.get("language") or "en"
+        speaker_wav = await VoicePreviewService._profile_reference(voice_id) if is_profile_voice(voice_id) else None
+        with job_scratch(f"preview-{voice_id}"):
+            wav_path = await adapter.generate(
+                text=preview_text(language),
+                voice_id=voice_id,
+                language=language,
+                speaker_wav_path=speaker_wav
+            )
+            await storage.upload_file(wav_path, key, move=True)
+
+        VoicePreviewService._mark_rendered(voice_id, key)
+        print(f"[Previews] Rendered {voice_id} ({language})")
+        return key
+
+    @staticmethod
+    async def _profile_reference(voice_id: str) -> str:
+        from app.models import get_db
+        from app.services.voice_profile_service import VoiceProfileService
+        
+        db = next(get_db())
+        try:
+            profile = VoiceProfileService.get_profile(db, voice_id)
+            if profile is None:
+                raise ValueError(f"Voice profile {voice_id} not found")
+            return await VoiceProfileService.reference_path(profile)
+        finally:
+            db.close()
+
+    @staticmethod
+    async def render_all(force: bool = False) -> Dict:
+        """
+        Render every missing preview, one at a time (each engine runs one
+        inference at a time anyway).
+        """
+        voices = VoicePreviewService.get_voices()
+        if not force:
+            await VoicePreviewService.find_existing(voices)
+
+        report = {"rendered": 0, "existing": 0, "skipped": 0, "failed": 0}
+        for voice in voices:
+            if not force and voice["voice_id"] in VoicePreviewService._rendered:
+                report["existing"] += 1
+                continue
+            try:
+                key = await VoicePreviewService.render(voice, force=force)
+                report["rendered" if key else "skipped"] += 1
+            except Exception as e:
+                print(f"[Previews] Failed to render {voice['voice_id']}: {e}")
+                report["failed"] += 1
+
+        print(f"[Previews] {report['rendered']} rendered, {report['existing']} existing, "
+              f"{report['skipped']} skipped, {report['failed']} failed")
+        return report
+
+    @staticmethod
+    def with_preview_urls(voices: List[Dict]) -> List[Dict]:
+        rendered = VoicePreviewService._rendered
+        return [
+            dict(voice, preview_url=audio_url_for(rendered[voice["voice_id"]]))
+            if voice["voice_id"] in rendered else voice
+            for voice in voices
+        ]
+
+    @staticmethod
+    async def voices_response() -> Tuple[bytes, str]:
+        """
+        JSON body and ETag for /tts/voices, rebuilt only when a preview
+        appears (or, with signed audio URLs, before the URLs expire).
+        """
+        voices = VoicePreviewService.get_voices()
+        missing = any(v["voice_id"] not in VoicePreviewService._rendered for v in voices)
+        if missing and time.time() - VoicePreviewService._checked_at > PREVIEW_RECHECK_SECONDS:
+            # Pick up previews rendered by workers since the last look
+            await VoicePreviewService.find_existing(voices)
+        if settings.VOICE_PREVIEW_RENDER == "lazy":
+            # First call, or new voices since the last pass
+            preview_renderer.start()
+
+        cached = VoicePreviewService._response
+        if cached is not None and cached[2] > time.time():
+            return cached[0], cached[1]
+
+        from app.schemas import Voice
+        voices = VoicePreviewService.with_preview_urls(voices)
+        body = json.dumps([Voice(**voice).model_dump() for voice in voices], ensure_ascii=False).encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        ttl = settings.AUDIO_URL_TTL_SECONDS / 2 if settings.AUDIO_SIGNED_URLS else float("inf")
+        VoicePreviewService._response = (body, etag, time.time() + ttl)
+        return body, etag
+
+
+def dispatch_render(force: bool = False) -> str:
+    """
+    Queue a rendering pass on a Celery worker. Without Celery, development
+    renders in a background thread here; production renders nothing.
+
+    Returns:
+        "queued", "local" or "unavailable"
+    """
+    from app.workers.tts_worker import render_voice_previews, CELERY_AVAILABLE
+    from app.utils.redis_client import redis_health
+
+    if CELERY_AVAILABLE and redis_health.is_healthy():
+        try:
+            render_voice_previews.delay(force)
+            print("[Previews] Rendering queued on the worker")
+            return "queued"
+        except Exception as e:
+            print(f"[Previews] Could not queue rendering: {e}")
+
+    if settings.ENVIRONMENT == "development":
+        threading.Thread(
+            target=lambda: asyncio.run(VoicePreviewService.render_all(force=force)),
+            name="preview-renderer",
+            daemon=True
+        ).start()
+        print("[Previews] Celery unavailable; rendering in this process (development)")
+        return "local"
+
+    print("[Previews] Celery unavailable; previews not rendered")
+    return "unavailable"
+
+
+class PreviewRenderer:
+    """
+    Triggers a rendering pass (see dispatch_render): once, and again when
+    the voice list changes.
+    """
+
+    def __init__(self):
+        self._dispatched = False
+        self._rerun = False
+
+    def request_rerun(self):
+        self._rerun = True
+
+    def start(self):
+        """Dispatch a rendering pass unless one was dispatched and nothing changed since."""
+        with VoicePreviewService._lock:
+            if self._dispatched and not self._rerun:
+                return
+            self._dispatched = True
+            self._rerun = False
+        if dispatch_render() == "unavailable":
+            # Try again on a later request
+            self._dispatched = False
+
+
+preview_renderer = PreviewRenderer()
@@ -0,0 +1,235 @@
+import asyncio
+import os
+import uuid
+from pathlib import Path
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from uuid import UUID
+from app.models import VoiceProfile, User, TTSJob
+from app.config import get_settings
+from app.utils.speaker_cache import file_digest
+
+settings = get_settings()
+
+# voice_id prefix of saved profiles (TTS requests use the full voice_id)
+PROFILE_VOICE_PREFIX = "profile_"
+
+# Storage key prefix for references (never served by the public audio route)
+VOICE_REFERENCE_PREFIX = "voices"
+
+
+def is_profile_voice(voice_id: Optional[str]) -> bool:
+    return bool(voice_id) and voice_id.startswith(PROFILE_VOICE_PREFIX)
+
+
+class VoiceProfileService:
+    """
+    Saved cloning voices.
+
+    Responsibilities:
+    - Validate an uploaded reference (length, silence), mix it to mono,
+      trim it and resample it to the XTTS conditioning rate
+    - Store it once and register it as a VoiceProfile
+    - Resolve a profile's voice_id to a local reference path for workers
+    - Precompute its XTTS conditioning latents (cached by content hash)
+    """
+
+    @staticmethod
+    def prepare_reference(source_path: str, output_path: str) -> Dict:
+        """
+        Validate and normalize an uploaded recording into a mono 16-bit WAV
+        at VOICE_PROFILE_SAMPLE_RATE.
+
+        Raises:
+            ValueError: unreadable, too short or silent audio
+        """
+        import numpy as np
+        import soundfile as sf
+
+        try:
+            audio, sample_rate = sf.read(source_path, dtype="float32", always_2d=True)
+        except Exception:
+            # Formats libsndfile can't read (e.g. mp3/m4a on older builds) go through ffmpeg
+            try:
+                from pydub import AudioSegment
+                AudioSegment.from_file(source_path).export(output_path, format="wav")
+                audio, sample_rate = sf.read(output_path, dtype="float32", always_2d=True)
+            except Exception:
+                raise ValueError("Unsupported or corrupt audio file")
+
+        audio = audio.mean(axis=1)
+        duration = len(audio) / sample_rate
+        if duration < settings.VOICE_PROFILE_MIN_SECONDS:
+            raise ValueError(f"Reference audio must be at least {settings.VOICE_PROFILE_MIN_SECONDS:g} seconds long")
+        audio = audio[:int(settings.VOICE_PROFILE_MAX_SECONDS * sample_rate)]
+
+        rms = float(np.sqrt(np.mean(np.square(audio))))
+        if rms < 1e-3:
+            raise ValueError("Reference audio is silent")
+
+        target_rate = settings.VOICE_PROFILE_SAMPLE_RATE
+        if sample_rate != target_rate:
+            import torch
+            import torchaudio
+            audio = torchaudio.functional.resample(torch.from_numpy(audio), sample_rate, target_rate).numpy()
+
+        # Keep headroom without changing loudness of normal recordings
+        peak = float(np.max(np.abs(audio)))
+        if peak > 0.99:
+            audio = audio * (0.99 / peak)
+
+        sf.write(output_path, audio, target_rate, subtype="PCM_16")
+        return {"sample_rate": target_rate, "duration_seconds": round(len(audio) / target_rate, 2)}
+
+    @staticmethod
+    async def create_profile(
+        db: Session,
+        user: User,
+        upload_path: str,
+        name: str,
+        language: str = "en",
+        gender: str = "unknown",
+        accent: str = "Custom",
+        is_public: bool = False
+    ) -> VoiceProfile:
+        """
+        Register an uploaded reference. Uploading the same audio again
+        returns the existing profile.
+        """
+        from app.adapters.storage.local import get_storage_adapter
+        from app.utils.scratch import new_output_path
+
+        reference_path = str(new_output_path(".wav"))
+        info = await asyncio.to_thread(VoiceProfileService.prepare_reference, upload_path, reference_path)
+        content_hash = await asyncio.to_thread(file_digest, reference_path)
+
+        existing = db.query(VoiceProfile).filter(
+            VoiceProfile.user_id == user.id,
+            VoiceProfile.content_hash == content_hash
+        ).first()
+        if existing:
+            return existing
+
+        profile_id = uuid.uuid4()
+        reference_key = f"{VOICE_REFERENCE_PREFIX}/{user.id}/{profile_id}.wav"
+        await get_storage_adapter().upload_file(reference_path, reference_key, move=True)
+
+        profile = VoiceProfile(
+            id=profile_id,
+            voice_id=f"{PROFILE_VOICE_PREFIX}{profile_id.hex}",
+            user_id=user.id,
+            name=name,
+            language=language,
+            gender=gender,
+            accent=accent,
+            is_public=is_public,
+            reference_key=reference_key,
+            content_hash=content_hash,
+            sample_rate=info["sample_rate"],
+            duration_seconds=info["duration_seconds"]
+        )
+        db.add(profile)
+        db.commit()
+        db.refresh(profile)
+        print(f"[VoiceProfile] Created {profile.voice_id} ({info['duration_seconds']}s) for user {user.id}")
+        return profile
+
+    @staticmethod
+    def get_profile(db: Session, voice_id: str, user_id: Optional[UUID] = None) -> Optional[VoiceProfile]:
+        """
+        Profile by voice_id, if it is public or owned by `user_id`.
+        """
+        query = db.query(VoiceProfile).filter(VoiceProfile.voice_id == voice_id)
+        if user_id is not None:
+            query = query.filter(or_(VoiceProfile.user_id == user_id, VoiceProfile.is_public.is_(True)))
+        return query.first()
+
+    @staticmethod
+    def get_for_job(db: Session, job: TTSJob) -> Optional[VoiceProfile]:
+        """
+        The profile a job's voice_id names, or None for built-in voices.
+
+        Raises:
+            ValueError: the profile no longer exists (or isn't visible to the job's owner)
+        """
+        if not is_profile_voice(job.voice_id):
+            return None
+        profile = VoiceProfileService.get_profile(db, job.voice_id, job.user_id)
+        if profile is None:
+            raise ValueError(f"Voice profile {job.voice_id} not found")
+        return profile
+
+    @staticmethod
+    def list_profiles(db: Session, user_id: UUID) -> List[VoiceProfile]:
+        return db.query(VoiceProfile).filter(
+            VoiceProfile.user_id == user_id
+        ).order_by(VoiceProfile.created_at.desc()).all()
+
+    @staticmethod
+    def list_public(db: Session) -> List[VoiceProfile]:
+        return db.query(VoiceProfile).filter(
+            VoiceProfile.is_public.is_(True)
+        ).order_by(VoiceProfile.name).all()
+
+    @staticmethod
+    async def delete_profile(db: Session, profile: VoiceProfile):
+        from app.adapters.storage.local import get_storage_adapter
+
+        await get_storage_adapter().delete_file(profile.reference_key)
+        db.delete(profile)
+        db.commit()
+
+    @staticmethod
+    async def reference_path(profile: VoiceProfile) -> str:
+        """
+        Local path of a profile's reference. With local storage this is the
+        stored file itself; remote references are downloaded once into
+        VOICE_PROFILE_CACHE_DIR (named by content hash) and reused.
+        """
+        from app.adapters.storage.local import get_storage_adapter, LocalStorage
+
+        storage = get_storage_adapter()
+        if isinstance(storage, LocalStorage):
+            path = await asyncio.to_thread(storage.resolve_path, profile.reference_key)
+            if path is None:
+                raise FileNotFoundError(f"Reference audio missing for {profile.voice_id}")
+            return str(path)
+
+        cache_dir = Path(settings.VOICE_PROFILE_CACHE_DIR)
+        path = cache_dir / f"{profile.content_hash}.wav"
+        if not path.is_file():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.urandom(4).hex()}.tmp")
+            try:
+                await storage.download_file(profile.reference_key, str(tmp_path))
+                os.replace(tmp_path, path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        return str(path)
+
+    @staticmethod
+    async def precompute_latents(db: Session, profile_id: UUID) -> bool:
+        """
+        Encode a profile's reference with XTTS now, so its first clone job
+        finds the conditioning latents in the speaker cache.
+        """
+        from app.adapters.tts.xtts_v2 import get_xtts_adapter
+
+        profile = db.query(VoiceProfile).filter(VoiceProfile.id == profile_id).first()
+        if profile is None:
+            return False
+        path = await VoiceProfileService.reference_path(profile)
+
+        adapter = get_xtts_adapter()
+        if not adapter.model:
+            await asyncio.to_thread(adapter._load_model)
+        if adapter._xtts_model() is None:
+            print(f"[VoiceProfile] This TTS version can't precompute latents; {profile.voice_id} will encode on first use")
+            return False
+        await asyncio.to_thread(adapter.get_speaker_latents, path)
+
+        profile.latents_ready = True
+        db.commit()
+        print(f"[VoiceProfile] Latents ready for {profile.voice_id}")
+        return True
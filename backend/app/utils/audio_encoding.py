@@ -0,0 +1,46 @@
+"""
+Streaming audio encoders.
+
+FFmpeg writes the encoded audio to its stdout pipe and the caller
+consumes it chunk by chunk (typically straight into
+BaseStorage.upload_stream), so encoded output never touches local disk
+and memory stays bounded by one chunk.
+"""
+
+import shutil
+import subprocess
+from typing import Iterator
+
+ENCODE_CHUNK_BYTES = 256 * 1024
+
+
+def mp3_stream(wav_path: str, bitrate: str = "128k", chunk_size: int = ENCODE_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Encode a WAV file to MP3, yielding encoded bytes as FFmpeg produces them.
+
+    Raises:
+        RuntimeError: FFmpeg is not installed (raised immediately), or it
+            exits with an error (raised from the iterator)
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("FFmpeg not found")
+    command = [ffmpeg, "-nostdin", "-loglevel", "error", "-i", wav_path, "-f", "mp3", "-b:a", bitrate, "pipe:1"]
+    return _pipe_chunks(command, chunk_size)
+
+
+def _pipe_chunks(command, chunk_size: int) -> Iterator[bytes]:
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while chunk := process.stdout.read(chunk_size):
+            yield chunk
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"FFmpeg exited with {process.returncode}: {stderr.decode(errors='replace').strip()}")
+    finally:
+        # Consumer stopped early (e.g. the upload failed): don't leave FFmpeg running
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
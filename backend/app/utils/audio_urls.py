@@ -0,0 +1,74 @@
+"""
+Audio URL building and signing.
+
+Audio objects are addressed by their storage key (e.g. `audio/{user_id}/{job_id}.mp3`).
+Public URLs point at the audio delivery route under AUDIO_BASE_URL, which
+may be the API itself or a CDN in front of it. When AUDIO_SIGNED_URLS is
+enabled, URLs carry an expiry and an HMAC over key + expiry.
+"""
+
+import hashlib
+import hmac
+import time
+from typing import Optional
+from urllib.parse import quote, unquote, urlsplit
+
+from app.config import get_settings
+
+settings = get_settings()
+
+AUDIO_ROUTE = "/api/v1/audio/"
+
+
+def _signature(key: str, expires: int) -> str:
+    message = f"{key}:{expires}".encode("utf-8")
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def audio_url_for(key: str, ttl_seconds: Optional[int] = None) -> str:
+    """
+    Build the public URL for a storage key, signed if signing is enabled.
+    """
+    url = f"{settings.AUDIO_BASE_URL.rstrip('/')}{AUDIO_ROUTE}{quote(key)}"
+    if not settings.AUDIO_SIGNED_URLS:
+        return url
+
+    expires = int(time.time()) + (ttl_seconds or settings.AUDIO_URL_TTL_SECONDS)
+    return f"{url}?expires={expires}&sig={_signature(key, expires)}"
+
+
+def verify_audio_signature(key: str, expires: Optional[int], sig: Optional[str]) -> bool:
+    """
+    Check a signed audio URL. Always True when signing is disabled.
+    """
+    if not settings.AUDIO_SIGNED_URLS:
+        return True
+    if expires is None or sig is None or expires < time.time():
+        return False
+    return hmac.compare_digest(_signature(key, expires), sig)
+
+
+def key_from_audio_url(url: str) -> Optional[str]:
+    """
+    Extract the storage key from an audio URL built by audio_url_for
+    (or a legacy `/storage/` URL). Returns None for foreign URLs.
+    """
+    path = urlsplit(url).path
+    for prefix in (AUDIO_ROUTE, "/storage/"):
+        if path.startswith(prefix):
+            return unquote(path[len(prefix):])
+    return None
+
+
+def fresh_audio_url(url: Optional[str]) -> Optional[str]:
+    """
+    Re-issue a stored audio URL for a response: re-signs it (new expiry)
+    when signing is enabled and points legacy URLs at the delivery route.
+    Foreign URLs (e.g. S3) are returned unchanged.
+    """
+    if not url:
+        return url
+    key = key_from_audio_url(url)
+    if key is None:
+        return url
+    return audio_url_for(key)
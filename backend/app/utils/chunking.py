@@ -0,0 +1,128 @@
+"""
+Token-budget chunk planning for TTS engines.
+
+Model cost (and stability) depends on how many tokens a chunk has, not
+how many characters: Devanagari or Tamil text tokenizes very differently
+from Latin. The planner measures sentences with the engine's own counter
+(tokenizer or phonemizer), splits sentences that exceed the budget at
+clause boundaries (then at word boundaries), and packs the pieces into
+the fewest chunks that fit the budget, with lengths as even as possible
+so batched generation pads less.
+
+Packing sums per-unit counts, which misses the joining spaces and how a
+tokenizer or phonemizer treats word boundaries, so every packed chunk is
+counted again as joined text and split further if it is still over.
+"""
+
+import re
+from typing import Callable, List, Tuple
+
+# Split after clause punctuation (comma, semicolon, colon, Arabic comma), keeping it on the left
+_CLAUSE_SPLIT_RE = re.compile(r'(?<=[,;:،])\s+')
+
+Unit = Tuple[str, int]
+
+
+def _pack_words(text: str, count_tokens: Callable[[str], int], budget: int) -> List[Unit]:
+    """Greedy word-level split for a clause that is still over budget."""
+    units: List[Unit] = []
+    current, current_tokens = [], 0
+    for word in text.split():
+        tokens = count_tokens(word)
+        if current and current_tokens + tokens > budget:
+            units.append((" ".join(current), current_tokens))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += tokens
+    if current:
+        units.append((" ".join(current), current_tokens))
+    return units
+
+
+def split_units(sentence: str, count_tokens: Callable[[str], int], budget: int) -> List[Unit]:
+    """
+    Break a sentence into (text, tokens) units that each fit the budget
+    where possible: whole sentence, else clauses, else word runs.
+    A single word longer than the budget is left as is.
+    """
+    tokens = count_tokens(sentence)
+    if tokens <= budget:
+        return [(sentence, tokens)]
+
+    units: List[Unit] = []
+    clauses = _CLAUSE_SPLIT_RE.split(sentence)
+    if len(clauses) == 1:
+        return _pack_words(sentence, count_tokens, budget)
+    for clause in clauses:
+        clause_tokens = count_tokens(clause)
+        if clause_tokens <= budget:
+            units.append((clause, clause_tokens))
+        else:
+            units.extend(_pack_words(clause, count_tokens, budget))
+    return units
+
+
+def _greedy(units: List[Unit], capacity: int) -> List[List[Unit]]:
+    chunks: List[List[Unit]] = []
+    current, current_tokens = [], 0
+    for unit in units:
+        if current and current_tokens + unit[1] > capacity:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += unit[1]
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _fit(units: List[Unit], count_tokens: Callable[[str], int], budget: int) -> List[str]:
+    """
+    Measure a packed chunk as the text the engine will see; halve it (by
+    token weight) until every piece fits. A single word is left as is.
+    """
+    text = " ".join(unit_text for unit_text, _ in units)
+    if count_tokens(text) <= budget:
+        return [text]
+    if len(units) == 1:
+        words = text.split()
+        if len(words) == 1:
+            return [text]
+        units = [(word, count_tokens(word)) for word in words]
+
+    half, running, mid = sum(tokens for _, tokens in units) / 2, 0, 1
+    for mid, (_, tokens) in enumerate(units[:-1], start=1):
+        running += tokens
+        if running >= half:
+            break
+    return _fit(units[:mid], count_tokens, budget) + _fit(units[mid:], count_tokens, budget)
+
+
+def plan_chunks(sentences: List[str], count_tokens: Callable[[str], int], budget: int) -> List[str]:
+    """
+    Pack sentences into chunks of at most `budget` tokens.
+
+    Uses the minimum number of chunks the budget allows, then lowers the
+    per-chunk capacity as far as possible without adding a chunk, which
+    evens out chunk lengths (e.g. 2 x 60 tokens instead of 110 + 10).
+    """
+    units: List[Unit] = []
+    for sentence in sentences:
+        if sentence:
+            units.extend(split_units(sentence, count_tokens, budget))
+    if not units:
+        return []
+
+    target = len(_greedy(units, budget))
+    low, high = max(tokens for _, tokens in units), max(budget, max(tokens for _, tokens in units))
+    while low < high:
+        mid = (low + high) // 2
+        if len(_greedy(units, mid)) <= target:
+            high = mid
+        else:
+            low = mid + 1
+
+    chunks: List[str] = []
+    for chunk in _greedy(units, low):
+        chunks.extend(_fit(chunk, count_tokens, budget))
+    return chunks
@@ -0,0 +1,245 @@
+"""
+Prometheus metric definitions and the /metrics exposition.
+
+prometheus_client is optional: without it every metric below is a no-op,
+so instrumented code never needs to check whether it is installed.
+
+Everything here is an in-memory counter, or is read from objects already
+in memory at scrape time; a scrape never touches the database or Redis.
+Celery workers record job metrics in their own process; to see them on
+the API's /metrics, point both at the same PROMETHEUS_MULTIPROC_DIR
+(prometheus_client multiprocess mode).
+"""
+
+import os
+import sys
+from typing import Dict, Optional, Tuple
+
+PROMETHEUS_AVAILABLE = False
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    Counter = Gauge = Histogram = None
+
+
+class _NoopMetric:
+    """Stands in for a metric when prometheus_client isn't installed."""
+
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def observe(self, amount: float):
+        pass
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def dec(self, amount: float = 1):
+        pass
+
+    def set(self, value: float):
+        pass
+
+
+def _metric(cls, name: str, documentation: str, labelnames: Tuple[str, ...] = (), **kwargs):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return cls(name, documentation, labelnames, **kwargs)
+
+
+# Inference is seconds to minutes; DB and upload stages are milliseconds
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+STAGE_SECONDS = _metric(
+    Histogram, "tts_stage_seconds",
+    "Time spent in each stage of a TTS job",
+    ("stage", "engine", "language"), buckets=STAGE_BUCKETS
+)
+CHUNK_INFERENCE_SECONDS = _metric(
+    Histogram, "tts_chunk_inference_seconds",
+    "Model inference time per synthesized chunk",
+    ("engine", "language"), buckets=STAGE_BUCKETS
+)
+JOB_SECONDS = _metric(
+    Histogram, "tts_job_seconds",
+    "Total worker time per TTS job",
+    ("engine", "language", "status"), buckets=STAGE_BUCKETS
+)
+HTTP_REQUESTS = _metric(
+    Counter, "http_requests_total",
+    "HTTP requests by route template and status code",
+    ("method", "route", "status")
+)
+HTTP_LATENCY = _metric(
+    Histogram, "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route"),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+JOBS = _metric(
+    Counter, "tts_jobs_total",
+    "TTS job status transitions (queued, processing, completed, failed)",
+    ("status",)
+)
+JOBS_COALESCED = _metric(
+    Counter, "tts_jobs_coalesced_total",
+    "Jobs attached to an identical in-flight job instead of being synthesized"
+)
+JOBS_IN_PROGRESS = _metric(
+    Gauge, "tts_jobs_in_progress",
+    "Jobs currently being synthesized",
+    multiprocess_mode="livesum"
+)
+# Incremented and decremented in the same (API) process. The Celery backlog
+# lives in another process, so it is read from the broker instead.
+QUEUE_DEPTH = _metric(
+    Gauge, "tts_queue_depth",
+    "Sync-path jobs accepted but not yet picked up by a background thread, by priority tier",
+    ("priority",), multiprocess_mode="livesum"
+)
+BROKER_QUEUE_LENGTH = _metric(
+    Gauge, "tts_broker_queue_length",
+    "Messages waiting in the Celery queue (sampled by the Redis health monitor)",
+    multiprocess_mode="max"
+)
+PASSWORD_HASH_QUEUED = _metric(
+    Gauge, "password_hash_queued",
+    "bcrypt calls waiting for a hashing thread",
+    multiprocess_mode="livesum"
+)
+PASSWORD_HASH_RUNNING = _metric(
+    Gauge, "password_hash_running",
+    "bcrypt calls currently running",
+    multiprocess_mode="livesum"
+)
+PASSWORD_HASH_REJECTED = _metric(
+    Counter, "password_hash_rejected_total",
+    "bcrypt calls rejected because the hashing queue was full"
+)
+PASSWORD_HASH_WAIT_SECONDS = _metric(
+    Histogram, "password_hash_wait_seconds",
+    "Time bcrypt calls spent queued before a thread picked them up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+SCRATCH_JOB_BYTES = _metric(
+    Histogram, "tts_scratch_job_bytes",
+    "Scratch disk used by a job when its directory was cleaned up",
+    buckets=(64 * 1024, 256 * 1024, 1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2, 64 * 1024 ** 2, 256 * 1024 ** 2, 1024 ** 3)
+)
+
+# Adapter singletons reported on, by engine (only if already imported)
+ADAPTER_SINGLETONS = {
+    "kokoro": ("app.adapters.tts.kokoro", "_kokoro_instance"),
+    "indicparler": ("app.adapters.tts.indicparler", "_indicparler_instance"),
+    "xtts": ("app.adapters.tts.xtts_v2", "_xtts_instance"),
+    "hindi": ("app.adapters.tts.hindi", "_hindi_instance"),
+    "mock": ("app.adapters.tts.mock", "_mock_instance"),
+}
+
+
+def loaded_adapters() -> Dict[str, object]:
+    """
+    Adapter instances this process has created, by engine.
+    Looks in sys.modules so reporting never imports a model library.
+    """
+    adapters = {}
+    for engine, (module_name, attr) in ADAPTER_SINGLETONS.items():
+        instance = getattr(sys.modules.get(module_name), attr, None)
+        if instance is not None:
+            adapters[engine] = instance
+    return adapters
+
+
+def gpu_available() -> Optional[bool]:
+    """
+    Whether CUDA is usable, if this process has imported torch already
+    (None otherwise; reporting never imports torch).
+    """
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return None
+    try:
+        return bool(torch.cuda.is_available())
+    except Exception:
+        return False
+
+
+def cache_stats() -> Dict[str, Dict]:
+    """Hit/miss counters of the in-process caches, by cache name."""
+    from app.auth.principal_cache import principal_cache
+    
+    caches = {"principal": principal_cache.stats()}
+    kokoro = loaded_adapters().get("kokoro")
+    phoneme_stats = kokoro.get_phoneme_cache_stats() if kokoro else None
+    if phoneme_stats:
+        caches["phonemes"] = phoneme_stats
+    xtts = loaded_adapters().get("xtts")
+    if xtts is not None:
+        caches["speaker_latents"] = xtts.latent_cache.stats()
+    router = getattr(sys.modules.get("app.adapters.tts.routing"), "_routing_instance", None)
+    if router is not None:
+        caches["script_runs"] = router.get_cache_stats()
+    return caches
+
+
+class AdapterCollector:
+    """
+    Scrape-time collector for model state and cache counters, which live
+    on adapter and cache objects rather than in prometheus metrics.
+    """
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+        
+        loaded = GaugeMetricFamily("tts_model_loaded", "Whether the engine's model is in memory", labels=["engine"])
+        memory = GaugeMetricFamily("tts_model_memory_bytes", "Approximate model weight memory", labels=["engine"])
+        for engine, adapter in loaded_adapters().items():
+            loaded.add_metric([engine], 1.0 if adapter.is_model_loaded() else 0.0)
+            size = adapter.model_memory_bytes()
+            if size is not None:
+                memory.add_metric([engine], float(size))
+        yield loaded
+        yield memory
+        
+        hits = CounterMetricFamily("tts_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("tts_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("tts_cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+        for name, stats in cache_stats().items():
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            ratio.add_metric([name], stats["hit_rate"])
+        yield hits
+        yield misses
+        yield ratio
+
+
+_adapter_collector = AdapterCollector()
+if PROMETHEUS_AVAILABLE:
+    from prometheus_client import REGISTRY
+    REGISTRY.register(_adapter_collector)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Exposition payload and content type for /metrics.
+    Aggregates across processes in multiprocess mode.
+    """
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+    
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_adapter_collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def language_label(language: str) -> str:
+    """Bound label cardinality: unknown language codes are reported as 'other'."""
+    from app.adapters.tts.factory import INDIAN_LANGUAGES, EAST_ASIAN_LANGUAGES, normalize_language
+    lang = normalize_language(language)
+    if lang == "en" or lang in INDIAN_LANGUAGES or lang in EAST_ASIAN_LANGUAGES:
+        return lang
+    return "other"
@@ -0,0 +1,140 @@
+"""
+Memoized grapheme-to-phoneme conversion.
+
+Kokoro's G2P (espeak) is called for every chunk, and the chunk planner
+measures sentences (and, for over-long ones, clauses and words) in
+phonemes before that, so the same text is phonemized several times per
+job and again across jobs. PhonemeCache is one LRU keyed by (text, lang),
+so the adapter can hand phonemes straight to the model. Multi-sentence
+chunks are assembled from cached sentences. The cache can be persisted
+to disk so a restarted worker starts warm.
+
+Sentences are never assembled from per-word phonemes: espeak's output
+depends on context across word boundaries (weak forms such as "the"
+before a vowel, stress, and punctuation-driven intonation). Word-built
+phonemes would sound different from what the model would produce itself.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from app.utils.text_processing import get_text_preprocessor
+
+Key = Tuple[str, str]
+
+
+class _LRU:
+    """Thread-safe LRU map with hit/miss counters."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Key, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Key) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Key, value: str):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def items(self):
+        with self._lock:
+            return list(self._entries.items())
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+class PhonemeCache:
+    """
+    Sentence-level phoneme cache in front of a G2P function.
+    """
+
+    def __init__(
+        self,
+        phonemize: Callable[[str, str], str],
+        max_entries: int = 20000,
+        path: Optional[str] = None
+    ):
+        self._phonemize = phonemize
+        self.entries = _LRU(max_entries)
+        self.path = Path(path) if path else None
+        if self.path is not None:
+            self.load()
+
+    def _lookup(self, text: str, lang: str) -> str:
+        key = (text, lang)
+        phonemes = self.entries.get(key)
+        if phonemes is None:
+            phonemes = self._phonemize(text, lang)
+            self.entries.put(key, phonemes)
+        return phonemes
+
+    def phonemize(self, text: str, lang: str) -> str:
+        """
+        Phonemes for `text`. Multi-sentence text is phonemized sentence by
+        sentence so chunks reuse what the planner already looked up.
+        """
+        text = text.strip()
+        if not text:
+            return ""
+        sentences = get_text_preprocessor().segment_sentences(text)
+        if len(sentences) <= 1:
+            return self._lookup(text, lang)
+        return " ".join(self._lookup(sentence, lang) for sentence in sentences)
+
+    def stats(self) -> Dict:
+        return self.entries.stats()
+
+    def load(self):
+        """Load persisted entries (missing or corrupt files are ignored)."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Files written before the word tier was dropped split entries by level
+        for level in ("words", "sentences", "entries"):
+            for text, lang, phonemes in data.get(level, []):
+                self.entries.put((text, lang), phonemes)
+        print(f"[PhonemeCache] Loaded {len(self.entries._entries)} entries from {self.path}")
+
+    def save(self):
+        """Persist entries atomically (write to a temp file, then os.replace)."""
+        if self.path is None:
+            return
+        data = {"entries": [[text, lang, phonemes] for (text, lang), phonemes in self.entries.items()]}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[PhonemeCache] Could not persist cache: {e}")
+            tmp_path.unlink(missing_ok=True)
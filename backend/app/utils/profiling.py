@@ -0,0 +1,134 @@
+"""
+Opt-in profiling of synthesis.
+
+When PROFILING_ENABLED is set, the worker wraps `adapter.generate` in a
+GenerateProfiler. A job is profiled when it is sampled
+(PROFILE_SAMPLE_RATE) or, if PROFILE_THRESHOLD_SECONDS is set, always,
+with the trace kept only when generation ran longer than the threshold.
+Kept traces are uploaded next to the job's audio under PROFILE_PREFIX and
+served to admins from /admin/jobs/{id}/profile.
+
+Modes:
+    cprofile  Python call profile (.prof; open with snakeviz or pstats)
+    torch     torch.profiler operator trace (.json; chrome://tracing)
+
+Threshold mode profiles every job, so expect some overhead (small for
+model-bound work, where time is spent in native code).
+"""
+
+import cProfile
+import io
+import pstats
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.config import get_settings
+from app.utils.scratch import new_output_path
+
+settings = get_settings()
+
+# Storage key prefix for traces (never served by the public audio route)
+PROFILE_PREFIX = "profiles"
+
+# cProfile allows one active profiler per process on Python 3.12+
+_profiler_lock = threading.Lock()
+
+
+class GenerateProfiler:
+    """
+    Context manager around one generate() call. Inactive (a no-op) unless
+    the job was selected for profiling and no other profile is running.
+    """
+
+    def __init__(self, mode: Optional[str] = None):
+        self.mode = (mode or settings.PROFILE_MODE).lower()
+        self.sampled = False
+        self.active = False
+        self.elapsed = 0.0
+        self._profiler = None
+
+        if not settings.PROFILING_ENABLED:
+            return
+        self.sampled = random.random() < settings.PROFILE_SAMPLE_RATE
+        if self.sampled or settings.PROFILE_THRESHOLD_SECONDS > 0:
+            self.active = _profiler_lock.acquire(blocking=False)
+
+    def _start_profiler(self):
+        if self.mode == "torch":
+            import torch
+            from torch.profiler import profile, ProfilerActivity
+            activities = [ProfilerActivity.CPU]
+            if torch.cuda.is_available():
+                activities.append(ProfilerActivity.CUDA)
+            self._profiler = profile(activities=activities)
+            self._profiler.__enter__()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def _stop_profiler(self):
+        if self.mode == "torch":
+            self._profiler.__exit__(None, None, None)
+        else:
+            self._profiler.disable()
+
+    def __enter__(self) -> "GenerateProfiler":
+        if self.active:
+            try:
+                self._start_profiler()
+            except Exception as e:
+                print(f"[Profiler] Could not start {self.mode} profiler: {e}")
+                self._profiler = None
+                self._release()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.elapsed = time.perf_counter() - self._start
+        if self.active:
+            self._stop_profiler()
+            self._release()
+        return False
+
+    def _release(self):
+        if self.active:
+            self.active = False
+            _profiler_lock.release()
+
+    @property
+    def suffix(self) -> str:
+        return ".json" if self.mode == "torch" else ".prof"
+
+    def should_keep(self) -> bool:
+        if self._profiler is None:
+            return False
+        threshold = settings.PROFILE_THRESHOLD_SECONDS
+        return self.sampled or (threshold > 0 and self.elapsed >= threshold)
+
+    def save(self) -> Optional[Path]:
+        """Write the trace to the job's scratch space if it is worth keeping."""
+        if not self.should_keep():
+            return None
+        path = new_output_path(self.suffix)
+        if self.mode == "torch":
+            self._profiler.export_chrome_trace(str(path))
+        else:
+            self._profiler.dump_stats(str(path))
+        reason = "sampled" if self.sampled else f"over {settings.PROFILE_THRESHOLD_SECONDS}s"
+        print(f"[Profiler] Kept {self.mode} profile ({self.elapsed:.1f}s, {reason}): {path}")
+        return path
+
+
+def profile_key(user_id, job_id, suffix: str) -> str:
+    return f"{PROFILE_PREFIX}/{user_id}/{job_id}{suffix}"
+
+
+def render_profile_text(path: str, limit: int = 40) -> str:
+    """Top functions by cumulative time from a cProfile dump."""
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,139 @@
+"""
+Shared Redis connection pool and cached broker health.
+
+Request handlers should never open their own Redis connections or ping
+the broker inline. Use `get_redis()` (or `get_async_redis()` on the
+event loop) for a pooled client and `redis_health.is_healthy()` for a
+liveness answer that costs no I/O.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Celery's Redis list for TTS jobs (see celery_app.task_routes)
+TTS_QUEUE_KEY = "tts_queue"
+
+_pool = None
+_async_pool = None
+_pool_lock = threading.Lock()
+
+
+def _pool_options() -> dict:
+    return {
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "socket_connect_timeout": 1.0,
+        "socket_timeout": 1.0,
+        "health_check_interval": 30
+    }
+
+
+def get_redis_pool():
+    """
+    Get the process-wide Redis connection pool (created on first use).
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                import redis
+                _pool = redis.ConnectionPool.from_url(settings.REDIS_URL, **_pool_options())
+    return _pool
+
+
+def get_redis():
+    """
+    Get a Redis client backed by the shared pool.
+    """
+    import redis
+    return redis.Redis(connection_pool=get_redis_pool())
+
+
+def get_async_redis():
+    """
+    Get an asyncio Redis client backed by the process-wide async pool
+    (same settings as the sync pool). Use from the API event loop only.
+    """
+    global _async_pool
+    import redis.asyncio as aioredis
+    if _async_pool is None:
+        with _pool_lock:
+            if _async_pool is None:
+                _async_pool = aioredis.ConnectionPool.from_url(settings.REDIS_URL, **_pool_options())
+    return aioredis.Redis(connection_pool=_async_pool)
+
+
+class RedisHealthMonitor:
+    """
+    Background thread that pings Redis on an interval and caches the result.
+
+    `is_healthy()` only reads the cached value. A result older than `ttl`
+    (e.g. the monitor thread is stuck on a hanging socket) counts as down.
+    """
+
+    def __init__(self, interval: float, ttl: float):
+        self.interval = interval
+        self.ttl = ttl
+        self._healthy = False
+        self._checked_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def check_now(self) -> bool:
+        """Ping Redis once and update the cached state (and sample the job queue length)."""
+        from app.utils.metrics import BROKER_QUEUE_LENGTH
+        try:
+            client = get_redis()
+            healthy = bool(client.ping())
+            BROKER_QUEUE_LENGTH.set(client.llen(TTS_QUEUE_KEY))
+        except Exception:
+            healthy = False
+
+        if healthy != self._healthy:
+            print(f"[REDIS] Broker is now {'UP' if healthy else 'DOWN'}")
+        self._healthy = healthy
+        self._checked_at = time.monotonic()
+        return healthy
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check_now()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the monitor thread (no-op if already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="redis-health", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the monitor thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def is_healthy(self) -> bool:
+        """
+        Cached Redis liveness. Never blocks.
+        Starts the monitor lazily if nobody has started it yet.
+        """
+        if self._thread is None:
+            self.start()
+        if time.monotonic() - self._checked_at > self.ttl:
+            return False
+        return self._healthy
+
+
+redis_health = RedisHealthMonitor(
+    interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    ttl=settings.REDIS_HEALTH_TTL
+)
@@ -0,0 +1,248 @@
+"""
+Scratch-space management for synthesis intermediates.
+
+Adapters write WAVs (and the worker writes MP3s) to scratch space before
+the result is published to storage. Each job gets its own directory under
+the scratch root, which is removed when the job finishes, whether it
+succeeded or failed. A background janitor reaps anything left behind by
+crashed workers once it is older than SCRATCH_MAX_AGE_SECONDS. Live job
+directories are never reaped: the janitor skips the ones registered in
+its own process and keeps touching them, so a janitor in another process
+sharing the root sees them as fresh however long the job runs.
+
+Usage in a worker:
+    scratch = job_scratch(job_id)
+    try:
+        wav_path = run_async(adapter.generate(...))   # writes into scratch
+        ...
+    finally:
+        scratch.cleanup()
+
+Adapters just call `new_output_path(".wav")`; it resolves to the active
+job's directory (via a context variable) or the shared root otherwise.
+"""
+
+import contextvars
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.config import get_settings
+
+settings = get_settings()
+
+JOB_DIR_PREFIX = "job-"
+
+_current_scratch: contextvars.ContextVar[Optional["ScratchSpace"]] = contextvars.ContextVar(
+    "current_scratch", default=None
+)
+_root: Optional[Path] = None
+_active_lock = threading.Lock()
+_active: Dict[Path, "ScratchSpace"] = {}
+
+
+def get_scratch_root() -> Path:
+    """
+    Resolve (and create) the scratch root.
+
+    Precedence: SCRATCH_DIR, then /dev/shm when SCRATCH_USE_TMPFS is set
+    and available, then the system temp dir.
+    """
+    global _root
+    if _root is None:
+        if settings.SCRATCH_DIR:
+            root = Path(settings.SCRATCH_DIR)
+        elif settings.SCRATCH_USE_TMPFS and os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+            root = Path("/dev/shm") / "tts_output"
+        else:
+            root = Path(tempfile.gettempdir()) / "tts_output"
+        root.mkdir(parents=True, exist_ok=True)
+        _root = root
+    return _root
+
+
+class ScratchSpace:
+    """
+    A per-job scratch directory, active for the current context until cleaned up.
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = str(job_id)
+        self.path = get_scratch_root() / f"{JOB_DIR_PREFIX}{self.job_id}-{os.urandom(4).hex()}"
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._token = _current_scratch.set(self)
+        self._cleaned = False
+        with _active_lock:
+            _active[self.path] = self
+
+    def new_file(self, suffix: str = ".wav") -> Path:
+        return self.path / f"{os.urandom(16).hex()}{suffix}"
+
+    def usage_bytes(self) -> int:
+        return _dir_size(self.path)[0]
+
+    def cleanup(self):
+        """Remove the directory and deactivate it. Safe to call twice."""
+        from app.utils.metrics import SCRATCH_JOB_BYTES
+        if self._cleaned:
+            return
+        self._cleaned = True
+        try:
+            _current_scratch.reset(self._token)
+        except ValueError:
+            # Reset from a different context; just clear it
+            _current_scratch.set(None)
+        SCRATCH_JOB_BYTES.observe(self.usage_bytes())
+        shutil.rmtree(self.path, ignore_errors=True)
+        with _active_lock:
+            _active.pop(self.path, None)
+
+    def __enter__(self) -> "ScratchSpace":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cleanup()
+        return False
+
+
+def job_scratch(job_id: str) -> ScratchSpace:
+    """Create and activate a scratch directory for a job."""
+    scratch_janitor.start()
+    return ScratchSpace(job_id)
+
+
+def new_output_path(suffix: str = ".wav") -> Path:
+    """
+    Path for a new intermediate file: inside the active job's scratch
+    directory if there is one, otherwise directly under the scratch root
+    (where the janitor will eventually reap it).
+    """
+    scratch = _current_scratch.get()
+    if scratch is not None and not scratch._cleaned:
+        return scratch.new_file(suffix)
+    return get_scratch_root() / f"{os.urandom(16).hex()}{suffix}"
+
+
+def _dir_size(path: Path) -> Tuple[int, int]:
+    total = files = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.stat(os.path.join(dirpath, name)).st_size
+                files += 1
+            except OSError:
+                pass
+    return total, files
+
+
+def touch_active():
+    """Refresh the mtime of this process's live job directories."""
+    with _active_lock:
+        paths = list(_active)
+    for path in paths:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+def reap_orphans(max_age_seconds: Optional[int] = None) -> Dict:
+    """
+    Delete scratch entries (job dirs or loose files) older than max_age_seconds.
+
+    Directories of jobs still running in this process are skipped; those
+    of other processes stay fresh through their janitor's touch_active().
+
+    Returns:
+        {"removed": n, "bytes_reclaimed": n}
+    """
+    max_age = settings.SCRATCH_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+    cutoff = time.time() - max_age
+    removed = reclaimed = 0
+
+    with _active_lock:
+        active = set(_active)
+
+    for entry in get_scratch_root().iterdir():
+        try:
+            if entry in active or entry.stat().st_mtime > cutoff:
+                continue
+            if entry.is_dir():
+                size, _ = _dir_size(entry)
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                size = entry.stat().st_size
+                entry.unlink(missing_ok=True)
+            removed += 1
+            reclaimed += size
+        except OSError as e:
+            print(f"[SCRATCH] Could not reap {entry}: {e}")
+
+    if removed:
+        print(f"[SCRATCH] Reaped {removed} orphaned entries ({reclaimed / 1024 / 1024:.1f} MB)")
+    return {"removed": removed, "bytes_reclaimed": reclaimed}
+
+
+def scratch_usage() -> Dict:
+    """Disk-usage snapshot of the scratch root."""
+    root = get_scratch_root()
+    used, files = _dir_size(root)
+    disk = shutil.disk_usage(root)
+    return {
+        "root": str(root),
+        "bytes_used": used,
+        "files": files,
+        "active_jobs": len(_active),
+        "disk_free_bytes": disk.free,
+        "disk_total_bytes": disk.total
+    }
+
+
+class ScratchJanitor:
+    """
+    Background thread that periodically reaps orphaned scratch entries,
+    and touches live job directories every `heartbeat` seconds (well
+    inside SCRATCH_MAX_AGE_SECONDS) so no janitor mistakes them for orphans.
+    """
+
+    def __init__(self, interval: float, heartbeat: float):
+        self.interval = interval
+        self.heartbeat = max(1.0, min(interval, heartbeat))
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def _run(self):
+        next_reap = time.monotonic() + self.interval
+        while not self._stop.wait(self.heartbeat):
+            try:
+                touch_active()
+                if time.monotonic() >= next_reap:
+                    next_reap = time.monotonic() + self.interval
+                    reap_orphans()
+            except Exception as e:
+                print(f"[SCRATCH] Janitor error: {e}")
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="scratch-janitor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+scratch_janitor = ScratchJanitor(
+    interval=settings.SCRATCH_JANITOR_INTERVAL,
+    heartbeat=settings.SCRATCH_MAX_AGE_SECONDS / 4
+)
@@ -0,0 +1,170 @@
+"""
+Unicode-block script detection and script-run segmentation.
+
+Used to route code-mixed text (e.g. Hinglish) to the right TTS engine per
+run instead of trusting the request's language for the whole input.
+Characters are classified by Unicode block with a bisect lookup that is
+memoized per codepoint; digits, punctuation, whitespace and joiners are
+neutral and attach to the surrounding run.
+"""
+
+import unicodedata
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional
+
+# (first, last, script) — sorted by first codepoint
+_BLOCKS = [
+    (0x0041, 0x024F, "Latin"),
+    (0x0600, 0x06FF, "Arabic"),
+    (0x0750, 0x077F, "Arabic"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B00, 0x0B7F, "Oriya"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+    (0x1C50, 0x1C7F, "OlChiki"),
+    (0x1E00, 0x1EFF, "Latin"),
+    (0x3040, 0x30FF, "Kana"),
+    (0x4E00, 0x9FFF, "Han"),
+    (0xA8E0, 0xA8FF, "Devanagari"),
+    (0xABC0, 0xABFF, "MeeteiMayek"),
+    (0xAC00, 0xD7AF, "Hangul"),
+    (0xFB50, 0xFDFF, "Arabic"),
+    (0xFE70, 0xFEFF, "Arabic"),
+]
+_STARTS = [first for first, _, _ in _BLOCKS]
+
+# Language assumed for a script when the request's language doesn't use it
+SCRIPT_LANGUAGE = {
+    "Latin": "en",
+    "Devanagari": "hi",
+    "Bengali": "bn",
+    "Gurmukhi": "pa",
+    "Gujarati": "gu",
+    "Oriya": "or",
+    "Tamil": "ta",
+    "Telugu": "te",
+    "Kannada": "kn",
+    "Malayalam": "ml",
+    "Arabic": "ur",
+    "OlChiki": "sat",
+    "MeeteiMayek": "mni",
+    "Kana": "ja",
+    "Han": "zh",
+    "Hangul": "ko",
+}
+
+# Scripts each language is written in (for honouring the requested language).
+# Languages missing here are treated as Latin-script.
+LANGUAGE_SCRIPTS = {
+    "en": ("Latin",),
+    "hi": ("Devanagari",), "mr": ("Devanagari",), "sa": ("Devanagari",), "ne": ("Devanagari",),
+    "mai": ("Devanagari",), "doi": ("Devanagari",), "kok": ("Devanagari",), "bo": ("Devanagari",),
+    "bn": ("Bengali",), "as": ("Bengali",),
+    "pa": ("Gurmukhi",),
+    "gu": ("Gujarati",),
+    "or": ("Oriya",),
+    "ta": ("Tamil",),
+    "te": ("Telugu",),
+    "kn": ("Kannada",),
+    "ml": ("Malayalam",),
+    "ur": ("Arabic",), "sd": ("Arabic",), "ks": ("Arabic",),
+    "sat": ("OlChiki",),
+    "mni": ("MeeteiMayek", "Bengali"),
+    "ja": ("Kana", "Han"),
+    "zh": ("Han",),
+    "ko": ("Hangul", "Han"),
+}
+
+_MISSING = object()
+_script_cache: Dict[str, Optional[str]] = {}
+
+
+def char_script(ch: str) -> Optional[str]:
+    """Script of a character, or None for neutral characters."""
+    script = _script_cache.get(ch, _MISSING)
+    if script is not _MISSING:
+        return script
+    script = None
+    # Letters and combining marks carry a script; digits, punctuation (incl. danda) and spaces don't
+    if ch.isalpha() or unicodedata.category(ch)[0] == "M":
+        codepoint = ord(ch)
+        i = bisect_right(_STARTS, codepoint) - 1
+        if i >= 0 and codepoint <= _BLOCKS[i][1]:
+            script = _BLOCKS[i][2]
+    _script_cache[ch] = script
+    return script
+
+
+class ScriptRun(NamedTuple):
+    script: Optional[str]
+    language: str
+    text: str
+
+
+def detect_script(text: str) -> Optional[str]:
+    """Dominant script of `text` by letter count, or None if there are no letters."""
+    counts: Dict[str, int] = {}
+    for ch in text:
+        script = char_script(ch)
+        if script is not None:
+            counts[script] = counts.get(script, 0) + 1
+    return max(counts, key=counts.get) if counts else None
+
+
+def _language_for(script: Optional[str], requested: str) -> str:
+    if script is None or script in LANGUAGE_SCRIPTS.get(requested, ()):
+        return requested
+    # Languages not listed (es, fr, de, ...) are Latin-script: their Latin runs keep the request
+    if script == "Latin" and requested not in LANGUAGE_SCRIPTS:
+        return requested
+    return SCRIPT_LANGUAGE.get(script, requested)
+
+
+def segment_by_script(text: str, requested_language: str = "en", min_latin_words: int = 0) -> List[ScriptRun]:
+    """
+    Split text into maximal runs of one language, detected from the script.
+
+    Runs use the requested language when it is written in that run's script,
+    otherwise the script's default language. Latin runs shorter than
+    `min_latin_words` words that sit next to another script are folded into
+    it: Indic engines read short English words fine, and stitching audio
+    word by word sounds worse than the accent difference.
+    """
+    runs: List[List] = []  # [script, chars]
+    current_script: Optional[str] = None
+    buffer: List[str] = []
+    for ch in text:
+        script = char_script(ch)
+        if script is not None and script != current_script:
+            if buffer and current_script is not None:
+                runs.append([current_script, "".join(buffer)])
+                buffer = []
+            current_script = script
+        buffer.append(ch)
+    if buffer:
+        if current_script is None and runs:
+            runs[-1][1] += "".join(buffer)
+        else:
+            runs.append([current_script, "".join(buffer)])
+
+    if min_latin_words > 0 and len(runs) > 1:
+        for i, (script, chunk) in enumerate(runs):
+            if script == "Latin" and len(chunk.split()) < min_latin_words:
+                neighbour = runs[i - 1][0] if i > 0 else runs[i + 1][0]
+                runs[i][0] = neighbour
+
+    # Adjacent runs that end up with the same language (e.g. Kana + Han for ja) are one run
+    merged: List[ScriptRun] = []
+    for script, chunk in runs:
+        language = _language_for(script, requested_language)
+        if merged and merged[-1].language == language:
+            merged[-1] = merged[-1]._replace(text=merged[-1].text + chunk)
+        else:
+            merged.append(ScriptRun(script, language, chunk))
+
+    return [run._replace(text=run.text.strip()) for run in merged if run.text.strip()]
@@ -0,0 +1,188 @@
+"""
+Cache of XTTS speaker conditioning.
+
+Cloning a voice with XTTS starts by encoding the reference recording into
+GPT conditioning latents and a speaker embedding. The high-level
+`TTS.tts()` call redoes that for every request, although the result only
+depends on the reference audio. SpeakerLatentCache keys the pair by a
+hash of the reference file's bytes (plus the conditioning parameters),
+keeps recent entries in memory and persists every entry to disk, so a
+repeated or restarted clone job skips reference encoding entirely.
+
+Every store is bounded: the memory LRU, the file-to-digest memo (per-job
+references live at fresh scratch paths) and the on-disk store, which is
+pruned least-recently-used first (disk hits refresh a file's mtime).
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+Latents = Tuple[Any, Any]  # (gpt_cond_latent, speaker_embedding) tensors
+
+
+def file_digest(path: str) -> str:
+    """sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SpeakerLatentCache:
+    """
+    Memory LRU plus an on-disk store (one .pt file per reference) of
+    conditioning latents, keyed by reference content hash.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_entries: int = 256,
+        max_disk_entries: int = 5000,
+        device: str = "cpu"
+    ):
+        self.directory = Path(directory) if directory else None
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_digests = max(4 * max_entries, 1024)
+        self.device = device
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+        self._entries: "OrderedDict[str, Latents]" = OrderedDict()
+        # (path, size, mtime) -> content digest, so unchanged files aren't re-hashed
+        self._digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key_for(self, wav_path: str, params: Optional[Dict] = None) -> str:
+        stat = os.stat(wav_path)
+        file_id = (os.path.abspath(wav_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(file_id)
+            if digest is not None:
+                self._digests.move_to_end(file_id)
+        if digest is None:
+            digest = file_digest(wav_path)
+            with self._lock:
+                self._digests[file_id] = digest
+                while len(self._digests) > self.max_digests:
+                    self._digests.popitem(last=False)
+        if params:
+            suffix = ",".join(f"{name}={params[name]}" for name in sorted(params))
+            digest = hashlib.sha256(f"{digest}:{suffix}".encode("utf-8")).hexdigest()
+        return digest
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        return self.directory / f"{key}.pt" if self.directory is not None else None
+
+    def _remember(self, key: str, latents: Latents):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = latents
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Latents]:
+        path = self._disk_path(key)
+        if path is None or not path.is_file():
+            return None
+        import torch
+        try:
+            data = torch.load(path, map_location=self.device)
+        except Exception as e:
+            print(f"[SpeakerCache] Ignoring unreadable entry {path.name}: {e}")
+            return None
+        try:
+            # mtime doubles as last use, for pruning
+            os.utime(path)
+        except OSError:
+            pass
+        return data["gpt_cond_latent"], data["speaker_embedding"]
+
+    def _save(self, key: str, latents: Latents):
+        path = self._disk_path(key)
+        if path is None:
+            return
+        import torch
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            torch.save({
+                "gpt_cond_latent": latents[0].detach().cpu(),
+                "speaker_embedding": latents[1].detach().cpu(),
+            }, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[SpeakerCache] Could not persist latents: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete the least recently used .pt files beyond max_disk_entries."""
+        if self.max_disk_entries <= 0:
+            return
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pt"):
+                try:
+                    files.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort()
+        for _, file_path in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(file_path)
+                self.disk_evictions += 1
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[Latents]:
+        with self._lock:
+            latents = self._entries.get(key)
+            if latents is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return latents
+        latents = self._load(key)
+        if latents is not None:
+            self.disk_hits += 1
+            self._remember(key, latents)
+        return latents
+
+    def put(self, key: str, latents: Latents):
+        self._remember(key, latents)
+        self._save(key, latents)
+
+    def get_or_compute(self, wav_path: str, compute: Callable[[str], Latents], params: Optional[Dict] = None) -> Latents:
+        """Latents for a reference file, encoding it only on a miss."""
+        key = self.key_for(wav_path, params)
+        latents = self.get(key)
+        if latents is None:
+            self.misses += 1
+            latents = compute(wav_path)
+            self.put(key, latents)
+        return latents
+
+    def stats(self) -> Dict:
+        hits = self.hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "disk_evictions": self.disk_evictions,
+            "hit_rate": round(hits / total, 4) if total else 0.0
+        }
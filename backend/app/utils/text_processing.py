@@ -1,6 +1,63 @@
 import re
 import unicodedata
-from typing import List
+from typing import Dict, List, Tuple
+from app.utils.verbalizer import verbalize
+
+# Punctuation that carries prosody and survives normalization
+KEEP_PUNCTUATION = ".,!?।;:\n \"'()"
+
+# Script-specific punctuation kept in addition to KEEP_PUNCTUATION
+LANGUAGE_PUNCTUATION = {
+    "hi": "॥",
+    "mr": "॥",
+    "sa": "॥",
+    "ur": "،؛؟۔",
+    "sd": "،؛؟۔",
+    "ks": "،؛؟۔",
+}
+
+# Zero-width joiners change conjunct/ligature shaping in Indic and Perso-Arabic text
+_JOINERS = "‌‍"
+
+# Marks that get a short pause (a trailing space) in preprocess()
+PAUSE_MARKS = ",;.।!?"
+
+_SENTENCE_RE = re.compile(r'[^\.।!?\n]*[\.।!?\n]+|[^\.।!?\n]+')
+_SPACE_RUN_RE = re.compile(r' {2,}')
+_PAUSE_TABLE = str.maketrans({mark: mark + " " for mark in PAUSE_MARKS})
+
+
+class _FilterTable(dict):
+    """
+    str.translate table for the noise filter.
+    
+    Codepoints are classified the first time they are seen and memoized, so
+    a table covers whatever scripts actually show up without enumerating
+    the whole Unicode range up front. With `pauses`, pause marks also map
+    to mark + space, fusing normalization and pause insertion into one pass.
+    """
+    
+    def __init__(self, keep: str, pauses: bool = False):
+        super().__init__()
+        self.keep = frozenset(keep)
+        if pauses:
+            self.update(_PAUSE_TABLE)
+    
+    def __missing__(self, codepoint: int):
+        ch = chr(codepoint)
+        if (
+            ch.isalnum()
+            or ch.isspace()
+            or ch in self.keep
+            # Vowel signs, viramas and nuktas are marks, not alphanumerics
+            or unicodedata.category(ch) in ("Mn", "Mc")
+        ):
+            value = codepoint
+        else:
+            value = None
+        self[codepoint] = value
+        return value
+
 
 class TextPreprocessor:
     """
@@ -26,6 +83,25 @@ class TextPreprocessor:
             "।": self.MEDIUM_PAUSE, # Hindi Poorna Viram
             "\n": self.LONG_PAUSE
         }
+        self._filter_tables: Dict[Tuple[str, bool], _FilterTable] = {}
+
+    def _filter_table(self, language: str, pauses: bool = False) -> _FilterTable:
+        """Character filter table, built once per language."""
+        table = self._filter_tables.get((language, pauses))
+        if table is None:
+            keep = KEEP_PUNCTUATION + _JOINERS + LANGUAGE_PUNCTUATION.get(language, "")
+            table = self._filter_tables.setdefault((language, pauses), _FilterTable(keep, pauses))
+        return table
+
+    def _clean(self, text: str, language: str, pauses: bool = False) -> str:
+        # NFKC fixes many Devanagari/Nastaliq issues
+        text = unicodedata.normalize("NFKC", text)
+        
+        # Numbers, currency, dates and abbreviations to words (before the filter drops ₹, / and %)
+        text = verbalize(text, language)
+        
+        # Remove noisy symbols but keep letters, marks, whitespace and punctuation that helps TTS
+        return text.translate(self._filter_table(language, pauses))
 
     def normalize(self, text: str, language: str = "en") -> str:
         """
@@ -34,70 +110,38 @@ class TextPreprocessor:
         if not text:
             return ""
             
-        # Unicode normalization (NFKC fixes many Devanagari/Nastaliq issues)
-        text = unicodedata.normalize('NFKC', text)
-        
-        # Remove noisy symbols but keep punctuation that helps TTS
-        # Keep alphanumeric, basic whitespace, and standard punctuation
-        text = "".join(ch for ch in text if ch.isalnum() or ch.isspace() or ch in ".,!?।;:\n \"'()")
-        
-        # Language-specific script cleanup
-        if language == "hi":
-            # Ensure correct Devanagari range or common fixes
-            pass
-        elif language == "ur":
-            # Urdu specific normalization if needed
-            pass
-            
-        return text.strip()
+        return self._clean(text, language).strip()
 
     def segment_sentences(self, text: str, language: str = "en") -> List[str]:
         """
         Language-aware sentence segmentation.
+        
+        Sentence endings include the Hindi Poorna Viram (।); each sentence
+        keeps its delimiter.
         """
         if not text:
             return []
             
-        # Define sentence endings including Hindi Poorna Viram (।)
-        # Using a regex that preserves the delimiter
-        delimiters = r'([\.।!?\n]+)'
-        parts = re.split(delimiters, text)
-        
-        sentences = []
-        for i in range(0, len(parts)-1, 2):
-            sentences.append((parts[i] + parts[i+1]).strip())
-        
-        # Handle trailing part without delimiter
-        if len(parts) % 2 != 0 and parts[-1].strip():
-            sentences.append(parts[-1].strip())
-            
-        return [s for s in sentences if s]
+        return [s for s in (m.strip() for m in _SENTENCE_RE.findall(text)) if s]
 
     def insert_intelligent_pauses(self, text: str) -> str:
         """
         Replace standard punctuation with slightly exaggerated pauses 
         to improve rhythm and reduce robotic flow.
         """
-        processed = text
         # We don't want to replace everything or we break the model's own prosody.
-        # But we can add slight spacing.
-        
-        # Ensure space after commas and full stops
-        processed = re.sub(r'([,;])', r'\1 ', processed)
-        processed = re.sub(r'([\.।!?])', r'\1  ', processed)
-        
-        # Collapse multiple spaces
-        processed = re.sub(r' +', ' ', processed)
-        
-        return processed.strip()
+        # But we can add slight spacing: a space after each pause mark,
+        # then collapse runs of spaces.
+        return _SPACE_RUN_RE.sub(" ", text.translate(_PAUSE_TABLE)).strip()
 
     def preprocess(self, text: str, language: str = "en") -> str:
         """
-        Complete preprocessing pipeline.
+        Complete preprocessing pipeline (normalization and pauses fused).
         """
-        normalized = self.normalize(text, language)
-        with_pauses = self.insert_intelligent_pauses(normalized)
-        return with_pauses
+        if not text:
+            return ""
+            
+        return _SPACE_RUN_RE.sub(" ", self._clean(text, language, pauses=True)).strip()
 
 # Singleton instance
 _preprocessor = None
@@ -0,0 +1,145 @@
+"""
+Per-stage timing for TTS jobs.
+
+The worker opens a JobTimings for each job. Code anywhere below it
+(adapters, DSP, storage) wraps its work in `stage("...")`, and the
+elapsed time is added to the active job through a context variable, so
+nothing has to be threaded through adapter signatures. Outside a job the
+spans cost a perf_counter call and record nothing.
+
+Usage in a worker:
+    timings = JobTimings().start()
+    try:
+        with stage("db"):
+            ...
+        wav_path = run_async(adapter.generate(...))   # adapter spans land here
+        job.timings = timings.as_dict()
+        timings.observe("completed")
+    finally:
+        timings.stop()
+
+Stages: db, model_load, preprocess, speaker_encode (XTTS cache misses),
+inference (sum of chunks), voice_dsp, encode, upload.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from app.utils.metrics import STAGE_SECONDS, CHUNK_INFERENCE_SECONDS, JOB_SECONDS, language_label
+
+STAGES = ("db", "model_load", "preprocess", "speaker_encode", "inference", "voice_dsp", "encode", "upload")
+
+_current_timings: contextvars.ContextVar[Optional["JobTimings"]] = contextvars.ContextVar(
+    "current_timings", default=None
+)
+
+
+class JobTimings:
+    """
+    Accumulated stage durations for one job.
+    """
+
+    def __init__(self, engine: str = "unknown", language: str = "en"):
+        self.engine = engine
+        self.language = language
+        self.stages: Dict[str, float] = {}
+        self.chunks: List[float] = []
+        self._start = time.perf_counter()
+        self._token = None
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_chunk(self, seconds: float):
+        self.chunks.append(seconds)
+        self.add("inference", seconds)
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self._start
+
+    def as_dict(self) -> Dict:
+        """JSON-serialisable form stored on the job (seconds)."""
+        return {
+            "engine": self.engine,
+            "total": round(self.total, 4),
+            "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            "chunks": [round(seconds, 4) for seconds in self.chunks],
+        }
+
+    def observe(self, status: str):
+        """Export the stages to the Prometheus histograms."""
+        language = language_label(self.language)
+        for name, seconds in self.stages.items():
+            STAGE_SECONDS.labels(stage=name, engine=self.engine, language=language).observe(seconds)
+        JOB_SECONDS.labels(engine=self.engine, language=language, status=status).observe(self.total)
+
+    def start(self) -> "JobTimings":
+        """Make this the active job for spans in the current context."""
+        self._start = time.perf_counter()
+        self._token = _current_timings.set(self)
+        return self
+
+    def stop(self):
+        if self._token is not None:
+            _current_timings.reset(self._token)
+            self._token = None
+
+    def __enter__(self) -> "JobTimings":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+
+def current_timings() -> Optional[JobTimings]:
+    return _current_timings.get()
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block and add it to the active job's `name` stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add(name, time.perf_counter() - start)
+
+
+def record_chunk(engine: str, language: str, seconds: float):
+    """Record one chunk of model inference measured by the caller."""
+    CHUNK_INFERENCE_SECONDS.labels(engine=engine, language=language_label(language)).observe(seconds)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add_chunk(seconds)
+
+
+@contextmanager
+def chunk(engine: str, language: str):
+    """Time one chunk of model inference (labelled with the engine that ran it)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_chunk(engine, language, time.perf_counter() - start)
+
+
+def timed_chunks(iterable, engine: str, language: str):
+    """
+    Iterate a streaming model's output, recording the time spent producing
+    each item as one inference chunk.
+    """
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        record_chunk(engine, language, time.perf_counter() - start)
+        yield item
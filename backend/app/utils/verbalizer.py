@@ -0,0 +1,635 @@
+"""
+Language-aware text verbalization (the normalization frontend).
+
+Turns numbers, currency amounts, dates, percentages and common
+abbreviations into words before text reaches the TTS model, so "₹1,250"
+is read as "one thousand two hundred fifty rupees" instead of being
+mangled by the noise filter. Digits from any script (Latin, Devanagari,
+Bengali, Tamil, Arabic-Indic, ...) are recognised.
+
+Each language is a Verbalizer subclass whose rules are compiled into a
+single alternation regex once per language; number words are memoized.
+English and Hindi spell numbers out; ungrouped four-digit numbers are
+read as years, dotted versions ("2.0.1") component by component, and
+English also reads clock times and decades. The other Indic languages
+(NumeralVerbalizer) have no number-word tables here, so their numbers
+are left in the digits they were written in (grouping dropped) while
+currency, percent and month names around them are spelled out. Phone
+numbers and other long or zero-led digit strings are read digit by
+digit. Languages without a registered verbalizer only get digit-grouping
+commas removed. Register new languages with `register_verbalizer`.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+# Grouped integers accept both western (1,250,000) and Indian (12,50,000)
+# grouping; anything else ("1,2,3", "10,20,30") is a list of separate numbers
+_GROUPED = r"\d{1,3}(?:,\d{3})+(?!\d)|\d{1,2}(?:,\d{2})+,\d{3}(?!\d)"
+_NUMBER = rf"(?:{_GROUPED}|\d+)(?:\.\d+)?"
+# Ungrouped runs at least this long are identifiers or phone numbers, not quantities
+LONG_DIGIT_RUN = 10
+# Phone numbers ("+91 98765 43210"), zero-led codes ("007") and long runs: read digit by digit
+_DIGIT_STRING = rf"\+\d[\d -]{{5,}}\d|0\d+(?![.,]\d)|\d{{{LONG_DIGIT_RUN},}}"
+_DATE_DMY = r"(?<!\d)\d{1,2}[/.-]\d{1,2}[/.-](?:\d{4}|\d{2})(?!\d)"
+_DATE_ISO = r"(?<!\d)\d{4}-\d{1,2}-\d{1,2}(?!\d)"
+# Version numbers and other dotted sequences ("2.0.1"); tried after dates
+_DOTTED = r"(?<![\d.])\d+(?:\.\d+){2,}(?!\.?\d)"
+# Ungrouped four-digit numbers in this range are read as years
+_YEAR = re.compile(r"\d{4}")
+YEAR_RANGE = (1100, 2099)
+_TIME_PARTS = re.compile(r"(\d+):(\d+)(?::(\d+))?\s?(.*)")
+
+
+def _parse_number(token: str) -> Tuple[int, str]:
+    """Split "1,250.75" into (1250, "75"); works with any script's digits."""
+    integer, _, fraction = token.replace(",", "").partition(".")
+    return int(integer), fraction
+
+
+class Verbalizer:
+    """
+    Base verbalizer. Subclasses provide number words and rule tables.
+    """
+
+    language: Optional[str] = None
+    months: List[str] = []
+    currencies: Dict[str, Tuple[str, str, str, str]] = {}
+    abbreviations: Dict[str, str] = {}
+    percent_word = ""
+    point_word = ""
+    # Characters other than digits, currency symbols and abbreviations a rule can start with
+    rule_starts = "+"
+
+    def __init__(self):
+        # Match the NFKC form the rest of the pipeline produces (nukta letters decompose)
+        nfkc = lambda s: unicodedata.normalize("NFKC", s)
+        self.months = [nfkc(m) for m in self.months]
+        self.currencies = {k: tuple(nfkc(w) for w in v) for k, v in self.currencies.items()}
+        self.abbreviations = {nfkc(k): nfkc(v) for k, v in self.abbreviations.items()}
+        self.percent_word = nfkc(self.percent_word)
+        self.point_word = nfkc(self.point_word)
+
+        self._currency_symbols = sorted(self.currencies, key=len, reverse=True)
+        self._handlers: Dict[str, Callable[[str], str]] = {}
+        parts = []
+        for name, pattern, handler in self.rules():
+            parts.append(f"(?P<{name}>{pattern})")
+            self._handlers[name] = handler
+        # Every rule starts with a digit, a currency symbol, an abbreviation or
+        # one of rule_starts; the lookahead lets the scanner skip other
+        # positions without trying each alternative (about 2x faster on plain prose)
+        starts = set(self.rule_starts) | {s[0] for s in self.currencies} | {a[0] for a in self.abbreviations}
+        guard = "(?=[\\d" + "".join(re.escape(c) for c in sorted(starts)) + "])"
+        self._pattern = re.compile(f"{guard}(?:{'|'.join(parts)})") if parts else None
+
+    def rules(self) -> List[Tuple[str, str, Callable[[str], str]]]:
+        """
+        (name, pattern, handler) triples, tried in order at each position.
+        """
+        rules = []
+        if self.months:
+            rules.append(("date_iso", _DATE_ISO, self._date_iso))
+            rules.append(("date_dmy", _DATE_DMY, self._date_dmy))
+        if self.currencies:
+            symbols = "|".join(re.escape(s) for s in self._currency_symbols)
+            rules.append(("currency", rf"(?<!\w)(?:{symbols})\s?{_NUMBER}", self._currency))
+        if self.percent_word:
+            rules.append(("percent", rf"{_NUMBER}\s?%", self._percent))
+        rules.append(("dotted", _DOTTED, self._dotted))
+        if self.abbreviations:
+            # Marks (e.g. Devanagari vowel signs) are not \w, so only anchor the start
+            words = "|".join(re.escape(a) for a in sorted(self.abbreviations, key=len, reverse=True))
+            rules.append(("abbreviation", rf"(?<!\w)(?:{words})", self._abbreviation))
+        rules.append(("digit_string", _DIGIT_STRING, self._digit_string))
+        rules.append(("number", _NUMBER, self._number))
+        return rules
+
+    def verbalize(self, text: str) -> str:
+        if self._pattern is None:
+            return text
+        return self._pattern.sub(self._dispatch, text)
+
+    def _dispatch(self, match: re.Match) -> str:
+        return self._handlers[match.lastgroup](match.group())
+
+    # --- Words ---
+
+    def cardinal(self, n: int) -> str:
+        return str(n)
+
+    def year(self, n: int) -> str:
+        return self.cardinal(n)
+
+    def day(self, n: int) -> str:
+        return self.cardinal(n)
+
+    def digits(self, fraction: str) -> str:
+        return " ".join(self.cardinal(int(d)) for d in fraction)
+
+    def decimal(self, integer: int, fraction: str) -> str:
+        words = self.cardinal(integer)
+        if fraction and self.point_word:
+            words += f" {self.point_word} {self.digits(fraction)}"
+        elif fraction:
+            words += "." + fraction
+        return words
+
+    # --- Handlers ---
+
+    def _number(self, token: str) -> str:
+        if not self.point_word:
+            # No number words for this language: just drop grouping commas
+            return token.replace(",", "")
+        integer, fraction = _parse_number(token)
+        if _YEAR.fullmatch(token) and YEAR_RANGE[0] <= integer <= YEAR_RANGE[1]:
+            # "in 2024" and "15/08/2024" should sound the same
+            return self.year(integer)
+        return self.decimal(integer, fraction)
+
+    def _dotted(self, token: str) -> str:
+        if not self.point_word:
+            return token
+        return f" {self.point_word} ".join(self.cardinal(int(part)) for part in token.split("."))
+
+    def _digit_string(self, token: str) -> str:
+        if not self.point_word:
+            return token
+        # Keep the caller's grouping as short pauses ("98765, 43210")
+        return ", ".join(self.digits(group) for group in re.findall(r"\d+", token))
+
+    def _percent(self, token: str) -> str:
+        return f"{self._number(token.rstrip('% '))} {self.percent_word}"
+
+    def _currency(self, token: str) -> str:
+        symbol = next(s for s in self._currency_symbols if token.startswith(s))
+        singular, plural, sub_singular, sub_plural = self.currencies[symbol]
+        integer, fraction = _parse_number(token[len(symbol):].strip())
+        words = f"{self.cardinal(integer)} {singular if integer == 1 else plural}"
+        if fraction:
+            minor = int(fraction[:2].ljust(2, "0"))
+            if minor:
+                words += self.join_currency(f"{self.cardinal(minor)} {sub_singular if minor == 1 else sub_plural}")
+        return words
+
+    def join_currency(self, minor_words: str) -> str:
+        return f" {minor_words}"
+
+    def _date_dmy(self, token: str) -> str:
+        day, month, year = (int(p) for p in re.split(r"[/.-]", token))
+        if year < 100:
+            year += 2000
+        return self.date(day, month, year) or token
+
+    def _date_iso(self, token: str) -> str:
+        year, month, day = (int(p) for p in token.split("-"))
+        return self.date(day, month, year) or token
+
+    def date(self, day: int, month: int, year: int) -> Optional[str]:
+        if not (1 <= month <= 12 and 1 <= day <= 31):
+            return None
+        return f"{self.day(day)} {self.months[month - 1]} {self.year(year)}"
+
+    def _abbreviation(self, token: str) -> str:
+        return self.abbreviations[token]
+
+
+class EnglishVerbalizer(Verbalizer):
+    language = "en"
+    months = [
+        "January", "February", "March", "April", "May", "June",
+        "July", "August", "September", "October", "November", "December"
+    ]
+    currencies = {
+        "₹": ("rupee", "rupees", "paisa", "paise"),
+        "Rs.": ("rupee", "rupees", "paisa", "paise"),
+        "Rs": ("rupee", "rupees", "paisa", "paise"),
+        "INR": ("rupee", "rupees", "paisa", "paise"),
+        "$": ("dollar", "dollars", "cent", "cents"),
+        "€": ("euro", "euros", "cent", "cents"),
+        "£": ("pound", "pounds", "penny", "pence"),
+    }
+    abbreviations = {
+        "Dr.": "Doctor",
+        "Mr.": "Mister",
+        "Mrs.": "Missus",
+        "Ms.": "Miz",
+        "Prof.": "Professor",
+        "Jr.": "Junior",
+        "Sr.": "Senior",
+        "vs.": "versus",
+        "etc.": "et cetera.",
+        "e.g.": "for example",
+        "i.e.": "that is",
+        "approx.": "approximately",
+    }
+    percent_word = "percent"
+    point_word = "point"
+    rule_starts = "+'"
+
+    ONES = [
+        "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+        "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+        "seventeen", "eighteen", "nineteen"
+    ]
+    TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+    SCALES = [(10 ** 12, "trillion"), (10 ** 9, "billion"), (10 ** 6, "million"), (1000, "thousand")]
+    ORDINAL_IRREGULAR = {
+        "one": "first", "two": "second", "three": "third", "five": "fifth",
+        "eight": "eighth", "nine": "ninth", "twelve": "twelfth"
+    }
+
+    TIME = r"(?<![\d:])(?:[01]?\d|2[0-3]):[0-5]\d(?::[0-5]\d)?(?![\d:])(?:\s?(?:[ap]\.m\.|[AaPp][Mm]\b))?"
+    DECADE = r"(?<!\w)(?:\d{2}|')?[1-9]?\d0s\b"
+
+    def rules(self):
+        # Ordinals ("21st"), clock times and decades must win over plain numbers
+        return [
+            ("ordinal", r"\d+(?:st|nd|rd|th)\b", self._ordinal),
+            ("time", self.TIME, self._time),
+            ("decade", self.DECADE, self._decade),
+        ] + super().rules()
+
+    @lru_cache(maxsize=4096)
+    def cardinal(self, n: int) -> str:
+        # Hyphens would be stripped by the noise filter, so words are space-separated
+        if n < 20:
+            return self.ONES[n]
+        if n < 100:
+            tens, ones = divmod(n, 10)
+            return self.TENS[tens] + (f" {self.ONES[ones]}" if ones else "")
+        if n < 1000:
+            hundreds, rest = divmod(n, 100)
+            return f"{self.ONES[hundreds]} hundred" + (f" {self.cardinal(rest)}" if rest else "")
+        for scale, name in self.SCALES:
+            if n >= scale:
+                head, rest = divmod(n, scale)
+                return f"{self.cardinal(head)} {name}" + (f" {self.cardinal(rest)}" if rest else "")
+        return str(n)
+
+    def ordinal(self, n: int) -> str:
+        words = self.cardinal(n)
+        head, _, last = words.rpartition(" ")
+        if last in self.ORDINAL_IRREGULAR:
+            last = self.ORDINAL_IRREGULAR[last]
+        elif last.endswith("y"):
+            last = last[:-1] + "ieth"
+        else:
+            last += "th"
+        return f"{head} {last}" if head else last
+
+    def year(self, n: int) -> str:
+        # "nineteen ninety nine", "twenty twenty four", but "two thousand five"
+        if 1100 <= n <= 2099 and not 2000 <= n <= 2009:
+            century, rest = divmod(n, 100)
+            if rest == 0:
+                return f"{self.cardinal(century)} hundred"
+            return f"{self.cardinal(century)} {'oh ' if rest < 10 else ''}{self.cardinal(rest)}"
+        return self.cardinal(n)
+
+    def day(self, n: int) -> str:
+        return self.ordinal(n)
+
+    def join_currency(self, minor_words: str) -> str:
+        return f" and {minor_words}"
+
+    def _ordinal(self, token: str) -> str:
+        return self.ordinal(int(token[:-2]))
+
+    def _time(self, token: str) -> str:
+        # "10:30 pm" -> "ten thirty p m", "9:05" -> "nine oh five", "7:00" -> "seven o'clock"
+        hours, minutes, seconds, meridiem = _TIME_PARTS.match(token).groups()
+        hours, minutes, seconds = int(hours), int(minutes), int(seconds or 0)
+        if minutes == 0:
+            words = self.cardinal(hours) + ("" if meridiem else " o'clock")
+        else:
+            words = f"{self.cardinal(hours)} {'oh ' if minutes < 10 else ''}{self.cardinal(minutes)}"
+        if seconds:
+            words += f" and {self.cardinal(seconds)} second{'' if seconds == 1 else 's'}"
+        if meridiem:
+            words += " " + " ".join(c for c in meridiem.lower() if c.isalpha())
+        return words
+
+    def _decade(self, token: str) -> str:
+        # "1990s" -> "nineteen nineties", "'80s" -> "eighties", "1900s" -> "nineteen hundreds"
+        digits = token.lstrip("'")[:-1]
+        n = int(digits)
+        words = self.year(n) if len(digits) == 4 else self.cardinal(n)
+        head, _, last = words.rpartition(" ")
+        last = last[:-1] + "ies" if last.endswith("y") else last + "s"
+        return f"{head} {last}" if head else last
+
+
+class HindiVerbalizer(Verbalizer):
+    language = "hi"
+    months = [
+        "जनवरी", "फ़रवरी", "मार्च", "अप्रैल", "मई", "जून",
+        "जुलाई", "अगस्त", "सितंबर", "अक्टूबर", "नवंबर", "दिसंबर"
+    ]
+    currencies = {
+        "₹": ("रुपया", "रुपये", "पैसा", "पैसे"),
+        "रु.": ("रुपया", "रुपये", "पैसा", "पैसे"),
+        "Rs.": ("रुपया", "रुपये", "पैसा", "पैसे"),
+        "Rs": ("रुपया", "रुपये", "पैसा", "पैसे"),
+        "$": ("डॉलर", "डॉलर", "सेंट", "सेंट"),
+        "€": ("यूरो", "यूरो", "सेंट", "सेंट"),
+        "£": ("पाउंड", "पाउंड", "पेंस", "पेंस"),
+    }
+    abbreviations = {
+        "डॉ.": "डॉक्टर",
+        "श्री.": "श्री",
+        "कि.मी.": "किलोमीटर",
+        "कि.ग्रा.": "किलोग्राम",
+        "Dr.": "डॉक्टर",
+    }
+    percent_word = "प्रतिशत"
+    point_word = "दशमलव"
+
+    # 0-99 are irregular in Hindi
+    NUMBERS = (
+        "शून्य एक दो तीन चार पाँच छह सात आठ नौ "
+        "दस ग्यारह बारह तेरह चौदह पंद्रह सोलह सत्रह अठारह उन्नीस "
+        "बीस इक्कीस बाईस तेईस चौबीस पच्चीस छब्बीस सत्ताईस अट्ठाईस उनतीस "
+        "तीस इकतीस बत्तीस तैंतीस चौंतीस पैंतीस छत्तीस सैंतीस अड़तीस उनतालीस "
+        "चालीस इकतालीस बयालीस तैंतालीस चवालीस पैंतालीस छियालीस सैंतालीस अड़तालीस उनचास "
+        "पचास इक्यावन बावन तिरेपन चौवन पचपन छप्पन सत्तावन अट्ठावन उनसठ "
+        "साठ इकसठ बासठ तिरेसठ चौंसठ पैंसठ छियासठ सड़सठ अड़सठ उनहत्तर "
+        "सत्तर इकहत्तर बहत्तर तिहत्तर चौहत्तर पचहत्तर छिहत्तर सतहत्तर अठहत्तर उन्यासी "
+        "अस्सी इक्यासी बयासी तिरासी चौरासी पचासी छियासी सत्तासी अट्ठासी नवासी "
+        "नब्बे इक्यानवे बानवे तिरानवे चौरानवे पचानवे छियानवे सत्तानवे अट्ठानवे निन्यानवे"
+    ).split()
+    # Indian numbering: crore (10^7), lakh (10^5), thousand
+    SCALES = [(10 ** 7, "करोड़"), (10 ** 5, "लाख"), (1000, "हज़ार")]
+
+    def __init__(self):
+        nfkc = lambda s: unicodedata.normalize("NFKC", s)
+        self.NUMBERS = [nfkc(w) for w in self.NUMBERS]
+        self.SCALES = [(scale, nfkc(name)) for scale, name in self.SCALES]
+        super().__init__()
+
+    @lru_cache(maxsize=4096)
+    def cardinal(self, n: int) -> str:
+        if n < 100:
+            return self.NUMBERS[n]
+        for scale, name in self.SCALES:
+            if n >= scale:
+                head, rest = divmod(n, scale)
+                return f"{self.cardinal(head)} {name}" + (f" {self.cardinal(rest)}" if rest else "")
+        hundreds, rest = divmod(n, 100)
+        return f"{self.NUMBERS[hundreds]} सौ" + (f" {self.NUMBERS[rest]}" if rest else "")
+
+    def year(self, n: int) -> str:
+        # 1999 is read "उन्नीस सौ निन्यानवे", not "एक हज़ार नौ सौ ..."
+        if 1100 <= n <= 1999:
+            century, rest = divmod(n, 100)
+            return f"{self.NUMBERS[century]} सौ" + (f" {self.NUMBERS[rest]}" if rest else "")
+        return self.cardinal(n)
+
+
+class NumeralVerbalizer(Verbalizer):
+    """
+    Languages without number-word tables here. Numbers are left in the
+    digits they were written in (grouping commas dropped) for the model to
+    read as-is; currency, percent and month names around them are spelled
+    out. Values that have to be re-rendered (dates, currency minor units)
+    use the same digits as the source token.
+    """
+
+    def _number(self, token: str) -> str:
+        # The pause pass would split "3.14" at the dot, so the point is spoken
+        integer, _, fraction = token.replace(",", "").partition(".")
+        return f"{integer} {self.point_word} {' '.join(fraction)}" if fraction else integer
+
+    def _digit_string(self, token: str) -> str:
+        return token
+
+    def _dotted(self, token: str) -> str:
+        return f" {self.point_word} ".join(token.split("."))
+
+    def _currency(self, token: str) -> str:
+        symbol = next(s for s in self._currency_symbols if token.startswith(s))
+        singular, plural, sub_singular, sub_plural = self.currencies[symbol]
+        amount = token[len(symbol):].strip().replace(",", "")
+        integer, _, fraction = amount.partition(".")
+        words = f"{integer} {singular if int(integer) == 1 else plural}"
+        if fraction:
+            minor = int(fraction[:2]) * (10 if len(fraction) == 1 else 1)
+            if minor:
+                words += f" {_numeral(minor, amount)} {sub_singular if minor == 1 else sub_plural}"
+        return words
+
+    def _date_dmy(self, token: str) -> str:
+        day, month, year = (int(p) for p in re.split(r"[/.-]", token))
+        return self.numeral_date(day, month, year, token)
+
+    def _date_iso(self, token: str) -> str:
+        year, month, day = (int(p) for p in token.split("-"))
+        return self.numeral_date(day, month, year, token)
+
+    def numeral_date(self, day: int, month: int, year: int, token: str) -> str:
+        if not (1 <= month <= 12 and 1 <= day <= 31):
+            return token
+        year_token = re.split(r"[/.-]", token)[0 if token[4:5] == "-" else 2]
+        return f"{_numeral(day, token)} {self.months[month - 1]} {year_token}"
+
+
+def _numeral(n: int, like: str) -> str:
+    """Write `n` in the digits of the first digit found in `like`."""
+    for ch in like:
+        if ch.isdigit():
+            zero = ord(ch) - unicodedata.digit(ch)
+            return "".join(chr(zero + int(d)) for d in str(n))
+    return str(n)
+
+
+def _rupee(singular: str, plural: str, sub_singular: str, sub_plural: str) -> Dict[str, Tuple[str, str, str, str]]:
+    words = (singular, plural, sub_singular, sub_plural)
+    return {"₹": words, "Rs.": words, "Rs": words, "INR": words}
+
+
+class BengaliVerbalizer(NumeralVerbalizer):
+    language = "bn"
+    months = [
+        "জানুয়ারি", "ফেব্রুয়ারি", "মার্চ", "এপ্রিল", "মে", "জুন",
+        "জুলাই", "আগস্ট", "সেপ্টেম্বর", "অক্টোবর", "নভেম্বর", "ডিসেম্বর"
+    ]
+    currencies = _rupee("টাকা", "টাকা", "পয়সা", "পয়সা")
+    percent_word = "শতাংশ"
+    point_word = "দশমিক"
+
+
+class AssameseVerbalizer(NumeralVerbalizer):
+    language = "as"
+    months = [
+        "জানুৱাৰী", "ফেব্ৰুৱাৰী", "মাৰ্চ", "এপ্ৰিল", "মে", "জুন",
+        "জুলাই", "আগষ্ট", "ছেপ্তেম্বৰ", "অক্টোবৰ", "নৱেম্বৰ", "ডিচেম্বৰ"
+    ]
+    currencies = _rupee("টকা", "টকা", "পইচা", "পইচা")
+    percent_word = "শতাংশ"
+    point_word = "দশমিক"
+
+
+class MarathiVerbalizer(NumeralVerbalizer):
+    language = "mr"
+    months = [
+        "जानेवारी", "फेब्रुवारी", "मार्च", "एप्रिल", "मे", "जून",
+        "जुलै", "ऑगस्ट", "सप्टेंबर", "ऑक्टोबर", "नोव्हेंबर", "डिसेंबर"
+    ]
+    currencies = dict(_rupee("रुपया", "रुपये", "पैसा", "पैसे"), **{"रु.": ("रुपया", "रुपये", "पैसा", "पैसे")})
+    percent_word = "टक्के"
+    point_word = "दशांश"
+
+
+class NepaliVerbalizer(NumeralVerbalizer):
+    language = "ne"
+    months = [
+        "जनवरी", "फेब्रुअरी", "मार्च", "अप्रिल", "मे", "जुन",
+        "जुलाई", "अगस्ट", "सेप्टेम्बर", "अक्टोबर", "नोभेम्बर", "डिसेम्बर"
+    ]
+    currencies = dict(_rupee("रुपैयाँ", "रुपैयाँ", "पैसा", "पैसा"), **{"रु.": ("रुपैयाँ", "रुपैयाँ", "पैसा", "पैसा")})
+    percent_word = "प्रतिशत"
+    point_word = "दशमलव"
+
+
+class SanskritVerbalizer(NumeralVerbalizer):
+    language = "sa"
+    months = HindiVerbalizer.months
+    currencies = _rupee("रूप्यकम्", "रूप्यकाणि", "पैसा", "पैसाः")
+    percent_word = "प्रतिशतम्"
+    point_word = "दशमलव"
+
+
+class GujaratiVerbalizer(NumeralVerbalizer):
+    language = "gu"
+    months = [
+        "જાન્યુઆરી", "ફેબ્રુઆરી", "માર્ચ", "એપ્રિલ", "મે", "જૂન",
+        "જુલાઈ", "ઑગસ્ટ", "સપ્ટેમ્બર", "ઑક્ટોબર", "નવેમ્બર", "ડિસેમ્બર"
+    ]
+    currencies = _rupee("રૂપિયો", "રૂપિયા", "પૈસો", "પૈસા")
+    percent_word = "ટકા"
+    point_word = "દશાંશ"
+
+
+class PunjabiVerbalizer(NumeralVerbalizer):
+    language = "pa"
+    months = [
+        "ਜਨਵਰੀ", "ਫ਼ਰਵਰੀ", "ਮਾਰਚ", "ਅਪ੍ਰੈਲ", "ਮਈ", "ਜੂਨ",
+        "ਜੁਲਾਈ", "ਅਗਸਤ", "ਸਤੰਬਰ", "ਅਕਤੂਬਰ", "ਨਵੰਬਰ", "ਦਸੰਬਰ"
+    ]
+    currencies = _rupee("ਰੁਪਇਆ", "ਰੁਪਏ", "ਪੈਸਾ", "ਪੈਸੇ")
+    percent_word = "ਪ੍ਰਤੀਸ਼ਤ"
+    point_word = "ਦਸ਼ਮਲਵ"
+
+
+class OdiaVerbalizer(NumeralVerbalizer):
+    language = "or"
+    months = [
+        "ଜାନୁଆରୀ", "ଫେବୃଆରୀ", "ମାର୍ଚ୍ଚ", "ଅପ୍ରେଲ", "ମେ", "ଜୁନ",
+        "ଜୁଲାଇ", "ଅଗଷ୍ଟ", "ସେପ୍ଟେମ୍ବର", "ଅକ୍ଟୋବର", "ନଭେମ୍ବର", "ଡିସେମ୍ବର"
+    ]
+    currencies = _rupee("ଟଙ୍କା", "ଟଙ୍କା", "ପଇସା", "ପଇସା")
+    percent_word = "ପ୍ରତିଶତ"
+    point_word = "ଦଶମିକ"
+
+
+class TamilVerbalizer(NumeralVerbalizer):
+    language = "ta"
+    months = [
+        "ஜனவரி", "பிப்ரவரி", "மார்ச்", "ஏப்ரல்", "மே", "ஜூன்",
+        "ஜூலை", "ஆகஸ்ட்", "செப்டம்பர்", "அக்டோபர்", "நவம்பர்", "டிசம்பர்"
+    ]
+    currencies = _rupee("ரூபாய்", "ரூபாய்", "பைசா", "பைசா")
+    percent_word = "சதவீதம்"
+    point_word = "புள்ளி"
+
+
+class TeluguVerbalizer(NumeralVerbalizer):
+    language = "te"
+    months = [
+        "జనవరి", "ఫిబ్రవరి", "మార్చి", "ఏప్రిల్", "మే", "జూన్",
+        "జూలై", "ఆగస్టు", "సెప్టెంబర్", "అక్టోబర్", "నవంబర్", "డిసెంబర్"
+    ]
+    currencies = _rupee("రూపాయి", "రూపాయలు", "పైసా", "పైసలు")
+    percent_word = "శాతం"
+    point_word = "దశాంశం"
+
+
+class KannadaVerbalizer(NumeralVerbalizer):
+    language = "kn"
+    months = [
+        "ಜನವರಿ", "ಫೆಬ್ರವರಿ", "ಮಾರ್ಚ್", "ಏಪ್ರಿಲ್", "ಮೇ", "ಜೂನ್",
+        "ಜುಲೈ", "ಆಗಸ್ಟ್", "ಸೆಪ್ಟೆಂಬರ್", "ಅಕ್ಟೋಬರ್", "ನವೆಂಬರ್", "ಡಿಸೆಂಬರ್"
+    ]
+    currencies = _rupee("ರೂಪಾಯಿ", "ರೂಪಾಯಿ", "ಪೈಸೆ", "ಪೈಸೆ")
+    percent_word = "ಶೇಕಡಾ"
+    point_word = "ದಶಮಾಂಶ"
+
+
+class MalayalamVerbalizer(NumeralVerbalizer):
+    language = "ml"
+    months = [
+        "ജനുവരി", "ഫെബ്രുവരി", "മാർച്ച്", "ഏപ്രിൽ", "മേയ്", "ജൂൺ",
+        "ജൂലൈ", "ഓഗസ്റ്റ്", "സെപ്റ്റംബർ", "ഒക്ടോബർ", "നവംബർ", "ഡിസംബർ"
+    ]
+    currencies = _rupee("രൂപ", "രൂപ", "പൈസ", "പൈസ")
+    percent_word = "ശതമാനം"
+    point_word = "ദശാംശം"
+
+
+class UrduVerbalizer(NumeralVerbalizer):
+    language = "ur"
+    months = [
+        "جنوری", "فروری", "مارچ", "اپریل", "مئی", "جون",
+        "جولائی", "اگست", "ستمبر", "اکتوبر", "نومبر", "دسمبر"
+    ]
+    currencies = _rupee("روپیہ", "روپے", "پیسہ", "پیسے")
+    percent_word = "فیصد"
+    point_word = "اعشاریہ"
+
+
+VERBALIZERS: Dict[str, Type[Verbalizer]] = {
+    "en": EnglishVerbalizer,
+    "hi": HindiVerbalizer,
+    "bn": BengaliVerbalizer,
+    "as": AssameseVerbalizer,
+    "mr": MarathiVerbalizer,
+    "ne": NepaliVerbalizer,
+    "sa": SanskritVerbalizer,
+    "gu": GujaratiVerbalizer,
+    "pa": PunjabiVerbalizer,
+    "or": OdiaVerbalizer,
+    "ta": TamilVerbalizer,
+    "te": TeluguVerbalizer,
+    "kn": KannadaVerbalizer,
+    "ml": MalayalamVerbalizer,
+    "ur": UrduVerbalizer,
+    # Same script, so the same rupee words and month names read correctly
+    "ks": UrduVerbalizer,
+    "sd": UrduVerbalizer,
+    "mni": BengaliVerbalizer,
+}
+
+_instances: Dict[str, Verbalizer] = {}
+
+
+def register_verbalizer(language: str, verbalizer_cls: Type[Verbalizer]):
+    """Register (or replace) the verbalizer used for a language code."""
+    VERBALIZERS[language] = verbalizer_cls
+    _instances.pop(language, None)
+
+
+def get_verbalizer(language: str) -> Verbalizer:
+    """
+    Get the (cached) verbalizer for a language; rules compile on first use.
+    """
+    verbalizer = _instances.get(language)
+    if verbalizer is None:
+        verbalizer = _instances.setdefault(language, VERBALIZERS.get(language, Verbalizer)())
+    return verbalizer
+
+
+def verbalize(text: str, language: str = "en") -> str:
+    """Verbalize numbers, currency, dates and abbreviations in `text`."""
+    return get_verbalizer(language).verbalize(text)
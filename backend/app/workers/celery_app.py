@@ -27,5 +27,8 @@ celery_app.conf.update(
 
 # Priority queue configuration
 celery_app.conf.task_routes = {
-    "app.workers.tts_worker.process_tts_job": {"queue": "tts_queue"}
+    "app.workers.tts_worker.process_tts_job": {"queue": "tts_queue"},
+    "app.workers.tts_worker.precompute_voice_latents": {"queue": "tts_queue"},
+    "app.workers.tts_worker.drop_stream_segments": {"queue": "tts_queue"},
+    "app.workers.tts_worker.render_voice_previews": {"queue": "tts_queue"}
 }
@@ -1,9 +1,19 @@
 from sqlalchemy.orm import Session
 from uuid import UUID
 import os
+import asyncio
+import threading
+from datetime import datetime
+from typing import Optional
 from pathlib import Path
 # from pydub import AudioSegment
 from app.models import get_db, TTSJob, User
+from app.utils.scratch import job_scratch
+from app.utils.audio_encoding import mp3_stream
+from app.utils.timing import JobTimings, stage
+from app.utils.metrics import JOBS, JOBS_IN_PROGRESS, QUEUE_DEPTH
+from app.utils.profiling import GenerateProfiler, profile_key
+from app.services.coalescing_service import CoalescingService
 
 # Celery Availability Check
 CELERY_AVAILABLE = False
@@ -16,7 +26,128 @@ except Exception as e:
     print(f"[CELERY] Background worker queue (Redis) not available: {e}")
     celery_app = None
 
-from app.adapters.tts.factory import INDIAN_LANGUAGES, normalize_language
+
+# One event loop per worker thread, reused across jobs.
+# asyncio.run() would create and tear down a fresh loop for every call.
+_thread_state = threading.local()
+
+
+def run_async(coro):
+    """Run a coroutine to completion on this thread's persistent event loop."""
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+    return loop.run_until_complete(coro)
+
+
+def _adapter_and_speaker(db: Session, job: TTSJob):
+    """
+    TTS adapter and speaker reference for a job. Saved voice profiles are
+    XTTS clones of their stored reference; other voices route by language.
+    """
+    from app.adapters.tts.factory import get_tts_adapter
+    from app.services.voice_profile_service import VoiceProfileService
+    
+    profile = VoiceProfileService.get_for_job(db, job)
+    if profile is None:
+        return get_tts_adapter(language=job.language or "en", text=job.text), job.speaker_wav_url
+    
+    from app.adapters.tts.xtts_v2 import get_xtts_adapter
+    return get_xtts_adapter(), run_async(VoiceProfileService.reference_path(profile))
+
+
+def _generate(db: Session, job: TTSJob, tts_adapter, storage, **kwargs) -> str:
+    """
+    Run adapter.generate for a job. Adapters that stream (XTTS cloned
+    voices) publish audio segments while they synthesize; each one is
+    stored and listed on the job so clients can start playback early.
+    """
+    supports_streaming = getattr(tts_adapter, "supports_streaming", None)
+    if supports_streaming is None or not supports_streaming(kwargs.get("speaker_wav_path")):
+        return run_async(tts_adapter.generate(**kwargs))
+    
+    async def publish_segment(segment_path: str, index: int):
+        with stage("upload"):
+            url = await storage.upload_file(segment_path, f"audio/{job.user_id}/{job.id}/part-{index:04d}.wav", move=True)
+        with stage("db"):
+            job.stream_segments = (job.stream_segments or []) + [url]
+            db.commit()
+        print(f"[WORKER] Job {job.id}: published segment {index}")
+    
+    return run_async(tts_adapter.generate(**kwargs, on_segment=publish_segment))
+
+
+def _drop_segments(db: Session, job: TTSJob):
+    """
+    Delete a finished job's streamed segments: the full audio replaces
+    them on success, and a failed job has nothing to play.
+    """
+    if not job.stream_segments:
+        return
+    from app.adapters.storage.local import get_storage_adapter
+    from app.utils.audio_urls import key_from_audio_url
+    storage = get_storage_adapter()
+    for url in job.stream_segments:
+        key = key_from_audio_url(url)
+        if key:
+            try:
+                run_async(storage.delete_file(key))
+            except Exception as e:
+                print(f"[WORKER] Could not delete segment {key}: {e}")
+    job.stream_segments = None
+    db.commit()
+
+
+def _drop_segments_by_id(job_id: str):
+    """Drop a job's streamed segments in a fresh session (delayed cleanup)."""
+    db = next(get_db())
+    try:
+        job = db.query(TTSJob).filter(TTSJob.id == UUID(job_id)).first()
+        if job is not None:
+            _drop_segments(db, job)
+    except Exception as e:
+        print(f"[WORKER] Could not drop segments of job {job_id}: {e}")
+    finally:
+        db.close()
+
+
+def _schedule_segment_drop(job: TTSJob):
+    """
+    Drop a finished job's streamed segments after XTTS_SEGMENT_GRACE_SECONDS,
+    so a client still playing them progressively doesn't hit 404s when the
+    full audio lands. Runs as a delayed Celery task when the broker is
+    reachable, else on a timer in this process; segments a restart leaves
+    behind are removed with the job's audio by retention.
+    """
+    if not job.stream_segments:
+        return
+    from app.config import get_settings
+    job_id = str(job.id)
+    grace = max(0, get_settings().XTTS_SEGMENT_GRACE_SECONDS)
+    if CELERY_AVAILABLE:
+        from app.utils.redis_client import redis_health
+        if redis_health.is_healthy():
+            try:
+                drop_stream_segments.apply_async(args=[job_id], countdown=grace)
+                return
+            except Exception as e:
+                print(f"[WORKER] Could not schedule segment cleanup for {job_id} in Celery: {e}")
+    timer = threading.Timer(grace, _drop_segments_by_id, args=[job_id])
+    timer.daemon = True
+    timer.start()
+
+
+def _precompute_voice_latents_sync(profile_id: str):
+    """Precompute a voice profile's conditioning latents (background task)."""
+    from app.services.voice_profile_service import VoiceProfileService
+    db = next(get_db())
+    try:
+        run_async(VoiceProfileService.precompute_latents(db, UUID(profile_id)))
+    except Exception as e:
+        print(f"[VoiceProfile] Precomputing latents for {profile_id} failed: {e}")
+    finally:
+        db.close()
 
 
 # Use a dummy Task if celery not available
@@ -53,91 +184,107 @@ if CELERY_AVAILABLE:
         1. Get job from database
         2. Update status to 'processing'
         3. Generate audio using XTTS adapter
-        4. Convert WAV to MP3
-        5. Upload to storage
+        4. Convert WAV to MP3, streamed straight into storage
+        5. (WAV fallback) Upload the WAV to storage
         6. Update job with audio URL
         7. Deduct user quota
         """
         db = self.db
         
+        # Per-job scratch directory for WAV/MP3 intermediates
+        scratch = job_scratch(job_id)
+        # Per-stage spans, stored on the job and exported to Prometheus
+        timings = JobTimings().start()
+        in_progress = False
+        job = None
+        
         try:
             # Lazy imports to prevent circularity and startup hangs
             from app.services.tts_service import TTSService
             from app.services.user_service import UserService
-            from app.adapters.tts.factory import get_tts_adapter
             from app.adapters.storage.local import get_storage_adapter
             
             # Get job
-            job = db.query(TTSJob).filter(TTSJob.id == UUID(job_id)).first()
+            with stage("db"):
+                job = db.query(TTSJob).filter(TTSJob.id == UUID(job_id)).first()
             if not job:
                 print(f"[ASYNC WORKER] Job {job_id} not found in database")
                 raise ValueError(f"Job {job_id} not found")
             
             print(f"[ASYNC WORKER] Starting job {job_id} for language: {job.language}")
-            TTSService.update_job_status(db, UUID(job_id), "processing")
+            with stage("db"):
+                TTSService.update_job_status(db, UUID(job_id), "processing")
+            JOBS.labels(status="processing").inc()
+            JOBS_IN_PROGRESS.inc()
+            in_progress = True
             
             # Get TTS adapter with language to use preloaded instance
-            tts_adapter = get_tts_adapter(language=job.language)
-            
-            # Generate audio
-            import asyncio
-            wav_path = asyncio.run(tts_adapter.generate(
-                text=job.text,
-                voice_id=job.voice_id,
-                language=job.language,
-                voice_age=job.voice_age,
-                prosody_preset=job.prosody_preset,
-                speaker_wav_path=job.speaker_wav_url,
-                settings=job.settings
-            ))
-            print(f"[ASYNC WORKER] Audio generation complete: {wav_path}")
+            with stage("model_load"):
+                tts_adapter, speaker_wav_path = _adapter_and_speaker(db, job)
+            timings.engine = tts_adapter.engine_name
+            timings.language = job.language or "en"
             
-            # Optional: Convert WAV to MP3 for smaller file size
-            # Requires FFmpeg
-            final_path = wav_path
-            final_ext = "wav"
-            
-            try:
-                print(f"[ASYNC WORKER] Attempting MP3 conversion for {wav_path}...")
-                from pydub import AudioSegment
-                mp3_path = wav_path.replace(".wav", ".mp3")
-                audio = AudioSegment.from_wav(wav_path)
-                audio.export(mp3_path, format="mp3", bitrate="128k")
-                final_path = mp3_path
-                final_ext = "mp3"
-                print(f"[ASYNC WORKER] Conversion successful: {mp3_path}")
-                # Cleanup WAV after conversion
-                if os.path.exists(wav_path):
-                    os.remove(wav_path)
-            except Exception as conv_err:
-                print(f"[ASYNC WORKER] MP3 conversion failed (likely missing FFmpeg): {conv_err}")
-                print(f"[ASYNC WORKER] Falling back to WAV.")
-                final_path = wav_path
-                final_ext = "wav"
-            
-            # Upload to storage
             storage = get_storage_adapter()
-            audio_url = asyncio.run(storage.upload_file(
-                final_path,
-                f"audio/{job.user_id}/{job.id}.{final_ext}"
-            ))
             
-            # Update job
-            TTSService.update_job_status(
-                db,
-                UUID(job_id),
-                "completed",
-                audio_url=audio_url
-            )
+            # Generate audio (profiled when this job is selected for profiling)
+            profiler = GenerateProfiler()
+            with profiler:
+                wav_path = _generate(
+                    db, job, tts_adapter, storage,
+                    text=job.text,
+                    voice_id=job.voice_id,
+                    language=job.language,
+                    voice_age=job.voice_age,
+                    prosody_preset=job.prosody_preset,
+                    speaker_wav_path=speaker_wav_path,
+                    settings=job.settings
+                )
+            print(f"[ASYNC WORKER] Audio generation complete: {wav_path}")
+            profile_path = profiler.save()
             
-            # Deduct user quota
-            user = db.query(User).filter(User.id == job.user_id).first()
-            if user:
-                UserService.deduct_quota(db, user, job.character_count)
+            # Convert WAV to MP3 for smaller file size (requires FFmpeg). The
+            # encoder's output is uploaded as it is produced (multipart on S3),
+            # so no MP3 file is written; encoding is timed as part of upload.
+            with stage("upload"):
+                try:
+                    print(f"[ASYNC WORKER] Streaming MP3 conversion of {wav_path} to storage...")
+                    audio_url = run_async(storage.upload_stream(
+                        mp3_stream(wav_path),
+                        f"audio/{job.user_id}/{job.id}.mp3"
+                    ))
+                    print(f"[ASYNC WORKER] Conversion successful: {audio_url}")
+                    if os.path.exists(wav_path):
+                        os.remove(wav_path)
+                except Exception as conv_err:
+                    print(f"[ASYNC WORKER] MP3 conversion failed (likely missing FFmpeg): {conv_err}")
+                    print(f"[ASYNC WORKER] Falling back to WAV.")
+                    audio_url = run_async(storage.upload_file(
+                        wav_path,
+                        f"audio/{job.user_id}/{job.id}.wav",
+                        move=True
+                    ))
+                if profile_path:
+                    key = profile_key(job.user_id, job.id, profile_path.suffix)
+                    run_async(storage.upload_file(str(profile_path), key, move=True))
+                    job.profile_key = key
             
-            # Cleanup final file if stored locally
-            if os.path.exists(final_path) and audio_url.startswith("http"):
-                os.remove(final_path)
+            # Update job
+            with stage("db"):
+                TTSService.update_job_status(
+                    db,
+                    UUID(job_id),
+                    "completed",
+                    audio_url=audio_url,
+                    timings=timings.as_dict()
+                )
+                
+                # Deduct user quota
+                user = db.query(User).filter(User.id == job.user_id).first()
+                if user:
+                    UserService.deduct_quota(db, user, job.character_count)
+            timings.observe("completed")
+            JOBS.labels(status="completed").inc()
+            _schedule_segment_drop(job)
             
             print(f"[ASYNC WORKER] Job {job_id} completed successfully! URL: {audio_url}")
             return {"status": "completed", "audio_url": audio_url}
@@ -148,26 +295,73 @@ if CELERY_AVAILABLE:
                 db,
                 UUID(job_id),
                 "failed",
-                error_message=str(e)
+                error_message=str(e),
+                timings=timings.as_dict()
             )
+            timings.observe("failed")
+            JOBS.labels(status="failed").inc()
+            if job is not None:
+                _schedule_segment_drop(job)
             raise
+        finally:
+            if in_progress:
+                JOBS_IN_PROGRESS.dec()
+            timings.stop()
+            # Identical jobs that attached to this one finish with it
+            if job is not None:
+                run_async(CoalescingService.resolve_followers(db, job))
+            # Removes anything the adapter or MP3 conversion left behind
+            scratch.cleanup()
+    
+    @celery_app.task(name="app.workers.tts_worker.precompute_voice_latents")
+    def precompute_voice_latents(profile_id: str):
+        """Encode a new voice profile's reference on a worker that has XTTS loaded."""
+        _precompute_voice_latents_sync(profile_id)
+    
+    @celery_app.task(name="app.workers.tts_worker.drop_stream_segments")
+    def drop_stream_segments(job_id: str):
+        """Delete a finished job's streamed segments once their grace period is over."""
+        _drop_segments_by_id(job_id)
+    
+    @celery_app.task(name="app.workers.tts_worker.render_voice_previews", time_limit=3600)
+    def render_voice_previews(force: bool = False):
+        """Render missing voice previews on a worker (keeps every engine out of the API process)."""
+        from app.services.voice_preview_service import VoicePreviewService
+        return run_async(VoicePreviewService.render_all(force=force))
 else:
     # Dummy function when Celery is not available
     def process_tts_job(job_id: str):
         print(f"Celery not available, cannot queue job {job_id}")
+    
+    def precompute_voice_latents(profile_id: str):
+        print(f"Celery not available, cannot queue latents for {profile_id}")
+    
+    def drop_stream_segments(job_id: str):
+        print(f"Celery not available, cannot queue segment cleanup for {job_id}")
+    
+    def render_voice_previews(force: bool = False):
+        print("Celery not available, cannot queue voice previews")
 
 
 # Synchronous version for bypassing Redis/Celery
-def _process_tts_job_sync(job_id_str: str):
+def _process_tts_job_sync(job_id_str: str, queued_priority: Optional[str] = None):
     """
     Process TTS job synchronously without Celery.
     Runs in a separate thread via FastAPI BackgroundTasks to avoid blocking the event loop.
+    
+    queued_priority is the QUEUE_DEPTH tier the dispatcher counted the job
+    under; it is released first, whatever happens to the job.
     """
-    import asyncio
+    if queued_priority is not None:
+        QUEUE_DEPTH.labels(priority=queued_priority).dec()
     db = next(get_db())
+    # Per-stage spans, stored on the job and exported to Prometheus
+    timings = JobTimings().start()
+    job = None
     try:
         job_id = UUID(job_id_str)
-        job = db.query(TTSJob).filter(TTSJob.id == job_id).first()
+        with stage("db"):
+            job = db.query(TTSJob).filter(TTSJob.id == job_id).first()
         
         if not job:
             print(f"[SYNC WORKER] Job {job_id_str} not found")
@@ -176,64 +370,89 @@ def _process_tts_job_sync(job_id_str: str):
         # --- DEVELOPMENT BYPASS: ALLOW INDIC TTS IN SYNC PATH ---
         from app.config import get_settings
         settings = get_settings()
-        lang = normalize_language(job.language)
-        if lang in INDIAN_LANGUAGES and settings.ENVIRONMENT != "development":
+        # Mixed-script text may route runs to the Indic engine regardless of job.language
+        from app.adapters.tts.factory import indic_language_for
+        lang = indic_language_for(job.text, job.language)
+        if lang is not None and settings.ENVIRONMENT != "development":
             error_msg = f"CRITICAL: Indic TTS ({lang}) is NOT allowed in synchronous path in production. Must use Celery."
             print(f"[SYNC WORKER] Access Denied: {error_msg}")
             job.status = "failed"
             job.error_message = error_msg
             db.commit()
+            JOBS.labels(status="failed").inc()
             return
         # ----------------------------------------------------
         
-        user = db.query(User).filter(User.id == job.user_id).first()
+        with stage("db"):
+            user = db.query(User).filter(User.id == job.user_id).first()
         if not user:
             job.status = "failed"
             job.error_message = "User not found"
             db.commit()
+            JOBS.labels(status="failed").inc()
             return
         
-        job.status = "processing"
-        db.commit()
+        with stage("db"):
+            job.status = "processing"
+            job.started_at = datetime.utcnow()
+            db.commit()
+        JOBS.labels(status="processing").inc()
+        JOBS_IN_PROGRESS.inc()
+        
+        # Per-job scratch directory, removed on success and failure alike
+        scratch = job_scratch(job_id_str)
         
         try:
             # Lazy imports for sync path too
-            from app.adapters.tts.factory import get_tts_adapter
             from app.adapters.storage.local import get_storage_adapter
             from app.services.user_service import UserService
             
-            # Generate audio using TTS adapter
-            tts_adapter = get_tts_adapter(language=job.language or "en")
-            
-            # Handle voice cloning URL if present
-            speaker_wav_path = job.speaker_wav_url
+            # Generate audio using TTS adapter (voice profiles bring their own reference)
+            with stage("model_load"):
+                tts_adapter, speaker_wav_path = _adapter_and_speaker(db, job)
+            timings.engine = tts_adapter.engine_name
+            timings.language = job.language or "en"
             
             print(f"[SYNC WORKER] Starting generation for {job_id_str}...")
-            # Use asyncio.run because generate() is async but we are in a thread
-            wav_path = asyncio.run(tts_adapter.generate(
-                text=job.text,
-                voice_id=job.voice_id,
-                language=job.language or "en",
-                voice_age=job.voice_age,
-                prosody_preset=job.prosody_preset,
-                speaker_wav_path=speaker_wav_path,
-                settings=job.settings or {}
-            ))
+            storage = get_storage_adapter()
+            # generate() is async but we are in a thread: run it on this thread's loop
+            profiler = GenerateProfiler()
+            with profiler:
+                wav_path = _generate(
+                    db, job, tts_adapter, storage,
+                    text=job.text,
+                    voice_id=job.voice_id,
+                    language=job.language or "en",
+                    voice_age=job.voice_age,
+                    prosody_preset=job.prosody_preset,
+                    speaker_wav_path=speaker_wav_path,
+                    settings=job.settings or {}
+                )
             print(f"[SYNC WORKER] WAV generated: {wav_path}")
+            profile_path = profiler.save()
             
             # Upload to storage
             print(f"[SYNC WORKER] Uploading to storage: {wav_path}")
-            storage = get_storage_adapter()
-            audio_url = asyncio.run(storage.upload_file(
-                wav_path,
-                f"audio/{job.user_id}/{job_id}.wav"
-            ))
+            with stage("upload"):
+                audio_url = run_async(storage.upload_file(
+                    wav_path,
+                    f"audio/{job.user_id}/{job_id}.wav",
+                    move=True
+                ))
+                if profile_path:
+                    key = profile_key(job.user_id, job_id, profile_path.suffix)
+                    run_async(storage.upload_file(str(profile_path), key, move=True))
+                    job.profile_key = key
             print(f"[SYNC WORKER] Audio uploaded: {audio_url}")
             
             # Update job
-            job.status = "completed"
-            job.audio_url = audio_url
-            db.commit()
+            with stage("db"):
+                job.status = "completed"
+                job.audio_url = audio_url
+                job.completed_at = datetime.utcnow()
+                job.timings = timings.as_dict()
+                db.commit()
+            _schedule_segment_drop(job)
             
         except Exception as e:
             print(f"[SYNC WORKER] ERROR: {e}")
@@ -241,12 +460,24 @@ def _process_tts_job_sync(job_id_str: str):
             traceback.print_exc()
             job.status = "failed"
             job.error_message = str(e)
+            job.completed_at = datetime.utcnow()
+            job.timings = timings.as_dict()
             db.commit()
+            _schedule_segment_drop(job)
         finally:
+            scratch.cleanup()
             if job.character_count:
                 try:
-                    UserService.deduct_quota(db, user, job.character_count)
+                    with stage("db"):
+                        UserService.deduct_quota(db, user, job.character_count)
                 except Exception as q_err:
                     print(f"[SYNC WORKER] Error deducting quota: {q_err}")
+            timings.observe(job.status)
+            JOBS.labels(status=job.status).inc()
+            JOBS_IN_PROGRESS.dec()
     finally:
+        timings.stop()
+        # Identical jobs that attached to this one finish with it
+        if job is not None:
+            run_async(CoalescingService.resolve_followers(db, job))
         db.close()
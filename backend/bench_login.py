@@ -0,0 +1,78 @@
+"""
+Login throughput benchmark.
+
+Compares bcrypt verification run inline on the event loop (old behaviour)
+with the dedicated hashing pool, reporting logins/sec and the worst
+event-loop stall seen by a concurrent ticker (what TTS polling would feel).
+
+Usage:
+    python bench_login.py [--logins 48] [--rounds 12]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+os.environ.setdefault("SECRET_KEY", "bench-login")
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+async def ticker(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Sleep in a loop and record the worst overshoot (event-loop lag)."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run(label: str, verify, logins: int):
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(ticker(stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(verify() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    worst_lag = await lag_task
+    print(f"{label:<8} {logins / elapsed:8.1f} logins/s   total {elapsed:6.2f}s   worst loop stall {worst_lag * 1000:8.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark login password verification")
+    parser.add_argument("--logins", type=int, default=48, help="Concurrent logins per run")
+    parser.add_argument("--rounds", type=int, default=None, help="bcrypt cost factor (default: BCRYPT_ROUNDS)")
+    args = parser.parse_args()
+
+    if args.rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+
+    from app.auth.jwt import get_password_hash, verify_password, settings
+    from app.auth.hashing import verify_password_async, get_password_pool_stats
+
+    password = "correct horse battery staple"
+    hashed = get_password_hash(password)
+
+    print("=" * 60)
+    print(f"Login benchmark: {args.logins} logins, bcrypt rounds={settings.BCRYPT_ROUNDS}, "
+          f"pool workers={settings.PASSWORD_HASH_WORKERS}")
+    print("=" * 60)
+
+    async def inline():
+        return verify_password(password, hashed)
+
+    async def pooled():
+        return await verify_password_async(password, hashed)
+
+    await run("inline", inline, args.logins)
+    await run("pooled", pooled, args.logins)
+
+    print(f"Pool stats: {get_password_pool_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,11 @@
+"""
+Reproducible TTS benchmarks.
+
+Runs each adapter over a fixed corpus (per language, short/medium/long
+texts) and reports cold start, time to first chunk, latency percentiles,
+real-time factor and peak RSS as JSON that can be diffed between commits.
+
+Usage (from backend/):
+    python -m benchmarks --adapters mock,kokoro --runs 5 --out bench.json
+    python -m benchmarks compare base.json bench.json
+"""
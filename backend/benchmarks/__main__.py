@@ -0,0 +1,132 @@
+"""
+CLI entry point: `python -m benchmarks [run] ...` or `python -m benchmarks compare A B`.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("SECRET_KEY", "bench-tts")
+os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from .corpus import LENGTHS
+from .runner import ADAPTERS, run_benchmarks, run_metadata
+
+# Metrics shown by `compare` (lower is better for all of them)
+COMPARE_METRICS = ["latency_p50_s", "latency_p95_s", "ttfc_s", "rtf_p50", "cold_start_s", "peak_rss_mb"]
+
+
+def _run_isolated(args) -> list:
+    """
+    Benchmark each adapter in its own process, so cold start and peak RSS
+    aren't polluted by adapters that ran earlier.
+    """
+    results = []
+    for name in args.adapters:
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "result.json"
+            cmd = [
+                sys.executable, "-m", "benchmarks", "run", "--in-process",
+                "--adapters", name, "--runs", str(args.runs), "--warmup", str(args.warmup),
+                "--lengths", ",".join(args.lengths), "--out", str(out)
+            ]
+            if args.speaker_wav:
+                cmd += ["--speaker-wav", args.speaker_wav]
+            proc = subprocess.run(cmd, cwd=Path(__file__).parent.parent)
+            if proc.returncode != 0 or not out.exists():
+                print(f"[bench] {name} failed (exit {proc.returncode}); skipping", file=sys.stderr)
+                continue
+            results.extend(json.loads(out.read_text())["results"])
+    return results
+
+
+def cmd_run(args):
+    unknown = [a for a in args.adapters if a not in ADAPTERS]
+    if unknown:
+        sys.exit(f"Unknown adapters: {unknown}. Choose from {sorted(ADAPTERS)}")
+    if "xtts" in args.adapters and not (args.speaker_wav and Path(args.speaker_wav).exists()):
+        print("[bench] XTTS needs --speaker-wav; skipping xtts", file=sys.stderr)
+        args.adapters = [a for a in args.adapters if a != "xtts"]
+
+    if args.in_process:
+        results = run_benchmarks(
+            args.adapters, runs=args.runs, warmup=args.warmup,
+            lengths=args.lengths, speaker_wav=args.speaker_wav
+        )
+    else:
+        results = _run_isolated(args)
+
+    report = {"meta": run_metadata(), "config": {"runs": args.runs, "warmup": args.warmup}, "results": results}
+    payload = json.dumps(report, indent=2, ensure_ascii=False, sort_keys=True)
+    if args.out:
+        Path(args.out).write_text(payload + "\n", encoding="utf-8")
+        print(f"[bench] Wrote {len(results)} results to {args.out}", file=sys.stderr)
+    else:
+        print(payload)
+
+
+def cmd_compare(args):
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    key = lambda r: (r["adapter"], r["language"], r["length"])
+    base_results = {key(r): r for r in base["results"]}
+
+    print(f"base {base['meta'].get('commit')}  ->  new {new['meta'].get('commit')}")
+    print(f"{'case':<26}" + "".join(f"{m:>22}" for m in COMPARE_METRICS))
+    regressions = 0
+    for result in new["results"]:
+        old = base_results.get(key(result))
+        if old is None:
+            continue
+        cells = []
+        for metric in COMPARE_METRICS:
+            before, after = old.get(metric), result.get(metric)
+            if not before or after is None:
+                cells.append(f"{'-':>22}")
+                continue
+            change = (after - before) / before * 100
+            if change > args.threshold:
+                regressions += 1
+            cells.append(f"{before:>8.3f}->{after:<8.3f}{change:+5.0f}%")
+        print(f"{'/'.join(key(result)):<26}" + "".join(cells))
+
+    if regressions:
+        print(f"{regressions} metric(s) regressed by more than {args.threshold:.0f}%")
+        sys.exit(1 if args.fail_on_regression else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="TTS adapter benchmarks")
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("run", help="Run benchmarks (default)")
+    run.add_argument("--adapters", type=lambda s: s.split(","), default=["mock"], help="Comma-separated: " + ",".join(ADAPTERS))
+    run.add_argument("--runs", type=int, default=5, help="Timed runs per case")
+    run.add_argument("--warmup", type=int, default=1, help="Untimed runs per case")
+    run.add_argument("--lengths", type=lambda s: s.split(","), default=list(LENGTHS), help="Comma-separated: " + ",".join(LENGTHS))
+    run.add_argument("--speaker-wav", default=str(Path("app") / "voices" / "rachel.wav"), help="Reference voice for XTTS")
+    run.add_argument("--out", help="Write JSON here instead of stdout")
+    run.add_argument("--in-process", action="store_true", help="Don't isolate adapters in subprocesses")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="Diff two result files")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    compare.add_argument("--fail-on-regression", action="store_true")
+    compare.set_defaults(func=cmd_compare)
+
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in ("run", "compare", "-h", "--help"):
+        argv = ["run"] + argv
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Fixed benchmark corpus.
+
+Texts are built deterministically from the paragraphs below, cut at a
+sentence boundary near each target length, so results stay comparable
+across commits.
+"""
+
+from typing import Dict
+
+PARAGRAPHS = {
+    "en": (
+        "The quick brown fox jumps over the lazy dog. "
+        "Speech synthesis has improved a great deal over the last few years. "
+        "Modern systems can read long documents aloud with natural rhythm and clear pronunciation. "
+        "This benchmark measures how quickly each engine turns text into audio. "
+        "It also tracks memory use, so regressions show up before they reach production. "
+        "Please keep this corpus stable, or results will not be comparable between commits. "
+    ),
+    "hi": (
+        "नमस्ते, यह एक परीक्षण है। "
+        "हम हिंदी में बोल रहे हैं और आवाज़ की गुणवत्ता को माप रहे हैं। "
+        "पिछले कुछ वर्षों में वाक् संश्लेषण में बहुत सुधार हुआ है। "
+        "यह बेंचमार्क मापता है कि प्रत्येक इंजन कितनी जल्दी पाठ को ऑडियो में बदलता है। "
+        "कृपया इस पाठ को स्थिर रखें, ताकि परिणामों की तुलना की जा सके। "
+    ),
+    "ta": (
+        "வணக்கம், இது ஒரு சோதனை. "
+        "நாங்கள் தமிழில் பேசுகிறோம் மற்றும் குரல் தரத்தை அளவிடுகிறோம். "
+        "கடந்த சில ஆண்டுகளில் பேச்சு தொகுப்பு மிகவும் மேம்பட்டுள்ளது. "
+        "ஒவ்வொரு இயந்திரமும் எவ்வளவு வேகமாக உரையை ஒலியாக மாற்றுகிறது என்பதை இது அளவிடுகிறது. "
+    ),
+    "ur": (
+        "السلام علیکم، یہ ایک آزمائش ہے۔ "
+        "ہم اردو میں بات کر رہے ہیں اور آواز کے معیار کی پیمائش کر رہے ہیں۔ "
+        "پچھلے چند سالوں میں تقریر کی ترکیب میں بہت بہتری آئی ہے۔ "
+        "یہ جانچ ناپتی ہے کہ ہر انجن کتنی تیزی سے متن کو آواز میں بدلتا ہے۔ "
+    ),
+}
+
+# Target lengths in characters
+LENGTHS = {
+    "short": 60,
+    "medium": 250,
+    "long": 900,
+}
+
+# Languages each adapter is benchmarked in
+ADAPTER_LANGUAGES = {
+    "mock": ["en", "hi"],
+    "kokoro": ["en"],
+    "indicparler": ["hi", "ta", "ur", "en"],
+    "xtts": ["en", "hi"],
+}
+
+_SENTENCE_ENDS = (". ", "। ", "۔ ")
+
+
+def build_text(language: str, target_chars: int) -> str:
+    """Repeat the paragraph and cut at the last sentence end before target_chars."""
+    paragraph = PARAGRAPHS[language]
+    text = paragraph * (target_chars // len(paragraph) + 2)
+    cut = max(text.rfind(end, 0, target_chars + 1) for end in _SENTENCE_ENDS)
+    if cut <= 0:
+        # No sentence end early enough: take the first sentence whole
+        cut = min(i for i in (text.find(end) for end in _SENTENCE_ENDS) if i > 0)
+    return text[:cut + 1].strip()
+
+
+def corpus_for(adapter: str, lengths=None) -> Dict[str, Dict[str, str]]:
+    """{language: {length_name: text}} for an adapter."""
+    lengths = lengths or list(LENGTHS)
+    return {
+        language: {name: build_text(language, LENGTHS[name]) for name in lengths}
+        for language in ADAPTER_LANGUAGES[adapter]
+    }
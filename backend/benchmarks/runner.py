@@ -0,0 +1,187 @@
+"""
+Benchmark runner: measures one adapter at a time and returns plain dicts.
+"""
+
+import asyncio
+import importlib
+import os
+import platform
+import subprocess
+import sys
+import time
+import wave
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .corpus import corpus_for
+
+# name -> (module, singleton getter)
+ADAPTERS = {
+    "mock": ("app.adapters.tts.mock", "get_mock_adapter"),
+    "kokoro": ("app.adapters.tts.kokoro", "get_kokoro_adapter"),
+    "indicparler": ("app.adapters.tts.indicparler", "get_indicparler_adapter"),
+    "xtts": ("app.adapters.tts.xtts_v2", "get_xtts_adapter"),
+}
+
+# Voice used per adapter (each engine's first preset)
+VOICES = {
+    "mock": "mock_1",
+    "kokoro": "kokoro_1",
+    "indicparler": "1",
+    "xtts": "xtts_1",
+}
+
+
+def _chunk_budget(name: str) -> Optional[int]:
+    """Token budget the adapter plans chunks with, or None if it doesn't chunk."""
+    from app.config import get_settings
+    settings = get_settings()
+    return {
+        "kokoro": settings.KOKORO_CHUNK_TOKENS,
+        "indicparler": settings.INDICPARLER_CHUNK_TOKENS,
+    }.get(name)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def audio_seconds(path: str) -> float:
+    try:
+        import soundfile as sf
+        return sf.info(path).duration
+    except ImportError:
+        with wave.open(path, "rb") as f:
+            return f.getnframes() / f.getframerate()
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Linear-interpolated percentile (p in 0-100)."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def run_metadata() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+async def _timed_generate(adapter, text: str, language: str, voice: str, speaker_wav: Optional[str]):
+    start = time.perf_counter()
+    path = await adapter.generate(text=text, voice_id=voice, language=language, speaker_wav_path=speaker_wav)
+    return time.perf_counter() - start, path
+
+
+async def bench_adapter(
+    name: str,
+    runs: int = 5,
+    warmup: int = 1,
+    lengths: Optional[List[str]] = None,
+    speaker_wav: Optional[str] = None
+) -> List[Dict]:
+    """
+    Benchmark one adapter over its corpus.
+
+    Cold start (construct + load model) and the first generation are
+    measured once; every (language, length) case then gets `warmup`
+    untimed runs and `runs` timed ones.
+    """
+    from app.utils.scratch import job_scratch
+
+    module_name, getter = ADAPTERS[name]
+    start = time.perf_counter()
+    adapter = getattr(importlib.import_module(module_name), getter)()
+    if getattr(adapter, "model", object()) is None and hasattr(adapter, "_load_model"):
+        adapter._load_model()
+    cold_start_s = time.perf_counter() - start
+
+    voice = VOICES[name]
+    budget = _chunk_budget(name)
+    first_generate_s = None
+    results = []
+
+    for language, texts in corpus_for(name, lengths).items():
+        for length_name, text in texts.items():
+            with job_scratch(f"bench-{name}"):
+                if first_generate_s is None:
+                    first_generate_s, _ = await _timed_generate(adapter, text, language, voice, speaker_wav)
+                for _ in range(warmup):
+                    await _timed_generate(adapter, text, language, voice, speaker_wav)
+
+                latencies, rtfs = [], []
+                audio_s = 0.0
+                for _ in range(runs):
+                    elapsed, path = await _timed_generate(adapter, text, language, voice, speaker_wav)
+                    audio_s = audio_seconds(path)
+                    latencies.append(elapsed)
+                    rtfs.append(elapsed / audio_s if audio_s else 0.0)
+
+                # Time to first chunk: what a streaming pipeline would deliver first
+                chunks = [text]
+                if budget:
+                    chunks = adapter.plan_chunks(adapter.preprocess_text(text, language), language, budget)
+                if len(chunks) > 1:
+                    ttfc_s, _ = await _timed_generate(adapter, chunks[0], language, voice, speaker_wav)
+                else:
+                    ttfc_s = percentile(latencies, 50)
+
+            result = {
+                "adapter": name,
+                "language": language,
+                "length": length_name,
+                "chars": len(text),
+                "chunks": len(chunks),
+                "runs": runs,
+                "cold_start_s": round(cold_start_s, 4),
+                "first_generate_s": round(first_generate_s, 4),
+                "ttfc_s": round(ttfc_s, 4),
+                "latency_p50_s": round(percentile(latencies, 50), 4),
+                "latency_p95_s": round(percentile(latencies, 95), 4),
+                "latency_mean_s": round(sum(latencies) / len(latencies), 4),
+                "audio_s": round(audio_s, 3),
+                "rtf_p50": round(percentile(rtfs, 50), 4),
+                "rtf_p95": round(percentile(rtfs, 95), 4),
+                "peak_rss_mb": peak_rss_mb(),
+            }
+            results.append(result)
+            print(
+                f"{name:<12}{language:<4}{length_name:<8}{len(text):>6} chars  "
+                f"p50 {result['latency_p50_s']:7.3f}s  p95 {result['latency_p95_s']:7.3f}s  "
+                f"ttfc {result['ttfc_s']:7.3f}s  RTF {result['rtf_p50']:6.3f}  "
+                f"RSS {result['peak_rss_mb'] or 0:8.1f}MB",
+                file=sys.stderr
+            )
+
+    return results
+
+
+def run_benchmarks(names: List[str], **kwargs) -> List[Dict]:
+    """Run adapters one after another in this process."""
+    results = []
+    for name in names:
+        results.extend(asyncio.run(bench_adapter(name, **kwargs)))
+    return results
@@ -0,0 +1,13 @@
+"""
+End-to-end load test for the API with the TTS engine stubbed out.
+
+Boots `app.main:app` under uvicorn with a deterministic stub adapter
+(fixed synthetic latency, no model), drives `/tts/generate` plus job
+polling at a configurable concurrency, and reports requests/sec, queue
+wait, DB time and error rates. Regressions here come from the API,
+database, workers or storage, never from model speed.
+
+Usage (from backend/):
+    python -m loadtest --concurrency 16 --duration 30 --latency 0.2
+    python -m loadtest --jobs 200 --languages en,hi --out load.json
+"""
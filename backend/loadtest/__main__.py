@@ -0,0 +1,126 @@
+"""
+CLI entry point: `python -m loadtest [options]`.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.corpus import LENGTHS
+
+
+def _configure_env(args, workdir: Path):
+    """
+    Point the app at throwaway state. Must run before `app` is imported,
+    since settings are read at import time.
+    """
+    os.environ.setdefault("SECRET_KEY", "loadtest-tts")
+    os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
+    os.environ["ENVIRONMENT"] = "development"
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir / 'loadtest.db'}"
+    os.environ["LOCAL_STORAGE_PATH"] = str(workdir / "storage")
+    os.environ["SCRATCH_DIR"] = str(workdir / "scratch")
+    os.environ["PRELOAD_MODELS"] = "false"
+    os.environ["RETENTION_ENABLED"] = "false"
+    os.environ["RATE_LIMIT_ENABLED"] = "true" if args.rate_limit else "false"
+    os.environ["COALESCING_ENABLED"] = "true" if args.coalesce else "false"
+
+
+async def _warm_up(base_url: str, payloads, count: int, poll_interval: float, job_timeout: float):
+    """Create the test user and push a few jobs through before measuring."""
+    import httpx
+    from .harness import Stats, run_job, API
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=job_timeout) as client:
+        await client.get(f"{API}/history", params={"limit": 1})
+        stats = Stats()
+        for i in range(count):
+            await run_job(client, stats, payloads[i % len(payloads)], poll_interval, job_timeout)
+
+
+def run(args) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="tts-loadtest-"))
+    _configure_env(args, workdir)
+
+    from app.main import app
+    from app.models import engine
+    from benchmarks.runner import run_metadata
+    from .harness import DBTimer, Server, build_payloads, build_report, drive, job_timings
+    from .stub import StubTTSAdapter, install_stub
+
+    stub = install_stub(StubTTSAdapter(latency=args.latency, latency_per_char=args.latency_per_char))
+    payloads = build_payloads(args.languages, args.length)
+    db_timer = DBTimer(engine)
+    server = Server(app, port=args.port)
+
+    quiet = open(os.devnull, "w") if not args.verbose else None
+    with contextlib.redirect_stdout(quiet) if quiet else contextlib.nullcontext():
+        server.start()
+        try:
+            asyncio.run(_warm_up(server.base_url, payloads, args.warmup, args.poll_interval, args.job_timeout))
+            stub.calls, stub.busy_seconds = 0, 0.0
+
+            db_timer.start()
+            stats, elapsed = asyncio.run(drive(
+                server.base_url, payloads,
+                concurrency=args.concurrency,
+                duration=None if args.jobs else args.duration,
+                jobs=args.jobs,
+                poll_interval=args.poll_interval,
+                job_timeout=args.job_timeout
+            ))
+            db = db_timer.snapshot()
+            db_timer.stop()
+            timings = job_timings(stats.job_ids)
+        finally:
+            server.stop()
+    if quiet:
+        quiet.close()
+
+    config = {key: value for key, value in vars(args).items() if key not in ("out", "verbose")}
+    return {"meta": run_metadata(), "config": config, "report": build_report(stats, elapsed, db, timings, stub)}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="API load test with a stub TTS engine")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run (ignored with --jobs)")
+    parser.add_argument("--jobs", type=int, help="Submit exactly this many jobs instead of running for --duration")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed jobs before the run")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub synthesis time per job (seconds)")
+    parser.add_argument("--latency-per-char", type=float, default=0.0, help="Extra stub time per character (seconds)")
+    parser.add_argument("--languages", type=lambda s: s.split(","), default=["en"], help="Comma-separated, e.g. en,hi")
+    parser.add_argument("--length", choices=list(LENGTHS), default="short", help="Request text length")
+    parser.add_argument("--poll-interval", type=float, default=0.1, help="Seconds between job status polls")
+    parser.add_argument("--job-timeout", type=float, default=60.0, help="Give up on a job after this many seconds")
+    parser.add_argument("--database-url", help="Database to use (default: a fresh SQLite file)")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep per-plan rate limiting on")
+    parser.add_argument("--coalesce", action="store_true", help="Let identical in-flight jobs share one synthesis")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-error-rate", type=float, help="Exit 1 if the HTTP or job error rate exceeds this (0-1)")
+    parser.add_argument("--out", help="Also write the JSON report here")
+    parser.add_argument("--verbose", action="store_true", help="Show server logs")
+    args = parser.parse_args()
+
+    result = run(args)
+    from .harness import format_report
+    print(format_report(result["report"]))
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"[loadtest] Wrote report to {args.out}", file=sys.stderr)
+
+    errors = result["report"]["errors"]
+    if args.max_error_rate is not None and max(errors["http_error_rate"], errors["job_failure_rate"]) > args.max_error_rate:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
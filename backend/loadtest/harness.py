@@ -0,0 +1,282 @@
+"""
+Load-test harness: server lifecycle, virtual users and the report.
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.corpus import build_text, LENGTHS
+from benchmarks.runner import percentile
+
+API = "/api/v1/tts"
+
+
+class DBTimer:
+    """
+    Times every statement on an SQLAlchemy engine via cursor events.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.durations: Dict[str, List[float]] = {}
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("loadtest_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["loadtest_start"].pop()
+        kind = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        with self._lock:
+            self.durations.setdefault(kind, []).append(elapsed)
+
+    def start(self):
+        from sqlalchemy import event
+        event.listen(self.engine, "before_cursor_execute", self._before)
+        event.listen(self.engine, "after_cursor_execute", self._after)
+
+    def stop(self):
+        from sqlalchemy import event
+        event.remove(self.engine, "before_cursor_execute", self._before)
+        event.remove(self.engine, "after_cursor_execute", self._after)
+
+    def reset(self):
+        with self._lock:
+            self.durations = {}
+
+    def snapshot(self) -> Dict[str, List[float]]:
+        with self._lock:
+            return {kind: list(values) for kind, values in self.durations.items()}
+
+
+class Server:
+    """Runs uvicorn in a background thread for the duration of the test."""
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 8765):
+        import uvicorn
+        self.base_url = f"http://{host}:{port}"
+        self._server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", access_log=False))
+        self._thread = threading.Thread(target=self._server.run, name="loadtest-server", daemon=True)
+
+    def start(self, timeout: float = 60.0):
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("Server failed to start")
+            time.sleep(0.05)
+
+    def stop(self):
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+class Stats:
+    """Client-side observations, filled in by the virtual users."""
+
+    def __init__(self):
+        self.submit_latencies: List[float] = []
+        self.poll_latencies: List[float] = []
+        self.end_to_end: List[float] = []
+        self.polls_per_job: List[int] = []
+        self.status_codes: Counter = Counter()
+        self.transport_errors: Counter = Counter()
+        self.job_outcomes: Counter = Counter()
+        self.job_ids: List[str] = []
+
+    @property
+    def requests(self) -> int:
+        return sum(self.status_codes.values()) + sum(self.transport_errors.values())
+
+
+async def _request(client: httpx.AsyncClient, stats: Stats, latencies: List[float], method: str, url: str, **kwargs):
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        stats.transport_errors[type(e).__name__] += 1
+        return None
+    latencies.append(time.perf_counter() - start)
+    stats.status_codes[response.status_code] += 1
+    return response
+
+
+async def run_job(client: httpx.AsyncClient, stats: Stats, payload: Dict, poll_interval: float, job_timeout: float):
+    """Submit one job and poll it to a terminal state."""
+    start = time.perf_counter()
+    response = await _request(client, stats, stats.submit_latencies, "POST", f"{API}/generate", json=payload)
+    if response is None or response.status_code != 202:
+        stats.job_outcomes["rejected"] += 1
+        return
+
+    job_id = response.json()["job_id"]
+    stats.job_ids.append(job_id)
+    polls = 0
+    while time.perf_counter() - start < job_timeout:
+        await asyncio.sleep(poll_interval)
+        polls += 1
+        response = await _request(client, stats, stats.poll_latencies, "GET", f"{API}/jobs/{job_id}")
+        if response is None or response.status_code != 200:
+            continue
+        status = response.json()["status"]
+        if status in ("completed", "failed"):
+            stats.end_to_end.append(time.perf_counter() - start)
+            stats.polls_per_job.append(polls)
+            stats.job_outcomes[status] += 1
+            return
+    stats.job_outcomes["timed_out"] += 1
+
+
+async def drive(
+    base_url: str,
+    payloads: List[Dict],
+    concurrency: int,
+    duration: Optional[float],
+    jobs: Optional[int],
+    poll_interval: float,
+    job_timeout: float
+) -> Tuple[Stats, float]:
+    """
+    Run `concurrency` virtual users until `duration` seconds pass or
+    `jobs` jobs have been submitted, cycling through `payloads`.
+    """
+    stats = Stats()
+    issued = 0
+    deadline = time.perf_counter() + duration if duration else None
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=job_timeout) as client:
+        async def user():
+            nonlocal issued
+            while True:
+                if jobs is not None and issued >= jobs:
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                payload = payloads[issued % len(payloads)]
+                issued += 1
+                await run_job(client, stats, payload, poll_interval, job_timeout)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return stats, elapsed
+
+
+def build_payloads(languages: List[str], length: str) -> List[Dict]:
+    return [
+        {"text": build_text(language, LENGTHS[length]), "language": language, "voice_id": "mock_1"}
+        for language in languages
+    ]
+
+
+def job_timings(job_ids: List[str]) -> Dict[str, List[float]]:
+    """Server-side queue wait and processing time, read back from the jobs table."""
+    from uuid import UUID
+    from app.models import get_db, TTSJob
+
+    db = next(get_db())
+    try:
+        ids = [UUID(job_id) for job_id in job_ids]
+        rows = []
+        for i in range(0, len(ids), 500):
+            rows.extend(
+                db.query(TTSJob.created_at, TTSJob.started_at, TTSJob.completed_at)
+                .filter(TTSJob.id.in_(ids[i:i + 500])).all()
+            )
+    finally:
+        db.close()
+
+    queue_wait = [(started - created).total_seconds() for created, started, _ in rows if created and started]
+    processing = [(completed - started).total_seconds() for _, started, completed in rows if started and completed]
+    return {"queue_wait": queue_wait, "processing": processing}
+
+
+def _dist(values: List[float]) -> Dict:
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+    }
+
+
+def build_report(stats: Stats, elapsed: float, db: Dict[str, List[float]], timings: Dict[str, List[float]], stub) -> Dict:
+    attempts = sum(stats.job_outcomes.values())
+    jobs_done = stats.job_outcomes["completed"]
+    errors = sum(n for code, n in stats.status_codes.items() if code >= 400) + sum(stats.transport_errors.values())
+    all_queries = [d for values in db.values() for d in values]
+    tracked_jobs = max(len(stats.job_ids), 1)
+
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "throughput": {
+            "generate_rps": round(len(stats.submit_latencies) / elapsed, 2) if elapsed else 0.0,
+            "jobs_completed_per_s": round(jobs_done / elapsed, 2) if elapsed else 0.0,
+            "http_rps": round(stats.requests / elapsed, 2) if elapsed else 0.0,
+        },
+        "latency": {
+            "submit": _dist(stats.submit_latencies),
+            "poll": _dist(stats.poll_latencies),
+            "end_to_end": _dist(stats.end_to_end),
+            "queue_wait": _dist(timings["queue_wait"]),
+            "processing": _dist(timings["processing"]),
+            "polls_per_job": round(sum(stats.polls_per_job) / len(stats.polls_per_job), 2) if stats.polls_per_job else 0.0,
+        },
+        "db": {
+            "queries": len(all_queries),
+            "queries_per_job": round(len(all_queries) / tracked_jobs, 2),
+            "total_s": round(sum(all_queries), 4),
+            "ms_per_job": round(sum(all_queries) / tracked_jobs * 1000, 3),
+            "by_statement": {kind: _dist(values) for kind, values in sorted(db.items())},
+        },
+        "errors": {
+            "http_requests": stats.requests,
+            "http_error_rate": round(errors / stats.requests, 4) if stats.requests else 0.0,
+            "status_codes": {str(code): n for code, n in sorted(stats.status_codes.items())},
+            "transport": dict(stats.transport_errors),
+            "jobs": dict(stats.job_outcomes),
+            "job_failure_rate": round((attempts - jobs_done) / attempts, 4) if attempts else 0.0,
+        },
+        "stub": {
+            "calls": stub.calls,
+            "busy_s": round(stub.busy_seconds, 3),
+            "latency_s": stub.latency,
+            "latency_per_char_s": stub.latency_per_char,
+        },
+    }
+
+
+def format_report(report: Dict) -> str:
+    t, lat, db, err = report["throughput"], report["latency"], report["db"], report["errors"]
+    lines = [
+        "=" * 72,
+        f"elapsed {report['elapsed_s']:.1f}s   generate {t['generate_rps']:.1f} req/s   "
+        f"completed {t['jobs_completed_per_s']:.1f} jobs/s   http {t['http_rps']:.1f} req/s",
+        "-" * 72,
+        f"{'latency':<14}{'count':>8}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}{'mean ms':>12}",
+    ]
+    for name in ("submit", "poll", "queue_wait", "processing", "end_to_end"):
+        d = lat[name]
+        lines.append(f"{name:<14}{d['count']:>8}{d['p50_ms']:>12.1f}{d['p95_ms']:>12.1f}{d['p99_ms']:>12.1f}{d['mean_ms']:>12.1f}")
+    lines += [
+        "-" * 72,
+        f"db: {db['queries']} queries ({db['queries_per_job']:.1f}/job), {db['total_s']:.2f}s total, {db['ms_per_job']:.2f} ms/job",
+    ]
+    for kind, d in db["by_statement"].items():
+        lines.append(f"    {kind:<10}{d['count']:>8}  p50 {d['p50_ms']:7.2f} ms  p95 {d['p95_ms']:7.2f} ms")
+    lines += [
+        "-" * 72,
+        f"errors: http {err['http_error_rate'] * 100:.2f}% of {err['http_requests']}  "
+        f"status {err['status_codes']}  transport {err['transport'] or '{}'}",
+        f"jobs: {err['jobs']}  failure rate {err['job_failure_rate'] * 100:.2f}%",
+        "=" * 72,
+    ]
+    return "\n".join(lines)
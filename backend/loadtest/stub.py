@@ -0,0 +1,100 @@
+"""
+Deterministic stub engine for load tests.
+"""
+
+import asyncio
+import math
+import struct
+import threading
+from functools import lru_cache
+from typing import Optional, Dict, Any
+
+from app.adapters.tts.mock import MockTTSAdapter
+from app.utils.timing import chunk
+
+STUB_SAMPLE_RATE = 16000
+
+
+@lru_cache(maxsize=64)
+def _tone_wav(num_samples: int) -> bytes:
+    """A 16-bit mono 440 Hz tone, built once per length."""
+    samples = [int(0.3 * 32767 * math.sin(2 * math.pi * 440.0 * i / STUB_SAMPLE_RATE)) for i in range(num_samples)]
+    data = struct.pack(f"<{num_samples}h", *samples)
+    header = b"".join([
+        b"RIFF", struct.pack("<I", 36 + len(data)), b"WAVE",
+        b"fmt ", struct.pack("<IHHIIHH", 16, 1, 1, STUB_SAMPLE_RATE, STUB_SAMPLE_RATE * 2, 2, 16),
+        b"data", struct.pack("<I", len(data)),
+    ])
+    return header + data
+
+
+class StubTTSAdapter(MockTTSAdapter):
+    """
+    Mock adapter with a configurable synthetic latency.
+
+    Each call waits `latency + latency_per_char * len(text)` seconds
+    (standing in for inference, and holding the worker thread like a real
+    model would) and writes a tone as long as the text would take to
+    speak. The same text always yields the same latency and audio.
+    """
+
+    engine_name = "stub"
+
+    def __init__(self, latency: float = 0.2, latency_per_char: float = 0.0):
+        self.latency = latency
+        self.latency_per_char = latency_per_char
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.busy_seconds = 0.0
+
+    def synthetic_latency(self, text: str) -> float:
+        return self.latency + self.latency_per_char * len(text)
+
+    async def generate(
+        self,
+        text: str,
+        voice_id: str,
+        language: str = "en",
+        voice_age: str = "adult",
+        prosody_preset: str = "neutral",
+        speaker_wav_path: Optional[str] = None,
+        settings: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Sleep for the synthetic latency, then write the stub tone."""
+        valid, error = self.validate_input(text, voice_id)
+        if not valid:
+            raise ValueError(error)
+
+        delay = self.synthetic_latency(text)
+        with chunk(self.engine_name, language):
+            await asyncio.sleep(delay)
+
+        output_path = self.new_output_path(".wav")
+        num_samples = max(1, int(self.estimate_duration(text) * STUB_SAMPLE_RATE))
+        with open(output_path, "wb") as f:
+            f.write(_tone_wav(num_samples))
+
+        with self._lock:
+            self.calls += 1
+            self.busy_seconds += delay
+        return str(output_path)
+
+    def get_available_voices(self) -> list[Dict[str, Any]]:
+        return [dict(voice, name=voice["name"].replace("Mock", "Stub")) for voice in super().get_available_voices()]
+
+
+def install_stub(adapter: StubTTSAdapter) -> StubTTSAdapter:
+    """
+    Route every synthesis request to `adapter`.
+
+    Workers resolve `get_tts_adapter` from the factory module at call
+    time, so replacing it there covers both worker paths. Indic requests
+    are kept on the in-process worker: Celery workers live in another
+    process and would run the real engine.
+    """
+    from app.adapters.tts import factory
+    from app.api.v1 import tts as tts_routes
+
+    factory.get_tts_adapter = lambda language=None, text=None: adapter
+    tts_routes.check_redis = lambda: False
+    return adapter
@@ -0,0 +1,104 @@
+"""
+S3Storage against an in-process moto S3.
+
+    pip install pytest "moto[s3]"
+    pytest test_s3_storage.py
+"""
+
+import asyncio
+import os
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+try:
+    from moto import mock_aws
+except ImportError:  # moto < 5
+    from moto import mock_s3 as mock_aws
+
+from app.adapters.storage.s3 import S3Storage
+
+BUCKET = "tts-test"
+MiB = 1024 * 1024
+
+
+@pytest.fixture
+def storage():
+    with mock_aws():
+        s3 = S3Storage(bucket=BUCKET, region="us-east-1", multipart_chunk_size=5 * MiB, presign_ttl_seconds=600)
+        s3.client.create_bucket(Bucket=BUCKET)
+        yield s3
+
+
+def _chunks(total: int, size: int = MiB):
+    for offset in range(0, total, size):
+        yield bytes([offset // size % 256]) * min(size, total - offset)
+
+
+def test_upload_stream_uses_multipart_parts(storage):
+    total = 11 * MiB + 123
+    key = "audio/user/job.mp3"
+    asyncio.run(storage.upload_stream(_chunks(total), key))
+
+    obj = storage.client.get_object(Bucket=BUCKET, Key=key)
+    assert obj["ContentLength"] == total
+    assert obj["Body"].read() == b"".join(_chunks(total))
+    # 5 MiB + 5 MiB + remainder
+    assert obj["ETag"].strip('"').endswith("-3")
+    assert obj["ContentType"] == "audio/mpeg"
+
+
+def test_upload_stream_small_payload_single_part(storage):
+    key = "audio/user/small.wav"
+    asyncio.run(storage.upload_stream(iter([b"RIFF", b"data"]), key))
+
+    assert storage.client.get_object(Bucket=BUCKET, Key=key)["Body"].read() == b"RIFFdata"
+
+
+def test_upload_stream_aborts_on_producer_error(storage):
+    key = "audio/user/broken.mp3"
+
+    def failing_chunks():
+        yield from _chunks(6 * MiB)
+        raise RuntimeError("encoder died")
+
+    with pytest.raises(RuntimeError, match="encoder died"):
+        asyncio.run(storage.upload_stream(failing_chunks(), key))
+
+    assert storage.client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+    assert asyncio.run(storage.get_size(key)) is None
+
+
+def test_upload_bytes_and_size(storage):
+    key = "previews/kokoro_af-abc123.wav"
+    asyncio.run(storage.upload_bytes(b"x" * 1000, key))
+
+    assert asyncio.run(storage.get_size(key)) == 1000
+
+
+def test_get_url_is_presigned(storage):
+    key = "audio/user/job.mp3"
+    asyncio.run(storage.upload_bytes(b"audio", key))
+
+    url = asyncio.run(storage.get_url(key))
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    assert parts.path.endswith(f"/{key}") or parts.path == f"/{BUCKET}/{key}"
+    assert query["X-Amz-Expires"] == ["600"]
+    assert "X-Amz-Signature" in query
+
+
+def test_cache_control_only_immutable_for_final_audio_and_previews(storage):
+    immutable = "public, max-age=31536000, immutable"
+    assert storage._cache_control("audio/user/job.mp3") == immutable
+    assert storage._cache_control("audio/user/job.ogg") == immutable
+    assert storage._cache_control("previews/kokoro_af-abc123.wav") == immutable
+    assert storage._cache_control("audio/user/job/part-0001.wav") != immutable
+    assert storage._cache_control("voices/user/profile.wav") != immutable
+    assert storage._cache_control("profiles/user/job.prof") != immutable
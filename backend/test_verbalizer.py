@@ -0,0 +1,64 @@
+"""
+Verbalizer outputs pinned through the full preprocess() pipeline.
+
+    pip install pytest
+    pytest test_verbalizer.py
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from app.utils.text_processing import get_text_preprocessor
+
+
+def preprocess(text: str, language: str) -> str:
+    return get_text_preprocessor().preprocess(text, language)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("10:30", "ten thirty"),
+    ("Meet at 10:30 pm.", "Meet at ten thirty p m."),
+    ("9:05 a.m.", "nine oh five a m"),
+    ("At 7:00 sharp", "At seven o'clock sharp"),
+    ("23:59:01", "twenty three fifty nine and one second"),
+    ("The 1990s", "The nineteen nineties"),
+    ("the '80s and 1900s", "the eighties and nineteen hundreds"),
+    ("version 2.0.1", "version two point zero point one"),
+    ("in 2024", "in twenty twenty four"),
+    ("On 15/08/2024", "On fifteenth August twenty twenty four"),
+    ("2005", "two thousand five"),
+    ("1,500 people", "one thousand five hundred people"),
+    ("pi is 3.14", "pi is three point one four"),
+    ("Room 101", "Room one hundred one"),
+    ("1,2,3", "one, two, three"),
+])
+def test_english(text, expected):
+    assert preprocess(text, "en") == expected
+
+
+def test_english_year_matches_date_reading():
+    assert preprocess("2024", "en") in preprocess("01/01/2024", "en")
+
+
+@pytest.mark.parametrize("text, language, expected", [
+    # No number-word tables: numerals are left as written
+    ("வணக்கம் 125", "ta", "வணக்கம் 125"),
+    ("ایک 25 سال", "ur", "ایک 25 سال"),
+    ("൧൨൫ രൂപ", "ml", "൧൨൫ രൂപ"),
+    ("12,50,000 ಜನ", "kn", "1250000 ಜನ"),
+    ("₹1,250.5 மட்டும்", "ta", "1250 ரூபாய் 50 பைசா மட்டும்"),
+    ("50%", "te", "50 శాతం"),
+    ("15/08/2024", "bn", "15 আগস্ট 2024"),
+    ("১২/০৮/২০২৪", "bn", "১২ আগস্ট ২০২৪"),
+    ("3.14", "ta", "3 புள்ளி 1 4"),
+])
+def test_numeral_languages_keep_digits(text, language, expected):
+    assert preprocess(text, language) == expected
+
+
+def test_hindi_years_and_versions():
+    assert preprocess("1999", "hi") == "उन्नीस सौ निन्यानवे"
+    assert preprocess("2.0.1", "hi") == "दो दशमलव शून्य दशमलव एक"